@@ -1,5 +1,75 @@
+import copy
+from functools import lru_cache
 import numpy as np
-from scipy.stats import multivariate_normal
+from Class.Generador import obtener_generador
+
+
+def covarianza_privada(n_objects: int, corr: float = 0.8) -> np.ndarray:
+    """
+    Matriz de covarianzas del modelo correlated_private: varianza 0.08 en la diagonal y covarianza
+    0.1 * corr * exp(-|i - j| / 3) entre objetos distintos (objetos cercanos más correlacionados).
+    """
+    # Objetos cercanos más correlacionados
+    distance = np.abs(np.subtract.outer(np.arange(n_objects), np.arange(n_objects)))
+    cov_matrix = 0.1 * corr * np.exp(-distance / 3) #mayor efecto de cercanía
+    np.fill_diagonal(cov_matrix, 0.08)
+    return cov_matrix
+
+
+@lru_cache(maxsize=16)
+def factor_covarianza_privada(n_objects: int, corr: float = 0.8) -> np.ndarray:
+    """
+    Factor L (cov = L L^T) de covarianza_privada, calculado una vez por (n_objects, corr) y guardado
+    en una caché LRU para reutilizarlo en todas las subastas de un barrido.
+
+    Se usa la factorización de Cholesky; si la matriz no es definida positiva (correlaciones altas),
+    se recurre a la descomposición espectral con los autovalores negativos truncados a 0, como hace
+    np.random.multivariate_normal.
+
+    Returns:
+        np.ndarray: Matriz (n_objects, n_objects) de solo lectura.
+    """
+    cov_matrix = covarianza_privada(n_objects, corr)
+    try:
+        factor = np.linalg.cholesky(cov_matrix)
+    except np.linalg.LinAlgError:
+        autovalores, autovectores = np.linalg.eigh(cov_matrix)
+        factor = autovectores * np.sqrt(np.clip(autovalores, 0, None))
+    factor.setflags(write=False)
+    return factor
+
+
+def generar_valoraciones_afiliadas(n: int, n_objects: int, valuation_method: str, rng=None, corr: float = 0.8):
+    """
+    Extrae en bloque las valoraciones iniciales de n compradores afiliados (una fila por comprador),
+    según los modelos descritos en AffiliatedBuyer._generate_base_valuations.
+
+    Args:
+        n (int): Número de compradores.
+        n_objects (int): Número de objetos.
+        valuation_method (str): "common_value", "correlated_private" o "independent".
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+        corr (float): Correlación del modelo correlated_private (ver covarianza_privada).
+
+    Returns:
+        tuple:
+            valuations (np.ndarray): Matriz (n, n_objects) de valoraciones en [0, 1].
+            common_values (np.ndarray | None): Valor común V de cada comprador (solo common_value).
+    """
+    rng = obtener_generador(rng)
+    if valuation_method == "common_value":
+        # Modelo: Valor común V + señal privada
+        V = rng.uniform(0, 1, n)  # Valor común
+        epsilon = rng.normal(0, 0.15, (n, n_objects))
+        return np.clip(V[:, None] + epsilon, 0, 1), V
+    if valuation_method == "correlated_private":
+        # Valoraciones privadas correlacionadas: media 0.5 + Z L^T, con Z normal estándar (n, n_objects)
+        # y el factor de la covarianza ya calculado, en un único producto matricial
+        muestras = 0.5 + rng.standard_normal((n, n_objects)) @ factor_covarianza_privada(n_objects, corr).T
+        return np.clip(muestras, 0, 1), None
+    if valuation_method == "independent":
+        return rng.uniform(0, 1, (n, n_objects)), None
+    raise ValueError(f"valuation_method desconocido: {valuation_method}")
 
 
 class AffiliatedObject:
@@ -24,13 +94,18 @@ class AffiliatedObject:
               cantidad y orden temporal).
         - bidding_intensity: medida agregada de intensidad de puja basada
               en las pujas más recientes.
+        - version: contador que registrar_puja incrementa con cada puja aceptada, de modo que la fase de
+              aprendizaje puede saber qué objetos han cambiado de estado público desde la última vez.
+
+    Si el objeto pertenece a un mercado con IndiceGrupos (atributo indice_grupos), registrar_puja
+    lo añade a los objetos con pujas de su correlation_group al recibir la primera puja.
 
     Esta clase permite extender el mecanismo multiobjeto para estudiar
     entornos con afiliación.
     """
 
     def __init__(self, ID, reserve_price, min_increment,
-                 feature_vector=None, correlation_group=0):
+                 feature_vector=None, correlation_group=0, rng=None):
         """
         Inicializa un objeto con afiliación, extendiendo la lógica del
         objeto estándar de eBay Proxy Bidding.
@@ -43,6 +118,8 @@ class AffiliatedObject:
                     correlación entre objetos. Si es None, se genera aleatoriamente.
             correlation_group (int): Grupo de correlación al que pertenece el objeto
                     (permite modelizar clusters de afiliación).
+            rng (np.random.Generator | int | None): Generador o semilla para el feature_vector y el
+                    ruido de latent_quality (ver obtener_generador).
 
         Se generan además:
             - latent_quality: calidad latente del objeto, como combinación
@@ -54,9 +131,10 @@ class AffiliatedObject:
         self.reserve_price = reserve_price
         self.min_increment = min_increment
         # Para afiliación
-        self.feature_vector = feature_vector if feature_vector is not None else np.random.rand(3)
+        rng = obtener_generador(rng)
+        self.feature_vector = feature_vector if feature_vector is not None else rng.uniform(0, 1, 3)
         self.correlation_group = correlation_group
-        self.latent_quality = np.dot(self.feature_vector, [0.3, 0.34, 0.33]) + np.random.normal(0, 0.05) #parámetros random para determinar objetos similares: mayor correlación en calidad latente y menos ruido
+        self.latent_quality = np.dot(self.feature_vector, [0.3, 0.34, 0.33]) + rng.normal(0, 0.05) #parámetros random para determinar objetos similares: mayor correlación en calidad latente y menos ruido
         # Estado de subasta
         self.current_price = 0.0
         self.highest_bid = 0.0
@@ -66,6 +144,9 @@ class AffiliatedObject:
         # Información pública para afiliación
         self.observed_bids = []
         self.bidding_intensity = 0.0
+        self.version = 0
+        # Índice de grupos del mercado al que pertenece (ver IndiceGrupos)
+        self.indice_grupos = None
 
     def enter_price(self):
 
@@ -95,6 +176,9 @@ class AffiliatedObject:
                     - actualización del highest_bidder
                     - actualización del current_price
 
+            5. Si es la primera puja y el objeto está enlazado a un IndiceGrupos, lo añade a los
+               objetos con pujas de su correlation_group.
+
         Args:
             buyer (Buyer): comprador que realiza la puja.
             bid_max (float): valoración máxima declarada por el comprador.
@@ -106,6 +190,8 @@ class AffiliatedObject:
         if bid_max < enter_price:
             return False
         self.buyers_count += 1
+        self.version += 1
+        primera = self.highest_bidder is None
         # Registrar información pública (para afiliación)
         self.observed_bids.append({'bidder': buyer.ID,'amount': bid_max,'time': len(self.observed_bids)})
         # Actualizar intensidad de puja
@@ -126,7 +212,8 @@ class AffiliatedObject:
                 self.second_highest_bid = max(self.second_highest_bid, bid_max)
             self.current_price = min(self.highest_bid,
                                      self.second_highest_bid + self.min_increment)
-
+        if primera and self.indice_grupos is not None:
+            self.indice_grupos.actualizar(self)
         return True
 
     def get_public_info(self):
@@ -145,6 +232,68 @@ class AffiliatedObject:
         return {'observed_bids': len(self.observed_bids),'bidding_intensity': self.bidding_intensity,
             'current_price': self.current_price,'has_bids': self.highest_bidder is not None}
 
+    def bifurcar(self):
+        """
+        Copia independiente del objeto en su estado actual. Comparte los atributos fijos (parámetros,
+        feature_vector, latent_quality) y copia el estado de la subasta, sin volver a extraer números
+        aleatorios, de modo que varios escenarios contrafactuales pueden partir de los mismos objetos.
+        La copia no queda enlazada a ningún IndiceGrupos (cada mercado construye el suyo).
+
+        Returns:
+            AffiliatedObject: Objeto con su propio estado de subasta e historial de pujas.
+        """
+        copia = copy.copy(self)
+        copia.observed_bids = list(self.observed_bids)
+        copia.indice_grupos = None
+        return copia
+
+
+class IndiceGrupos:
+    """
+    Índice de grupos de un mercado con afiliación: para cada correlation_group guarda los objetos que
+    tienen pujas.
+
+    Lo comparten todos los compradores del mercado y lo mantienen los propios objetos al registrar su
+    primera puja, de modo que el precio medio de los objetos similares a uno dado (mismo grupo, distinto
+    objeto) se obtiene recorriendo solo su grupo (a lo sumo 3 objetos) en lugar de todos los objetos
+    (ver update_valuations). Los precios se leen en el momento de la consulta, sin sumas acumuladas,
+    por lo que la media coincide exactamente con la calculada sobre la lista completa de objetos.
+    """
+
+    def __init__(self, objetos, enlazar: bool = True):
+        """
+        Args:
+            objetos (list[AffiliatedObject]): Objetos del mercado en su estado actual.
+            enlazar (bool): Si es True, cada objeto guarda una referencia al índice en indice_grupos
+                para actualizarlo desde registrar_puja.
+        """
+        self.miembros = {}
+        for obj in objetos:
+            if obj.highest_bidder is not None:
+                self.actualizar(obj)
+            if enlazar:
+                obj.indice_grupos = self
+
+    def actualizar(self, objeto):
+        """
+        Añade a su grupo un objeto que acaba de recibir su primera puja.
+        """
+        self.miembros.setdefault(objeto.correlation_group, []).append(objeto)
+
+    def precio_medio_similares(self, objeto):
+        """
+        Precio medio de los demás objetos con pujas del grupo de `objeto`.
+
+        Returns:
+            float | None: Media de sus current_price, o None si no hay ningún otro objeto con pujas.
+        """
+        suma, cuenta = 0.0, 0
+        for otro in self.miembros.get(objeto.correlation_group, ()):
+            if otro.ID != objeto.ID:
+                suma += otro.current_price
+                cuenta += 1
+        return suma / cuenta if cuenta > 0 else None
+
 
 class AffiliatedBuyer:
     """
@@ -181,7 +330,8 @@ class AffiliatedBuyer:
     """
 
     def __init__(self, ID, n_objects,affiliation_strength=0.5, #fuerte afiliación
-                 learning_rate=0.15,valuation_method = "common_value"): #por defecto
+                 learning_rate=0.15,valuation_method = "common_value", #por defecto
+                 valuations=None, common_value=None, rng=None):
         """
         Inicializa un comprador con valoraciones afiliadas.
 
@@ -193,9 +343,13 @@ class AffiliatedBuyer:
             learning_rate (float): Velocidad de ajuste de las valoraciones.
             valuation_method (str): Mét0do de generación de valoraciones:
                     "common_value", "correlated_private" o "independent".
+            valuations (np.ndarray | None): Valoraciones iniciales ya extraídas (p. ej. una fila de
+                    generar_valoraciones_afiliadas). Si es None, se generan con el mét0do especificado.
+            common_value (float | None): Valor común asociado a `valuations` en el modelo common_value.
+            rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
-        Se generan las valoraciones iniciales mediante el mét0do especificado y se inicializa
-        el estado interno del comprador.
+        Se generan las valoraciones iniciales mediante el mét0do especificado (salvo que se proporcionen)
+        y se inicializa el estado interno del comprador.
         """
         self.ID = ID
         self.n_objects = n_objects
@@ -203,14 +357,19 @@ class AffiliatedBuyer:
         self.learning_rate = learning_rate
         self.valuation_method = valuation_method
         # Generar señales/valoraciones base
-        self._generate_base_valuations()
+        if valuations is None:
+            self._generate_base_valuations(rng)
+        else:
+            self.valuations = np.array(valuations, dtype=float)
+            if common_value is not None:
+                self.common_value = common_value
         # Estado
         self.active_object = None
         # Para tracking
         self.original_valuations = self.valuations.copy()
         self.adjustment_history = []
 
-    def _generate_base_valuations(self):
+    def _generate_base_valuations(self, rng=None):
         """
         Genera las valoraciones iniciales del comprador según el modelo de afiliación seleccionado.
                 - common_value:
@@ -226,30 +385,13 @@ class AffiliatedBuyer:
                     Valoraciones independientes ~ U(0,1), equivalente al modelo
                     original sin afiliación.
 
-        Las valoraciones generadas se almacenan en self.valuations.
+        Las valoraciones generadas se almacenan en self.valuations (extracción de generar_valoraciones_afiliadas
+        para un único comprador).
         """
-        if self.valuation_method == "common_value":
-            # Modelo: Valor común V + señal privada
-            V = np.random.uniform(0,1)  # Valor común
-            self.common_value = V
-            epsilon = np.random.normal(0, 0.15, self.n_objects)
-            self.valuations = np.clip(V + epsilon, 0, 1)
-
-        elif self.valuation_method == "correlated_private":
-            # Valoraciones privadas correlacionadas
-            corr = 0.8  # Correlación base
-            cov_matrix = np.eye(self.n_objects) * 0.08
-            for i in range(self.n_objects):
-                for j in range(self.n_objects):
-                    if i != j:
-                        # Objetos cercanos más correlacionados
-                        distance = abs(i - j)
-                        cov_matrix[i, j] = 0.1 * corr * np.exp(-distance / 3) #mayor efecto de cercanía
-            mean = np.full(self.n_objects, 0.5)
-            self.valuations = np.clip(multivariate_normal.rvs(mean=mean, cov=cov_matrix),0, 1)
-
-        elif self.valuation_method == "independent":
-            self.valuations = np.random.uniform(0, 1, self.n_objects)
+        valuations, common_values = generar_valoraciones_afiliadas(1, self.n_objects, self.valuation_method, rng)
+        self.valuations = valuations[0]
+        if common_values is not None:
+            self.common_value = common_values[0]
 
     def update_valuations(self, objects, market_info=None):
         """
@@ -258,7 +400,11 @@ class AffiliatedBuyer:
 
         Args:
             objects (list[AffiliatedObject]): Lista de objetos subastados.
-            market_info (dict | None): Información adicional del mercado
+            market_info (dict | None): Información adicional del mercado. Con 'indice_grupos' (el
+                IndiceGrupos del mercado) el modelo correlated_private lee los precios de los objetos
+                similares en O(1); sin él, se construye un índice temporal a partir de `objects`.
+                Con 'sucios' (diccionario de índices de objetos por valuation_method) solo se ajustan
+                los objetos cuyo estado público ha cambiado desde el último aprendizaje.
 
         Comportamiento según el modelo de afiliación:
 
@@ -283,8 +429,14 @@ class AffiliatedBuyer:
             return  # No actualiza en modelo independiente
 
         new_valuations = self.valuations.copy()
-
-        for obj_idx, obj in enumerate(objects):
+        indice = None
+        if self.valuation_method == "correlated_private":
+            indice = (market_info or {}).get('indice_grupos') or IndiceGrupos(objects, enlazar=False)
+        sucios = (market_info or {}).get('sucios')
+        indices = range(len(objects)) if sucios is None else sucios[self.valuation_method]
+
+        for obj_idx in indices:
+            obj = objects[obj_idx]
             if obj.highest_bidder is not None:
                 public_info = obj.get_public_info()
                 if self.valuation_method == "common_value":
@@ -294,17 +446,13 @@ class AffiliatedBuyer:
                         adjustment = (self.learning_rate *public_info['bidding_intensity'] *self.affiliation_strength)
                         new_valuations[obj_idx] += adjustment
                 elif self.valuation_method == "correlated_private":
-                    # Ajuste basado en objetos similares
-                    similar_objects = [o for o in objects if o.correlation_group == obj.correlation_group and o.ID != obj.ID]
-
-                    if similar_objects:
-                        similar_prices = [o.current_price for o in similar_objects if o.highest_bidder is not None]
-                        if similar_prices:
-                            avg_price = np.mean(similar_prices)
-                            # Ajustar hacia el precio de objetos similares
-                            price_diff = avg_price - obj.current_price
-                            adjustment = (self.learning_rate * price_diff * self.affiliation_strength * 1.2)
-                            new_valuations[obj_idx] += adjustment
+                    # Ajuste basado en objetos similares (precio medio del grupo, desde el índice)
+                    avg_price = indice.precio_medio_similares(obj)
+                    if avg_price is not None:
+                        # Ajustar hacia el precio de objetos similares
+                        price_diff = avg_price - obj.current_price
+                        adjustment = (self.learning_rate * price_diff * self.affiliation_strength * 1.2)
+                        new_valuations[obj_idx] += adjustment
         # Guardar historial y actualizar
         self.adjustment_history.append(new_valuations - self.valuations)
         self.valuations = np.clip(new_valuations, 0, 1)
@@ -332,4 +480,36 @@ class AffiliatedBuyer:
         """
 
         idx = obj_id - 1 if isinstance(obj_id, int) else 0
-        return self.valuations[idx] if idx < len(self.valuations) else 0.0
\ No newline at end of file
+        return self.valuations[idx] if idx < len(self.valuations) else 0.0
+
+    def instantanea(self) -> dict:
+        """
+        Estado mutable del comprador (valoraciones actuales, objeto activo y longitud del historial de
+        ajustes), para devolverlo a él con restaurar tras una subasta.
+        """
+        return {'valuations': self.valuations.copy(), 'active_object': self.active_object,
+                'ajustes': len(self.adjustment_history)}
+
+    def restaurar(self, instantanea: dict):
+        """Devuelve el comprador al estado guardado con instantanea."""
+        self.valuations = instantanea['valuations'].copy()
+        self.active_object = instantanea['active_object']
+        del self.adjustment_history[instantanea['ajustes']:]
+
+
+def instantanea_compradores(biders) -> list:
+    """
+    Guarda el estado de un conjunto de AffiliatedBuyer (ver AffiliatedBuyer.instantanea). Permite
+    reutilizar los mismos compradores en varias subastas sin que una arrastre las valoraciones
+    aprendidas ni el objeto activo de la anterior.
+
+    Returns:
+        list[tuple]: Pares (comprador, estado), independientes del orden de llegada.
+    """
+    return [(buyer, buyer.instantanea()) for buyer in biders]
+
+
+def restaurar_compradores(instantanea: list):
+    """Devuelve cada comprador de instantanea_compradores a su estado guardado."""
+    for buyer, estado in instantanea:
+        buyer.restaurar(estado)
\ No newline at end of file
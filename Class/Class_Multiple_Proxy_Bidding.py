@@ -1,6 +1,8 @@
 
 
+import heapq
 import numpy as np
+from Class.Class_Poblacion import Poblacion
 
 class Objeto:
     """
@@ -112,6 +114,73 @@ class Objeto:
         return True
 
 
+class MonticuloEntrada:
+    """
+    Cola de prioridad de los objetos de una subasta múltiple ordenada por (enter_price, índice).
+
+    Sustituye al recorrido de los m objetos que hacía cada comprador sin objeto: como puede_pujar
+    equivale a valoracion >= enter_price, el objeto con menor enter_price (desempate por menor índice,
+    igual que min sobre la lista) es viable para el comprador si y solo si lo es alguno. Consultar el
+    mínimo y actualizar un objeto cuesta O(log m).
+
+    El precio de entrada de un objeto solo cambia al aceptarse una puja (registrar_puja), por lo que
+    basta con llamar a actualizar tras cada puja aceptada. Las entradas antiguas no se borran del
+    montículo: cada una lleva la versión del objeto y se descartan al llegar a la cima (borrado perezoso).
+
+    Un objeto puede retirarse (p. ej. un anuncio que aún no ha abierto o que ya ha cerrado) con retirar
+    y volver a entrar con actualizar.
+    """
+
+    def __init__(self, objetos: list, precio_entrada=None):
+        """
+        Args:
+            objetos (list[Objeto]): Objetos de la subasta; el índice de cada uno es su posición en la lista.
+            precio_entrada (callable | None): Función i -> precio de entrada del objeto i. Por defecto
+                objetos[i].enter_price(); permite usar el montículo sobre un EstadoMercado.
+        """
+        self.objetos = objetos
+        self._precio = precio_entrada if precio_entrada is not None else (lambda i: objetos[i].enter_price())
+        self._version = [0] * len(objetos)
+        self._activo = [True] * len(objetos)
+        self._heap = [(self._precio(i), i, 0) for i in range(len(objetos))]
+        heapq.heapify(self._heap)
+
+    def minimo(self):
+        """
+        Devuelve el objeto con menor precio de entrada.
+
+        Returns:
+            tuple | None: (enter_price, índice del objeto), o None si no hay objetos.
+        """
+        heap = self._heap
+        while heap and heap[0][2] != self._version[heap[0][1]]:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return heap[0][0], heap[0][1]
+
+    def actualizar(self, i: int):
+        """
+        Reinserta el objeto i con su precio de entrada actual (llamar tras una puja aceptada).
+        """
+        self._version[i] += 1
+        self._activo[i] = True
+        heapq.heappush(self._heap, (self._precio(i), i, self._version[i]))
+        # Compactación ocasional para que las entradas obsoletas no crezcan sin límite
+        if len(self._heap) > 4 * len(self.objetos) + 64:
+            self._heap = [(self._precio(j), j, self._version[j]) for j in range(len(self.objetos))
+                          if self._activo[j]]
+            heapq.heapify(self._heap)
+
+    def retirar(self, i: int):
+        """
+        Saca el objeto i de la cola: sus entradas quedan obsoletas y minimo deja de devolverlo hasta
+        que se vuelva a llamar a actualizar.
+        """
+        self._version[i] += 1
+        self._activo[i] = False
+
+
 class Buyer:
     def __init__(self, ID, valoracion):
         """
@@ -156,3 +225,284 @@ class Buyer:
         return self.valoracion >= objeto.current_price + objeto.min_increment
 
 
+class PoblacionBuyers(Poblacion):
+    """
+    Población de compradores del caso multiobjeto respaldada por arrays (ver Poblacion).
+
+    Las vistas son objetos Buyer con ID entero. Como Buyer guarda estado mutable (active_object),
+    cada llamada a vistas() construye compradores nuevos, de modo que reutilizar la misma población
+    en varias subastas no arrastra estado de una ejecución a otra.
+    """
+
+    def _vista(self, idx: int) -> Buyer:
+        return Buyer(ID=int(self.ids[idx]), valoracion=float(self.valoraciones[idx]))
+
+
+class EstadoMercado:
+    """
+    Estado de una subasta múltiple almacenado como estructura de arrays en lugar de como m objetos
+    Objeto y n compradores Buyer.
+
+    Objetos (arrays de longitud m, indexados por j = ID - 1):
+        - reserve_price, min_increment: parámetros de cada objeto.
+        - current_price, highest_bid, second_highest_bid: estado de la subasta de cada objeto.
+        - highest_bidder: índice del comprador que lidera (-1 si no hay pujas).
+        - buyers_count: número de pujas aceptadas.
+
+    Compradores (arrays de longitud n, indexados por posición de llegada i):
+        - valoracion: valoración privada.
+        - active_object: índice del objeto en el que compite (-1 si ninguno).
+        - ids: identificador de cada comprador.
+
+    Las consultas de viabilidad y de precios de entrada son vectoriales. Para el código que trabaja
+    con la API de objetos (gráficos, probabilidades de victoria) objetos() devuelve vistas
+    ObjetoVista con los mismos atributos que Objeto.
+
+    Como todo el estado vive en arrays, guardarlo (instantanea/restaurar) o duplicarlo para un escenario
+    contrafactual (bifurcar/intercambiar) solo copia vectores, sin reconstruir objetos ni compradores.
+    """
+
+    # Arrays que cambian durante la subasta (valoraciones e ids son fijos)
+    _ESTADO = ("reserve_price", "min_increment", "current_price", "highest_bid", "second_highest_bid",
+               "highest_bidder", "buyers_count", "active_object")
+
+    def __init__(self, reserve_prices, min_increments, valoraciones, ids=None, compradores=None):
+        """
+        Args:
+            reserve_prices (array-like): Precio de reserva de cada objeto.
+            min_increments (array-like): Incremento mínimo de cada objeto.
+            valoraciones (array-like): Valoración de cada comprador en orden de llegada.
+            ids (array-like | None): Identificadores de los compradores (por defecto 1..n).
+            compradores (np.ndarray | None): Compradores Buyer de los que procede el estado; si se
+                indican, las vistas devuelven estos mismos objetos como highest_bidder.
+        """
+        self.reserve_price = np.array(reserve_prices, dtype=float)
+        self.min_increment = np.array(min_increments, dtype=float)
+        m = len(self.reserve_price)
+        self.current_price = np.zeros(m)
+        self.highest_bid = np.zeros(m)
+        self.second_highest_bid = np.zeros(m)
+        self.highest_bidder = np.full(m, -1, dtype=np.intp)
+        self.buyers_count = np.zeros(m, dtype=np.int64)
+
+        self.valoracion = np.array(valoraciones, dtype=float)
+        n = len(self.valoracion)
+        self.ids = np.arange(1, n + 1) if ids is None else np.asarray(ids)
+        self.active_object = np.full(n, -1, dtype=np.intp)
+        self.compradores = compradores
+
+    @classmethod
+    def desde_poblacion(cls, poblacion: PoblacionBuyers, reserve_prices, min_increments):
+        """Estado inicial para una PoblacionBuyers, sin materializar compradores."""
+        return cls(reserve_prices, min_increments, poblacion.valoraciones_llegada, poblacion.ids_llegada)
+
+    @classmethod
+    def desde_compradores(cls, compradores, reserve_prices, min_increments):
+        """
+        Estado inicial para un array de Buyer en orden de llegada. Se respeta el active_object que
+        los compradores traigan de antes (ID del objeto), igual que en el motor con objetos.
+        """
+        estado = cls(reserve_prices, min_increments, [b.valoracion for b in compradores],
+                     [b.ID for b in compradores], compradores)
+        estado.active_object[:] = [-1 if b.active_object is None else b.active_object - 1 for b in compradores]
+        return estado
+
+    @property
+    def n(self) -> int:
+        return len(self.valoracion)
+
+    @property
+    def m(self) -> int:
+        return len(self.reserve_price)
+
+    def precios_entrada(self) -> np.ndarray:
+        """
+        Precio de entrada de todos los objetos: la reserva si no hay pujas y current_price +
+        min_increment en caso contrario (ver Objeto.enter_price).
+        """
+        return np.where(self.highest_bidder < 0, self.reserve_price, self.current_price + self.min_increment)
+
+    def precio_entrada(self, j: int) -> float:
+        """Precio de entrada del objeto j (versión escalar de precios_entrada)."""
+        if self.highest_bidder[j] < 0:
+            return float(self.reserve_price[j])
+        return float(self.current_price[j] + self.min_increment[j])
+
+    def factibles(self, compradores=None) -> np.ndarray:
+        """
+        Matriz de viabilidad: entrada (k, j) True si el comprador k puede pujar en el objeto j
+        (ver Buyer.puede_pujar).
+
+        Args:
+            compradores (array-like | None): Índices de los compradores a consultar (todos si es None).
+
+        Returns:
+            np.ndarray: Matriz booleana (k, m).
+        """
+        valoracion = self.valoracion if compradores is None else self.valoracion[compradores]
+        return valoracion[:, None] >= self.precios_entrada()[None, :]
+
+    def num_factibles(self, compradores=None) -> np.ndarray:
+        """
+        Número de objetos en los que puede pujar cada comprador, sin construir la matriz de factibles:
+        se ordenan una vez los precios de entrada y cada valoración se busca con searchsorted, con
+        coste O((n + m) log m) y memoria O(n + m) (apto para mercados con miles de objetos).
+
+        Args:
+            compradores (array-like | None): Índices de los compradores a consultar (todos si es None).
+
+        Returns:
+            np.ndarray: Número de objetos viables de cada comprador.
+        """
+        valoracion = self.valoracion if compradores is None else self.valoracion[compradores]
+        return np.searchsorted(np.sort(self.precios_entrada()), valoracion, side="right")
+
+    def registrar_puja(self, j: int, i: int, bid_max: float = None) -> bool:
+        """
+        Registra la puja proxy del comprador i en el objeto j con la misma regla que Objeto.registrar_puja.
+
+        Args:
+            j (int): Índice del objeto.
+            i (int): Índice (posición de llegada) del comprador.
+            bid_max (float | None): Puja máxima; por defecto la valoración del comprador.
+
+        Returns:
+            bool: True si la puja fue aceptada, False si fue ignorada.
+        """
+        bid_max = float(self.valoracion[i]) if bid_max is None else bid_max
+        if bid_max < self.precio_entrada(j):
+            return False
+        self.buyers_count[j] += 1
+        if self.highest_bidder[j] < 0:
+            self.highest_bid[j] = bid_max
+            self.highest_bidder[j] = i
+            self.current_price[j] = self.reserve_price[j]
+        else:
+            if bid_max > self.highest_bid[j]:
+                self.second_highest_bid[j] = self.highest_bid[j]
+                self.highest_bid[j] = bid_max
+                self.highest_bidder[j] = i
+            else:
+                self.second_highest_bid[j] = max(self.second_highest_bid[j], bid_max)
+            self.current_price[j] = min(self.highest_bid[j], self.second_highest_bid[j] + self.min_increment[j])
+        return True
+
+    def instantanea(self) -> dict:
+        """
+        Copia de los arrays que describen el estado del mercado (parámetros y subasta de cada objeto y
+        objeto activo de cada comprador), para volver a él con restaurar.
+        """
+        return {nombre: getattr(self, nombre).copy() for nombre in self._ESTADO}
+
+    def restaurar(self, instantanea: dict):
+        """Devuelve el mercado al estado guardado con instantanea (copia sobre los arrays actuales)."""
+        for nombre, valores in instantanea.items():
+            getattr(self, nombre)[:] = valores
+
+    def bifurcar(self, orden=None):
+        """
+        Crea un mercado independiente con el mismo estado que este, opcionalmente con otro orden de
+        llegada, para evaluar escenarios contrafactuales desde un estado inicial compartido.
+
+        La copia no conserva los compradores Buyer de origen (si los hay), de modo que resolverla no
+        modifica ningún objeto compartido con este mercado.
+
+        Args:
+            orden (array-like | None): Permutación de las posiciones de llegada: el comprador en la
+                posición p de la copia es el de la posición orden[p] de este mercado. Por defecto se
+                conserva el orden.
+
+        Returns:
+            EstadoMercado: Mercado con arrays propios.
+        """
+        orden = np.arange(self.n) if orden is None else np.asarray(orden, dtype=np.intp)
+        copia = EstadoMercado(self.reserve_price, self.min_increment, self.valoracion[orden], self.ids[orden])
+        copia.restaurar(self.instantanea())
+        copia.active_object[:] = self.active_object[orden]
+        # highest_bidder guarda posiciones de llegada: se traducen al nuevo orden
+        inversa = np.empty_like(orden)
+        inversa[orden] = np.arange(len(orden))
+        vendidos = self.vendidos()
+        copia.highest_bidder[vendidos] = inversa[self.highest_bidder[vendidos]]
+        return copia
+
+    def intercambiar(self, pos_a: int, pos_b: int):
+        """
+        Bifurcación en la que se intercambian los compradores que llegan en las posiciones pos_a y pos_b
+        (equivalente a Poblacion.intercambiar).
+        """
+        orden = np.arange(self.n)
+        orden[[pos_a, pos_b]] = orden[[pos_b, pos_a]]
+        return self.bifurcar(orden)
+
+    def vendidos(self) -> np.ndarray:
+        """Máscara de los objetos con ganador."""
+        return self.highest_bidder >= 0
+
+    def comprador(self, i: int) -> Buyer:
+        """
+        Comprador i como objeto Buyer: el original si el estado procede de desde_compradores o una
+        vista nueva en otro caso (con su active_object actual).
+        """
+        if self.compradores is not None:
+            return self.compradores[i]
+        buyer = Buyer(ID=int(self.ids[i]), valoracion=float(self.valoracion[i]))
+        if self.active_object[i] >= 0:
+            buyer.active_object = int(self.active_object[i]) + 1
+        return buyer
+
+    def sincronizar_compradores(self):
+        """Copia active_object del estado a los compradores Buyer originales (si los hay)."""
+        if self.compradores is None:
+            return
+        for buyer, j in zip(self.compradores, self.active_object):
+            buyer.active_object = None if j < 0 else int(j) + 1
+
+    def objetos(self) -> list:
+        """Vistas de los m objetos con la API de Objeto."""
+        return [ObjetoVista(self, j) for j in range(self.m)]
+
+
+class ObjetoVista:
+    """
+    Vista de solo lectura de un objeto de un EstadoMercado con los atributos de Objeto (ID,
+    reserve_price, min_increment, current_price, highest_bid, second_highest_bid, highest_bidder,
+    buyers_count y enter_price()). Refleja siempre el estado actual del mercado.
+    """
+
+    def __init__(self, estado: EstadoMercado, j: int):
+        self._estado = estado
+        self._j = j
+        self.ID = j + 1
+
+    @property
+    def reserve_price(self) -> float:
+        return float(self._estado.reserve_price[self._j])
+
+    @property
+    def min_increment(self) -> float:
+        return float(self._estado.min_increment[self._j])
+
+    @property
+    def current_price(self) -> float:
+        return float(self._estado.current_price[self._j])
+
+    @property
+    def highest_bid(self) -> float:
+        return float(self._estado.highest_bid[self._j])
+
+    @property
+    def second_highest_bid(self) -> float:
+        return float(self._estado.second_highest_bid[self._j])
+
+    @property
+    def buyers_count(self) -> int:
+        return int(self._estado.buyers_count[self._j])
+
+    @property
+    def highest_bidder(self):
+        i = self._estado.highest_bidder[self._j]
+        return None if i < 0 else self._estado.comprador(int(i))
+
+    def enter_price(self) -> float:
+        return self._estado.precio_entrada(self._j)
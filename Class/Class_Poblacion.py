@@ -0,0 +1,96 @@
+import abc
+import numpy as np
+from Class.Generador import obtener_generador
+
+
+class Poblacion(abc.ABC):
+    """
+    Población de compradores almacenada en arrays contiguos en lugar de como un array de objetos.
+
+    Guarda tres vectores:
+        - ids: identificadores enteros 1..n (sustituyen a las cadenas "ID{i}").
+        - valoraciones: valoración privada de cada comprador, indexada por ID - 1.
+        - orden: permutación de índices que define el orden de llegada a la subasta.
+
+    Los motores de subasta aceptan directamente una Poblacion como `biders`. Cuando el código
+    necesita objetos individuales (por ejemplo, para consultar highest_bidder.ID), la población
+    construye vistas bajo demanda mediante `_vista`, método abstracto que cada subclase implementa
+    para devolver el tipo de comprador de su modelo (Licitadores, Buyer...).
+    """
+
+    def __init__(self, valoraciones, orden=None):
+        """
+        Args:
+            valoraciones (np.ndarray): Valoraciones de los n compradores, indexadas por ID - 1.
+            orden (np.ndarray | None): Permutación de 0..n-1 con el orden de llegada. Si es None,
+                    los compradores llegan en orden de ID.
+        """
+        self.valoraciones = np.ascontiguousarray(valoraciones, dtype=float)
+        n = len(self.valoraciones)
+        self.ids = np.arange(1, n + 1)
+        self.orden = np.arange(n) if orden is None else np.ascontiguousarray(orden, dtype=np.intp)
+
+    @classmethod
+    def generar(cls, n: int, rng=None):
+        """
+        Genera n compradores con valoraciones i.i.d. U(0,1) y un orden de llegada aleatorio,
+        con una única extracción vectorial para cada array.
+
+        Args:
+            n (int): Número de compradores.
+            rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+        """
+        rng = obtener_generador(rng)
+        valoraciones = rng.uniform(0, 1, n)
+        return cls(valoraciones, rng.permutation(n))
+
+    @property
+    def valoraciones_llegada(self) -> np.ndarray:
+        """Valoraciones dispuestas en orden de llegada."""
+        return self.valoraciones[self.orden]
+
+    @property
+    def ids_llegada(self) -> np.ndarray:
+        """Identificadores dispuestos en orden de llegada."""
+        return self.ids[self.orden]
+
+    def reordenar(self, orden):
+        """
+        Devuelve una población que comparte valoraciones e IDs con esta pero con otro orden de llegada.
+        """
+        return type(self)(self.valoraciones, orden)
+
+    def intercambiar(self, pos_a: int, pos_b: int):
+        """
+        Devuelve una nueva población en la que se intercambian los compradores que llegan en las
+        posiciones pos_a y pos_b (equivalente a order[[a, b]] = order[[b, a]] sobre un array de objetos).
+        """
+        orden = self.orden.copy()
+        orden[[pos_a, pos_b]] = orden[[pos_b, pos_a]]
+        return self.reordenar(orden)
+
+    def vistas(self) -> np.ndarray:
+        """
+        Construye las vistas de objeto de todos los compradores en orden de llegada.
+
+        Returns:
+            np.ndarray: Array de objetos con la misma forma que devolvían los generadores originales.
+        """
+        buyers_array = np.empty(len(self), dtype=object)
+        for pos, idx in enumerate(self.orden):
+            buyers_array[pos] = self._vista(idx)
+        return buyers_array
+
+    @abc.abstractmethod
+    def _vista(self, idx: int):
+        """Comprador con índice (ID - 1) idx como objeto del modelo de la subclase."""
+
+    def __len__(self):
+        return len(self.orden)
+
+    def __getitem__(self, pos: int):
+        return self._vista(self.orden[pos])
+
+    def __iter__(self):
+        for idx in self.orden:
+            yield self._vista(idx)
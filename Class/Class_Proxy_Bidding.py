@@ -1,18 +1,26 @@
-import numpy as np
+from Class.Class_Poblacion import Poblacion
+from Class.Generador import obtener_generador
 
 class Licitadores:
     """
     Clase cuyos objetos únicamente tendrán como atributo un ID identificador y la valoración del objeto subastado.
     Tal valoración será una variable aleatoria independiente distribuida según una Uniforme (0 , 1).
+    Si se proporciona `valoracion` (p. ej. al construir una vista desde PoblacionLicitadores), no se extrae;
+    en caso contrario se extrae de `rng` (generador o semilla, ver obtener_generador).
     """
 
-    def __init__(self, ID : int):
+    def __init__(self, ID : int, valoracion: float = None, rng=None):
         self.ID = ID
-        self.valoracion = np.random.uniform(0,1)
+        self.valoracion = obtener_generador(rng).uniform(0,1) if valoracion is None else valoracion
     def __repr__(self):
         return f"Licitador(ID={self.ID}, valoracion={self.valoracion: .3f})"
 
 
+class PoblacionLicitadores(Poblacion):
+    """
+    Población de licitadores del caso uniobjeto respaldada por arrays (ver Poblacion).
+    Las vistas individuales son objetos Licitadores con ID entero.
+    """
 
-
-
+    def _vista(self, idx: int) -> Licitadores:
+        return Licitadores(ID=int(self.ids[idx]), valoracion=float(self.valoraciones[idx]))
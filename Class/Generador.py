@@ -0,0 +1,45 @@
+import numpy as np
+
+
+def obtener_generador(rng=None):
+    """
+    Normaliza el argumento `rng` que aceptan los constructores, motores y funciones de simulación.
+
+    Args:
+        rng (np.random.Generator | np.random.RandomState | int | np.random.SeedSequence | None):
+            - Generator o RandomState: se devuelve tal cual (las extracciones avanzan su estado).
+            - int o SeedSequence: semilla con la que se crea un np.random.default_rng.
+            - None: se usa el generador global de NumPy, de modo que np.random.seed fija la
+              secuencia. Esa secuencia no coincide con la de versiones anteriores del código: los
+              muestreadores por bloques, matriciales y en banda consumen los números en otro orden.
+
+    Returns:
+        np.random.Generator | np.random.RandomState: Generador del que extraer los números aleatorios.
+    """
+    if rng is None:
+        # Instancia que respalda a las funciones np.random.* (la misma que usa scipy por defecto)
+        return np.random.mtrand._rand
+    if isinstance(rng, (np.random.Generator, np.random.RandomState)):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def enteros(rng, alto: int, size=None):
+    """
+    Enteros uniformes en [0, alto), con la API de Generator (integers) o de RandomState (randint).
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng.integers(alto, size=size)
+    return rng.randint(alto, size=size, dtype=np.int64)
+
+
+def semilla_derivada(rng=None) -> np.random.SeedSequence:
+    """
+    Devuelve una SeedSequence de la que derivar flujos independientes (p. ej. con spawn).
+    Una semilla entera o SeedSequence se usa directamente; en otro caso se extrae una semilla del generador.
+    """
+    if isinstance(rng, np.random.SeedSequence):
+        return rng
+    if isinstance(rng, (int, np.integer)):
+        return np.random.SeedSequence(int(rng))
+    return np.random.SeedSequence(int(enteros(obtener_generador(rng), 2 ** 63)))
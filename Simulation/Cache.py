@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+import numpy as np
+from Simulation.Estadisticos import Acumulador, fusionar_acumuladores
+
+# Raíz del proyecto y carpetas cuyo código determina los resultados de las simulaciones
+RAIZ = Path(__file__).resolve().parent.parent
+CARPETAS_CODIGO = ("Class", "eBay", "Simulation")
+# Directorio de la caché (configurable con la variable de entorno TFG_CACHE_DIR)
+DIRECTORIO_CACHE = Path(os.environ.get("TFG_CACHE_DIR", RAIZ / ".cache_simulaciones"))
+
+
+@lru_cache(maxsize=None)
+def version_codigo() -> str:
+    """
+    Huella del código fuente de Class, eBay y Simulation. Cualquier cambio en esos módulos produce
+    una huella distinta, de modo que las entradas calculadas con una versión anterior no se reutilizan.
+    """
+    huella = hashlib.sha256()
+    for carpeta in CARPETAS_CODIGO:
+        for ruta in sorted((RAIZ / carpeta).glob("*.py")):
+            huella.update(ruta.name.encode())
+            huella.update(ruta.read_bytes())
+    return huella.hexdigest()[:16]
+
+
+def _normalizar(valor):
+    """Convierte parámetros (arrays y escalares de NumPy incluidos) a tipos serializables en JSON."""
+    if isinstance(valor, dict):
+        return {str(clave): _normalizar(v) for clave, v in sorted(valor.items())}
+    if isinstance(valor, (list, tuple, np.ndarray)):
+        return [_normalizar(v) for v in valor]
+    if isinstance(valor, (bool, np.bool_)):
+        return bool(valor)
+    if isinstance(valor, (int, np.integer)):
+        return int(valor)
+    if isinstance(valor, (float, np.floating)):
+        return float(valor)
+    return valor
+
+
+def clave_cache(funcion_acumular, semilla: int, parametros: dict, fragmentos: int = 1) -> dict:
+    """
+    Describe una entrada de la caché: función, parámetros, semilla, número de fragmentos y versión
+    del código.
+
+    Returns:
+        dict: Descripción de la entrada; su campo 'clave' es el hash SHA-256 del resto.
+    """
+    descripcion = {'funcion': f"{funcion_acumular.__module__}.{funcion_acumular.__qualname__}",
+                   'parametros': _normalizar(parametros), 'semilla': semilla, 'fragmentos': int(fragmentos),
+                   'version': version_codigo()}
+    contenido = json.dumps(descripcion, sort_keys=True)
+    descripcion['clave'] = hashlib.sha256(contenido.encode()).hexdigest()
+    return descripcion
+
+
+def _semilla_bloque(semilla: int, bloque: int):
+    """
+    Semilla del bloque i de una entrada. El bloque 0 usa la semilla original, por lo que la primera
+    ejecución coincide con la llamada sin caché; los bloques de ampliación usan flujos independientes.
+    """
+    return semilla if bloque == 0 else np.random.SeedSequence([semilla, bloque])
+
+
+def _leer(ruta: Path) -> list:
+    if not ruta.exists():
+        return []
+    with open(ruta, encoding="utf-8") as fichero:
+        return json.load(fichero)['bloques']
+
+
+def _escribir(ruta: Path, descripcion: dict, bloques: list):
+    """Escribe la entrada de forma atómica (fichero temporal + os.replace)."""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_suffix(f".{os.getpid()}.tmp")
+    with open(temporal, "w", encoding="utf-8") as fichero:
+        json.dump(dict(descripcion, bloques=bloques), fichero)
+    os.replace(temporal, ruta)
+
+
+def _serializar(acumuladores: dict) -> dict:
+    return {clave: [acc.a_dict() for acc in lista] for clave, lista in acumuladores.items()}
+
+
+def _deserializar(estado: dict) -> dict:
+    return {clave: [Acumulador.desde_dict(acc) for acc in lista] for clave, lista in estado.items()}
+
+
+def acumular_con_cache(funcion_acumular, simulations: int, semilla, ejecutar, parametros: dict,
+                       fragmentos: int = 1) -> dict:
+    """
+    Devuelve los acumuladores de un barrido desde la caché en disco, calculando solo lo que falte.
+
+    Cada entrada guarda una lista de bloques de simulaciones con sus acumuladores por punto de la malla:
+        - Si los primeros bloques suman exactamente `simulations`, se fusionan y se devuelven sin simular.
+        - Si la entrada tiene menos simulaciones de las pedidas, se simula solo la diferencia en un bloque
+          nuevo (con un flujo aleatorio propio), se añade a la entrada y se devuelve el total.
+        - Si ningún prefijo coincide (se piden menos simulaciones de las guardadas), se simula sin usar la caché.
+
+    El número de fragmentos en que se reparte el barrido (ver Paralelo.numero_fragmentos) forma parte
+    de la clave: cada fragmento usa su propio flujo aleatorio, así que una ejecución en serie y otra
+    repartida en fragmentos dan resultados distintos con la misma semilla y no comparten entrada.
+
+    Args:
+        funcion_acumular (callable): Núcleo del barrido (_acumular_*), que identifica la entrada.
+        simulations (int): Número de simulaciones pedidas.
+        semilla (int): Semilla entera; sin ella los resultados no serían reproducibles y no se guardan.
+        ejecutar (callable): ejecutar(simulations, rng) -> acumuladores, en serie o en paralelo.
+        parametros (dict): Resto de argumentos del barrido (forman parte de la clave).
+        fragmentos (int): Número de fragmentos con que ejecutar reparte las simulaciones.
+
+    Returns:
+        dict: Acumuladores del barrido (ver acumuladores_barrido).
+    """
+    if not isinstance(semilla, (int, np.integer)):
+        raise ValueError("La caché de resultados necesita una semilla entera en rng")
+    semilla = int(semilla)
+    if simulations <= 0:
+        return ejecutar(simulations, semilla)
+    descripcion = clave_cache(funcion_acumular, semilla, parametros, fragmentos)
+    ruta = DIRECTORIO_CACHE / f"{descripcion['clave']}.json"
+    bloques = _leer(ruta)
+
+    acumulado = 0
+    for i, bloque in enumerate(bloques):
+        acumulado += bloque['simulations']
+        if acumulado == simulations:
+            return fusionar_acumuladores([_deserializar(b['acumuladores']) for b in bloques[:i + 1]])
+        if acumulado > simulations:
+            return ejecutar(simulations, semilla)
+
+    # Ampliación: solo se simulan las que faltan
+    faltan = simulations - acumulado
+    nuevo = ejecutar(faltan, _semilla_bloque(semilla, len(bloques)))
+    bloques.append({'simulations': faltan, 'acumuladores': _serializar(nuevo)})
+    _escribir(ruta, descripcion, bloques)
+    return fusionar_acumuladores([_deserializar(b['acumuladores']) for b in bloques])
@@ -0,0 +1,207 @@
+import numpy as np
+from scipy.stats import norm
+
+
+class Acumulador:
+    """
+    Acumulador de estadísticos en flujo con memoria constante.
+
+    Mantiene el número de observaciones, la media y la suma de cuadrados de desviaciones
+    (algoritmo de Welford en su versión por bloques de Chan et al.), además del mínimo y el máximo.
+    Dos acumuladores pueden fusionarse sin pérdida, lo que permite repartir las simulaciones en
+    bloques o entre procesos y combinar los resultados parciales al final.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+
+    def actualizar(self, valores):
+        """
+        Incorpora un valor o un bloque de valores.
+
+        Args:
+            valores (float | np.ndarray): Observaciones a añadir.
+
+        Returns:
+            Acumulador: El propio acumulador, para encadenar llamadas.
+        """
+        valores = np.asarray(valores, dtype=float).ravel()
+        if len(valores) == 0:
+            return self
+        bloque = Acumulador()
+        bloque.n = len(valores)
+        bloque.media = float(np.mean(valores))
+        bloque.m2 = float(np.sum((valores - bloque.media) ** 2))
+        bloque.minimo = float(np.min(valores))
+        bloque.maximo = float(np.max(valores))
+        return self.fusionar(bloque)
+
+    def fusionar(self, otro):
+        """
+        Combina en este acumulador los estadísticos de otro.
+
+        Args:
+            otro (Acumulador): Acumulador con observaciones disjuntas de las de este.
+
+        Returns:
+            Acumulador: El propio acumulador, para encadenar llamadas.
+        """
+        if otro.n == 0:
+            return self
+        if self.n == 0:
+            self.n, self.media, self.m2 = otro.n, otro.media, otro.m2
+            self.minimo, self.maximo = otro.minimo, otro.maximo
+            return self
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media += delta * otro.n / n
+        self.m2 += otro.m2 + delta ** 2 * self.n * otro.n / n
+        self.n = n
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+        return self
+
+    @property
+    def varianza(self) -> float:
+        """Varianza muestral (ddof = 1); 0 con menos de dos observaciones."""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def error_estandar(self) -> float:
+        """Error estándar de la media."""
+        return np.sqrt(self.varianza / self.n) if self.n > 1 else 0.0
+
+    def a_dict(self) -> dict:
+        """Estado completo del acumulador como diccionario serializable (p. ej. en JSON)."""
+        return {'n': self.n, 'media': self.media, 'm2': self.m2, 'minimo': self.minimo, 'maximo': self.maximo}
+
+    @classmethod
+    def desde_dict(cls, estado: dict):
+        """Reconstruye un acumulador a partir de a_dict."""
+        acumulador = cls()
+        acumulador.n = int(estado['n'])
+        acumulador.media = float(estado['media'])
+        acumulador.m2 = float(estado['m2'])
+        acumulador.minimo = float(estado['minimo'])
+        acumulador.maximo = float(estado['maximo'])
+        return acumulador
+
+    def __repr__(self):
+        return f"Acumulador(n={self.n}, media={self.media: .4f}, se={self.error_estandar: .4f})"
+
+
+def acumuladores_barrido(puntos: int, crn: bool = False, convergencia: bool = False) -> dict:
+    """
+    Crea la estructura de acumuladores de un barrido de `puntos` valores de la malla.
+
+    Returns:
+        dict:
+            - 'results': un Acumulador de precios por punto de la malla.
+            - 'bids': un Acumulador de número de pujas por punto de la malla.
+            - 'diferencias': solo si crn=True, un Acumulador de diferencias pareadas de precio por
+              cada par de puntos consecutivos.
+            - 'no_convergidas': solo si convergencia=True, un Acumulador por punto de la malla con
+              un 1 por cada subasta que no alcanza el punto fijo (max_iter agotado o ciclo) y un 0 en
+              otro caso; su media es la tasa de no convergencia.
+    """
+    acumuladores = {'results': [Acumulador() for _ in range(puntos)],
+                    'bids': [Acumulador() for _ in range(puntos)]}
+    if crn:
+        acumuladores['diferencias'] = [Acumulador() for _ in range(max(puntos - 1, 0))]
+    if convergencia:
+        acumuladores['no_convergidas'] = [Acumulador() for _ in range(puntos)]
+    return acumuladores
+
+
+def fusionar_acumuladores(parciales: list) -> dict:
+    """
+    Fusiona los acumuladores de barrido obtenidos sobre fragmentos disjuntos de las simulaciones
+    (p. ej. en procesos distintos).
+
+    Args:
+        parciales (list[dict]): Estructuras de acumuladores_barrido de la misma malla.
+
+    Returns:
+        dict: Estructura con los estadísticos combinados.
+    """
+    total = {clave: [Acumulador() for _ in lista] for clave, lista in parciales[0].items()}
+    for parcial in parciales:
+        for clave, lista in parcial.items():
+            for acumulado, acc in zip(total[clave], lista):
+                acumulado.fusionar(acc)
+    return total
+
+
+def resultados_barrido(acumuladores: dict, errores: bool = False):
+    """
+    Convierte los acumuladores de un barrido en las listas que devuelven las funciones sim_*.
+
+    Args:
+        acumuladores (dict): Estructura creada con acumuladores_barrido.
+        errores (bool): Si es True, se añade el diccionario de errores estándar aunque el barrido
+            no use números aleatorios comunes.
+
+    Returns:
+        tuple:
+            - results (list): media de cada punto (0.0 si no hay observaciones).
+            - bids (list): número medio de pujas de cada punto.
+            - info (dict): solo si errores=True o el barrido es CRN. Contiene 'results_se',
+              'bids_se' y 'acumuladores', en modo CRN 'diferencias' y 'se' (media y error estándar
+              de las diferencias pareadas entre puntos consecutivos) y, si el barrido registra la
+              convergencia, 'no_convergidas' (tasa por punto de la malla).
+
+    Si alguna subasta del barrido no converge se avisa por pantalla, ya que su resultado no es un
+    equilibrio de la dinámica.
+    """
+    results = [acc.media if acc.n else 0.0 for acc in acumuladores['results']]
+    bids = [acc.media if acc.n else 0.0 for acc in acumuladores['bids']]
+    crn = 'diferencias' in acumuladores
+    no_convergidas = None
+    if 'no_convergidas' in acumuladores:
+        no_convergidas = [acc.media if acc.n else 0.0 for acc in acumuladores['no_convergidas']]
+        if any(no_convergidas):
+            print(f"Aviso: {sum(acc.n * tasa for acc, tasa in zip(acumuladores['no_convergidas'], no_convergidas)):.0f} "
+                  f"subastas no han convergido (tasa máxima por punto {max(no_convergidas):.2%})")
+    if not (errores or crn):
+        return results, bids
+    info = {'results_se': [acc.error_estandar for acc in acumuladores['results']],
+            'bids_se': [acc.error_estandar for acc in acumuladores['bids']],
+            'acumuladores': acumuladores}
+    if crn:
+        info['diferencias'] = [acc.media for acc in acumuladores['diferencias']]
+        info['se'] = [acc.error_estandar for acc in acumuladores['diferencias']]
+    if no_convergidas is not None:
+        info['no_convergidas'] = no_convergidas
+    return results, bids, info
+
+
+def intervalo_binomial(exitos, ensayos: int, alpha: float = 0.05):
+    """
+    Intervalo de confianza de Wilson para una o varias proporciones binomiales.
+
+    Se prefiere al intervalo normal (Wald) porque mantiene la cobertura cuando la probabilidad es
+    cercana a 0, como ocurre con la probabilidad de ganar desde posiciones tempranas.
+
+    Args:
+        exitos (int | np.ndarray): Número de éxitos (p. ej. victorias por posición de llegada).
+        ensayos (int): Número de ensayos (subastas simuladas).
+        alpha (float): Nivel de significancia (intervalo al 1 - alpha).
+
+    Returns:
+        tuple:
+            ic_inf (np.ndarray): Extremo inferior del intervalo.
+            ic_sup (np.ndarray): Extremo superior del intervalo.
+    """
+    exitos = np.asarray(exitos, dtype=float)
+    if ensayos == 0:
+        return np.zeros_like(exitos), np.ones_like(exitos)
+    z = norm.ppf(1 - alpha / 2)
+    p = exitos / ensayos
+    denominador = 1 + z ** 2 / ensayos
+    centro = (p + z ** 2 / (2 * ensayos)) / denominador
+    semiancho = z * np.sqrt(p * (1 - p) / ensayos + z ** 2 / (4 * ensayos ** 2)) / denominador
+    return np.clip(centro - semiancho, 0, 1), np.clip(centro + semiancho, 0, 1)
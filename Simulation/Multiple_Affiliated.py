@@ -1,20 +1,38 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from eBay.Multiple_Affiliated_Proxy_Bidding import (ebay_affiliated_bidding_multiple,multiple_affiliated_arrival_order)
+from eBay.Multiple_Affiliated_Proxy_Bidding import (ebay_affiliated_bidding_multiple,multiple_affiliated_arrival_order,
+                                                    create_affiliated_objects)
+from Class.Class_Multiple_Affiliated import instantanea_compradores, restaurar_compradores
+from Simulation.Multiple_Proxy_Bidding_Simulation import ruido_parametros
+from Simulation.Estadisticos import acumuladores_barrido, resultados_barrido
+from Simulation.Paralelo import acumular
+from Class.Generador import obtener_generador, enteros
 
 
 def general_parameters(m: int, reserv_base: float, increment_base: float,
-                       sigma_reserve=0.05, sigma_increment=0.002):
+                       sigma_reserve=0.05, sigma_increment=0.002, ruido=None, rng=None):
     """
     Idéntica al caso eBay múltiple. Genera parámetros heterogéneos para m objetos.
+    Acepta un `ruido` ya extraído con ruido_parametros para el modo de números aleatorios comunes
+    y un `rng` (generador o semilla, ver obtener_generador).
     """
+    if ruido is None:
+        # Sin números aleatorios comunes se conserva el orden original de extracción por objeto
+        rng = obtener_generador(rng)
+        ruido_reserva, ruido_incremento = [], []
+        for j in range(m - 1):
+            ruido_reserva.append(rng.normal(0, sigma_reserve))
+            ruido_incremento.append(rng.normal(0, sigma_increment))
+    else:
+        ruido_reserva, ruido_incremento = ruido
+
     reserve_price = [reserv_base]
     min_increment = [increment_base]
 
     for j in range(m - 1):
-        s_j = reserv_base + np.random.normal(0, sigma_reserve)
+        s_j = reserv_base + ruido_reserva[j]
         s_j = max(0.0, s_j)
-        d_j = increment_base + np.random.normal(0, sigma_increment)
+        d_j = increment_base + ruido_incremento[j]
         d_j = max(1e-4, d_j)
         reserve_price.append(s_j)
         min_increment.append(d_j)
@@ -22,115 +40,130 @@ def general_parameters(m: int, reserv_base: float, increment_base: float,
     return reserve_price, min_increment
 
 
-def sim_reserve_multiple(n: int, m: int, reserve_price_list: list,min_increment: float, simulations: int,
-                         valuation_method,sigma_reserve: float = 0.05,sigma_increment: float = 0.002):
+def _acumular_barrido_multiple(n: int, m: int, reserve_values, increment_values, simulations: int,
+                               valuation_method, sigma_reserve: float, sigma_increment: float,
+                               crn: bool = False, rng=None) -> dict:
     """
-    Versión afiliada de la función sim_reserve_multiple para eBay múltiple.
+    Versión afiliada de _acumular_barrido_multiple para eBay múltiple. Como los AffiliatedBuyer modifican
+    sus valoraciones durante la subasta, en modo CRN los compradores extraídos para la simulación se
+    devuelven a su estado inicial (instantanea_compradores) antes de cada punto de la malla. Todas las
+    extracciones proceden de `rng`.
     """
-    results = []
-    bids = []
-    for s in reserve_price_list:
-        all_prices = []
-        all_buyers_counts = []
-        for _ in range(simulations):
+    rng = obtener_generador(rng)
+    puntos = len(reserve_values)
+    acumuladores = acumuladores_barrido(puntos, crn, convergencia=True)
+    for sim in range(simulations):
+        if crn:
+            order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method, rng=rng)
+            ruido = ruido_parametros(m, sigma_reserve, sigma_increment, rng)
+            inicial = instantanea_compradores(order)
+        else:
+            order, ruido = None, None
+        precio_medio = np.full(puntos, np.nan)
+        for g in range(puntos):
             # Generar parámetros
-            reserve_list, incr_list = general_parameters(m, reserv_base=s, increment_base=min_increment,
-                sigma_reserve=sigma_reserve, sigma_increment=sigma_increment)
+            reserve_list, incr_list = general_parameters(m, reserv_base=reserve_values[g],
+                                                         increment_base=increment_values[g],
+                                                         sigma_reserve=sigma_reserve,
+                                                         sigma_increment=sigma_increment, ruido=ruido, rng=rng)
             # Ejecutar subasta afiliada
-            objetos = ebay_affiliated_bidding_multiple(n, m, reserve_list, incr_list,valuation_method=valuation_method)
-
+            if crn:
+                restaurar_compradores(inicial)
+            objetos, info = ebay_affiliated_bidding_multiple(n, m, reserve_list, incr_list, biders=order,
+                                                             valuation_method=valuation_method, rng=rng,
+                                                             diagnostico=True)
+            acumuladores['no_convergidas'][g].actualizar(0.0 if info['convergido'] else 1.0)
             # Recoger resultados
-            for obj in objetos:
-                if obj.highest_bidder is not None:
-                    all_prices.append(obj.current_price)
-                    all_buyers_counts.append(obj.buyers_count)
+            vendidos = [obj for obj in objetos if obj.highest_bidder is not None]
+            if vendidos:
+                precios = np.array([obj.current_price for obj in vendidos])
+                acumuladores['results'][g].actualizar(precios)
+                acumuladores['bids'][g].actualizar([obj.buyers_count for obj in vendidos])
+                precio_medio[g] = np.mean(precios)
+        if crn:
+            delta = np.diff(precio_medio)
+            for g in np.flatnonzero(np.isfinite(delta)):
+                acumuladores['diferencias'][g].actualizar(delta[g])
+    return acumuladores
 
-        avg_price = np.mean(all_prices) if all_prices else 0.0
-        avg_buyers = np.mean(all_buyers_counts) if all_buyers_counts else 0.0
 
-        results.append(avg_price)
-        bids.append(avg_buyers)
-
-    return results, bids
+def sim_reserve_multiple(n: int, m: int, reserve_price_list: list,min_increment: float, simulations: int,
+                         valuation_method,sigma_reserve: float = 0.05,sigma_increment: float = 0.002,
+                         crn: bool = False, errores: bool = False, workers=None, rng=None,
+                         cache: bool = False):
+    """
+    Versión afiliada de la función sim_reserve_multiple para eBay múltiple.
+    Con crn=True se reutilizan compradores y ruido de parámetros en todos los s y se devuelven
+    además las diferencias pareadas; con errores=True, los errores estándar de cada punto. Con
+    workers > 1 las simulaciones se reparten entre procesos; rng fija el generador o la semilla y
+    cache=True reutiliza los resultados guardados en disco (requiere rng entero).
+    """
+    acumuladores = acumular(_acumular_barrido_multiple, simulations, workers, n=n, m=m,
+                            reserve_values=list(reserve_price_list),
+                            increment_values=[min_increment] * len(reserve_price_list),
+                            valuation_method=valuation_method, sigma_reserve=sigma_reserve,
+                            sigma_increment=sigma_increment, crn=crn, rng=rng, cache=cache)
+    return resultados_barrido(acumuladores, errores)
 
 
 def sim_increment_multiple(n: int, m: int, reserve_price: float,min_increment_list: list, simulations: int,
-                           valuation_method,sigma_reserve: float = 0.05,sigma_increment: float = 0.002):
+                           valuation_method,sigma_reserve: float = 0.05,sigma_increment: float = 0.002,
+                           crn: bool = False, errores: bool = False, workers=None, rng=None,
+                           cache: bool = False):
     """
     Versión afiliada de la función sim_increment_multiple para eBay múltiple..
+    Con crn=True se reutilizan compradores y ruido de parámetros en todos los d y se devuelven
+    además las diferencias pareadas; con errores=True, los errores estándar de cada punto. Con
+    workers > 1 las simulaciones se reparten entre procesos; rng fija el generador o la semilla y
+    cache=True reutiliza los resultados guardados en disco (requiere rng entero).
     """
-    results = []
-    bids = []
-    for d in min_increment_list:
-        all_prices = []
-        all_buyers_counts = []
-
-        for _ in range(simulations):
-            # Generar parámetros
-            reserve_list, incr_list = general_parameters(m, reserv_base=reserve_price, increment_base=d,
-                sigma_reserve=sigma_reserve, sigma_increment=sigma_increment)
-
-            # Ejecutar subasta afiliada
-            objetos = ebay_affiliated_bidding_multiple(n, m, reserve_list, incr_list,valuation_method=valuation_method)
-
-            # Recoger resultados
-            for obj in objetos:
-                if obj.highest_bidder is not None:
-                    all_prices.append(obj.current_price)
-                    all_buyers_counts.append(obj.buyers_count)
-
-        avg_price = np.mean(all_prices) if all_prices else 0.0
-        avg_buyers = np.mean(all_buyers_counts) if all_buyers_counts else 0.0
-
-        results.append(avg_price)
-        bids.append(avg_buyers)
-
-    return results, bids
+    acumuladores = acumular(_acumular_barrido_multiple, simulations, workers, n=n, m=m,
+                            reserve_values=[reserve_price] * len(min_increment_list),
+                            increment_values=list(min_increment_list),
+                            valuation_method=valuation_method, sigma_reserve=sigma_reserve,
+                            sigma_increment=sigma_increment, crn=crn, rng=rng, cache=cache)
+    return resultados_barrido(acumuladores, errores)
 
 
 def comparacion_simulaciones_multiple(n: int, m: int, max_min_increment: int,
-                                      sims: int, valuation_method):
+                                      sims: int, valuation_method, errores: bool = False, workers=None,
+                                      rng=None, cache: bool = False):
     """
     Versión afiliada de la función comparacion_simulaciones_multiple para eBay múltiple.
     """
     Min_increment = np.linspace(0, max_min_increment, 20)
 
-    results_increment, bids = sim_increment_multiple(n=n, m=m, reserve_price=0,min_increment_list=Min_increment,
-        simulations=sims,valuation_method=valuation_method)
+    salida = sim_increment_multiple(n=n, m=m, reserve_price=0,min_increment_list=Min_increment,
+        simulations=sims,valuation_method=valuation_method, errores=errores, workers=workers, rng=rng,
+        cache=cache)
 
-    return Min_increment, results_increment, bids
+    return (Min_increment,) + tuple(salida)
 
 
 def sim_bids_fixed_d_multiple(n: int, m: int, reserve_price: float,
                               d: float, simulations: int,
                               valuation_method,
-                              sigma_reserve=0.05, sigma_increment=0.002):
+                              sigma_reserve=0.05, sigma_increment=0.002, errores: bool = False,
+                              workers=None, rng=None, cache: bool = False):
     """
     Versión afiliada de la función sim_bids_fixed_d_multiple para eBay múltiple.
     """
-    all_buyers_counts = []
-
-    for _ in range(simulations):
-        # Generar parámetros heterogéneos
-        reserve_list, incr_list = general_parameters(m, reserv_base=reserve_price, increment_base=d,
-            sigma_reserve=sigma_reserve, sigma_increment=sigma_increment)
-
-        # Ejecutar subasta afiliada
-        objetos = ebay_affiliated_bidding_multiple(n, m, reserve_list, incr_list,valuation_method=valuation_method)
-
-        # Recoger número de pujadores por objeto
-        for obj in objetos:
-            if obj.highest_bidder is not None:
-                all_buyers_counts.append(obj.buyers_count)
-
-    return np.mean(all_buyers_counts) if all_buyers_counts else 0.0
+    acumulador = acumular(_acumular_barrido_multiple, simulations, workers, n=n, m=m,
+                          reserve_values=[reserve_price], increment_values=[d],
+                          valuation_method=valuation_method, sigma_reserve=sigma_reserve,
+                          sigma_increment=sigma_increment, rng=rng, cache=cache)['bids'][0]
+    media = acumulador.media if acumulador.n else 0.0
+    if errores:
+        return media, acumulador.error_estandar
+    return media
 
 
 def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int,
-                            valuation_method):
+                            valuation_method, rng=None):
     """
     Versión afiliada de la función prob_win_order_multiple para eBay múltiple.
     """
+    rng = obtener_generador(rng)
     resultados = {d: np.zeros(n) for d in d_values}
 
     for d in d_values:
@@ -139,14 +172,14 @@ def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int,
             wins = 0
             for sim in range(sims):
                 # Generar orden de llegada afiliado
-                order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method)
+                order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method, rng=rng)
 
                 # Generar parámetros
                 reserve_prices, min_increments = general_parameters(m, reserv_base=0, increment_base=d,
-                    sigma_reserve=0.05, sigma_increment=0.002)
+                    sigma_reserve=0.05, sigma_increment=0.002, rng=rng)
 
                 # Subasta afiliada
-                objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,biders=order,valuation_method=valuation_method)
+                objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,biders=order,valuation_method=valuation_method, rng=rng)
 
                 # Lista de ganadores
                 winners_ids = [obj.highest_bidder.ID for obj in objetos if obj.highest_bidder is not None]
@@ -163,12 +196,17 @@ def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int,
     return resultados
 
 
-def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,sims: int, k: int,valuation_method):
+def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,sims: int, k: int,valuation_method,
+                                               rng=None):
     """
     Versión afiliada de la función prob_kth_max_val_wins_by_position_multiple para eBay múltiple.
+    Los tres casos parten del mismo estado: los objetos se crean una vez y se bifurcan
+    (AffiliatedObject.bifurcar) y los compradores vuelven a su estado inicial tras cada subasta
+    (restaurar_compradores), de modo que un caso no arrastra las valoraciones aprendidas en otro.
     """
     if k < 1 or k > n:
         raise ValueError("k debe estar entre 1 y n")
+    rng = obtener_generador(rng)
 
     # Función auxiliar para obtener índice k-ésimo mayor
     def get_kth_index(vals, k):
@@ -181,7 +219,7 @@ def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,si
         wins = {"first": 0, "random": 0, "last": 0}
         for _ in range(sims):
             # Orden de llegada afiliado
-            order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method)
+            order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method, rng=rng)
 
             # Obtener valoraciones base
             vals = np.array([buyer.original_valuations.mean()
@@ -195,15 +233,18 @@ def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,si
             bidder_target = order[idx_target]
 
             # Generar parámetros
-            reserve_prices, min_increments = general_parameters(m, reserv_base=0, increment_base=d)
+            reserve_prices, min_increments = general_parameters(m, reserv_base=0, increment_base=d, rng=rng)
+            # Estado inicial compartido por los tres casos: objetos creados una vez y compradores guardados
+            objetos_iniciales = create_affiliated_objects(m, reserve_prices, min_increments, rng=rng)
+            inicial = instantanea_compradores(order)
 
             # CASO 1: Llega primero
             order_first = np.array(order, dtype=object)
             order_first[[0, idx_target]] = order_first[[idx_target, 0]]
-            for b in order_first:
-                b.active_object = None
             objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,biders=order_first,
-                valuation_method=valuation_method)
+                valuation_method=valuation_method,
+                objetos=[obj.bifurcar() for obj in objetos_iniciales])
+            restaurar_compradores(inicial)
 
             winners_ids = [obj.highest_bidder.ID for obj in objetos if obj.highest_bidder is not None]
 
@@ -212,13 +253,13 @@ def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,si
 
             # CASO 2: Llega aleatorio
             order_random = np.array(order, dtype=object)
-            pos_random = np.random.randint(0, n)
+            pos_random = enteros(rng, n)
             order_random[[pos_random, idx_target]] = order_random[[idx_target, pos_random]]
 
-            for b in order_random:
-                b.active_object = None
             objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,
-                biders=order_random,valuation_method=valuation_method)
+                biders=order_random,valuation_method=valuation_method,
+                objetos=[obj.bifurcar() for obj in objetos_iniciales])
+            restaurar_compradores(inicial)
 
             winners_ids = [obj.highest_bidder.ID for obj in objetos if obj.highest_bidder is not None]
 
@@ -228,11 +269,10 @@ def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,si
             # CASO 3: Llega último
             order_last = np.array(order, dtype=object)
             order_last[[n - 1, idx_target]] = order_last[[idx_target, n - 1]]
-            for b in order_last:
-                b.active_object = None
-
             objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,
-                biders=order_last,valuation_method=valuation_method)
+                biders=order_last,valuation_method=valuation_method,
+                objetos=[obj.bifurcar() for obj in objetos_iniciales])
+            restaurar_compradores(inicial)
 
             winners_ids = [obj.highest_bidder.ID for obj in objetos if obj.highest_bidder is not None]
 
@@ -249,23 +289,27 @@ def prob_kth_max_val_wins_by_position_multiple(n: int, m: int, d_values: list,si
 def expected_profit_k_phi_max_valuation_by_position_multiple(n: int, m: int,
                                                              d_values: list,
                                                              sims: int, k: int,
-                                                             valuation_method):
+                                                             valuation_method, rng=None, errores: bool = False):
     """
     Versión afiliada de la función expected_profit_k_phi_max_valuation_by_position_multiple para eBay múltiple.
+    Como en prob_kth_max_val_wins_by_position_multiple, los tres casos parten de los mismos objetos y
+    compradores (bifurcados y restaurados). Con errores=True se devuelven también los errores estándar
+    de cada beneficio esperado (ver expected_profit_k_ght_max_valuation_by_position_multiple).
     """
     if k < 1 or k > n:
         raise ValueError("k debe estar entre 1 y n")
+    rng = obtener_generador(rng)
 
     def get_kth_index(vals, k):
         idx_sorted = np.argsort(vals)
         return idx_sorted[-k]
 
-    results = {"first": [], "random": [], "last": []}
-    for d in d_values:
-        profits = {"first": [], "random": [], "last": []}
+    acumuladores = {regla: acumuladores_barrido(len(d_values)) for regla in ("first", "random", "last")}
+    for g, d in enumerate(d_values):
+        profits = {regla: acc['results'][g] for regla, acc in acumuladores.items()}
         for _ in range(sims):
             # Orden de llegada afiliado
-            order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method)
+            order = multiple_affiliated_arrival_order(n, m, valuation_method=valuation_method, rng=rng)
             # Obtener valoraciones base
             vals = np.array([buyer.original_valuations.mean()
                              if hasattr(buyer, 'original_valuations')
@@ -277,15 +321,18 @@ def expected_profit_k_phi_max_valuation_by_position_multiple(n: int, m: int,
             bidder_target = order[idx_target]
 
             # Generar parámetros
-            reserve_prices, min_increments = general_parameters(m, reserv_base=0, increment_base=d)
+            reserve_prices, min_increments = general_parameters(m, reserv_base=0, increment_base=d, rng=rng)
+            # Estado inicial compartido por los tres casos: objetos creados una vez y compradores guardados
+            objetos_iniciales = create_affiliated_objects(m, reserve_prices, min_increments, rng=rng)
+            inicial = instantanea_compradores(order)
 
             # CASO 1: Llega primero
             order_first = np.array(order, dtype=object)
             order_first[[0, idx_target]] = order_first[[idx_target, 0]]
-            for b in order_first:
-                b.active_object = None
             objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,
-                biders=order_first,valuation_method=valuation_method)
+                biders=order_first,valuation_method=valuation_method,
+                objetos=[obj.bifurcar() for obj in objetos_iniciales])
+            restaurar_compradores(inicial)
 
             # Calcular beneficio
             precios_ganados = [obj.current_price for obj in objetos
@@ -294,44 +341,45 @@ def expected_profit_k_phi_max_valuation_by_position_multiple(n: int, m: int,
 
             beneficio = bidder_target.original_valuations.mean() - sum(precios_ganados) \
                 if precios_ganados else 0
-            profits["first"].append(beneficio)
+            profits["first"].actualizar(beneficio)
 
             # CASO 2: Llega aleatorio
             order_random = np.array(order, dtype=object)
-            pos_random = np.random.randint(0, n)
+            pos_random = enteros(rng, n)
             order_random[[pos_random, idx_target]] = order_random[[idx_target, pos_random]]
-            for b in order_random:
-                b.active_object = None
             objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,
-                biders=order_random,valuation_method=valuation_method)
+                biders=order_random,valuation_method=valuation_method,
+                objetos=[obj.bifurcar() for obj in objetos_iniciales])
+            restaurar_compradores(inicial)
 
             precios_ganados = [obj.current_price for obj in objetos if obj.highest_bidder is not None
                                and obj.highest_bidder.ID == bidder_target.ID]
 
             beneficio = bidder_target.original_valuations.mean() - sum(precios_ganados) \
                 if precios_ganados else 0
-            profits["random"].append(beneficio)
+            profits["random"].actualizar(beneficio)
 
             # CASO 3: Llega último
             order_last = np.array(order, dtype=object)
             order_last[[n - 1, idx_target]] = order_last[[idx_target, n - 1]]
-            for b in order_last:
-                b.active_object = None
             objetos = ebay_affiliated_bidding_multiple(n, m, reserve_prices, min_increments,
-                biders=order_last,valuation_method=valuation_method)
+                biders=order_last,valuation_method=valuation_method,
+                objetos=[obj.bifurcar() for obj in objetos_iniciales])
+            restaurar_compradores(inicial)
 
             precios_ganados = [obj.current_price for obj in objetos if obj.highest_bidder is not None
                                and obj.highest_bidder.ID == bidder_target.ID]
 
             beneficio = bidder_target.original_valuations.mean() - sum(precios_ganados) \
                 if precios_ganados else 0
-            profits["last"].append(beneficio)
+            profits["last"].actualizar(beneficio)
 
-        # Guardar beneficios esperados
-        for key in results:
-            results[key].append(np.mean(profits[key]))
-
-    return results
+    # Guardar beneficios esperados
+    results, se = {}, {}
+    for regla, acc in acumuladores.items():
+        results[regla], _, info = resultados_barrido(acc, errores=True)
+        se[regla] = info['results_se']
+    return (results, se) if errores else results
 
 
 
@@ -393,24 +441,32 @@ def plot_expected_profits_multiple(d_values, results, k, m):
 
 # FUNCIÓN DE COMPARACIÓN ENTRE MODELOS
 
-def compare_models(n: int, m: int, max_min_increment: float, sims: int = 100):
+def compare_models(n: int, m: int, max_min_increment: float, sims: int = 100, workers=None, rng=None,
+                   cache: bool = False):
     """
-    Compara resultados entre modelo IPV y modelos afiliados.
+    Compara resultados entre modelo IPV y modelos afiliados. Con workers > 1 las simulaciones de cada
+    modelo se reparten entre procesos (ver ejecutar_en_paralelo); rng fija el generador o la semilla.
+    Con cache=True cada modelo se guarda en disco con la semilla entera rng (ver acumular_con_cache).
 
     Returns:
-        Diccionario con resultados para cada modelo
+        Diccionario con resultados para cada modelo (incluye los errores estándar de cada curva)
     """
     models = {"IPV": "independent","Common Value": "common_value","Correlated Private": "correlated_private"}
 
+    # La caché necesita la semilla entera; sin ella, los modelos comparten un único generador
+    if not cache:
+        rng = obtener_generador(rng)
     results = {}
 
     for model_name, valuation_method in models.items():
         print(f"\nSimulando modelo: {model_name}")
 
-        Min_increment, revenues, bids = comparacion_simulaciones_multiple(n=n, m=m, max_min_increment=max_min_increment,
-            sims=sims, valuation_method=valuation_method)
+        Min_increment, revenues, bids, info = comparacion_simulaciones_multiple(n=n, m=m,
+            max_min_increment=max_min_increment, sims=sims, valuation_method=valuation_method, errores=True,
+            workers=workers, rng=rng, cache=cache)
 
-        results[model_name] = {"d_values": Min_increment,"revenues": revenues,"bids": bids}
+        results[model_name] = {"d_values": Min_increment,"revenues": revenues,"bids": bids,
+                               "revenues_se": info["results_se"], "bids_se": info["bids_se"]}
 
     return results
 
@@ -427,6 +483,11 @@ def plot_model_comparison(results):
         ax.plot(data["d_values"], data["revenues"],
                 marker='o',
                 label=model_name)
+        if "revenues_se" in data:
+            # Banda de ±1.96 errores estándar alrededor de la curva
+            revenues = np.asarray(data["revenues"])
+            se = np.asarray(data["revenues_se"])
+            ax.fill_between(data["d_values"], revenues - 1.96 * se, revenues + 1.96 * se, alpha=0.2)
     ax.set_title("Model Comparison: Expected Revenue per Object", fontsize=18)
     ax.set_xlabel("Minimum bid increment d", fontsize=16)
     ax.set_ylabel("Expected auction revenue per object", fontsize=16)
@@ -1,8 +1,43 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from eBay.Multiple_Proxy_Bidding import ebay_proxy_bidding_multiple, multiple_arrival_order
+from eBay.Multiple_Proxy_Bidding import (ebay_proxy_bidding_multiple, ebay_proxy_bidding_multiple_estado,
+                                        multiple_arrival_population, ebay_proxy_bidding_multiple_batch,
+                                        multiple_arrival_order_batch, resolver_mercado)
+from Class.Class_Multiple_Proxy_Bidding import EstadoMercado
+from Simulation.Estadisticos import acumuladores_barrido, resultados_barrido
+from Simulation.Paralelo import acumular
+from Class.Generador import obtener_generador, enteros
 
-def generar_parametros(m: int,reserv_base: float,increment_base: float,sigma_reserve=0.05,sigma_increment=0.002):
+# Número máximo de mercados que se resuelven a la vez en el motor por lotes (acota la memoria)
+TAM_LOTE = 20_000
+
+
+def _lotes(simulations: int):
+    """Divide `simulations` en bloques de como mucho TAM_LOTE mercados."""
+    for inicio in range(0, simulations, TAM_LOTE):
+        yield min(TAM_LOTE, simulations - inicio)
+
+def ruido_parametros(m: int, sigma_reserve=0.05, sigma_increment=0.002, rng=None):
+    """
+    Extrae los términos gaussianos de heterogeneidad de generar_parametros para los m - 1 objetos
+    que no usan los valores base. Separarlos permite reutilizar el mismo ruido en todos los puntos
+    de una malla (números aleatorios comunes). `rng` es un generador o semilla (ver obtener_generador).
+
+    Solo se usa en el modo CRN: extrae primero las m - 1 reservas y después los m - 1 incrementos, por
+    lo que no reproduce la secuencia alternada (reserva, incremento, reserva, ...) de generar_parametros
+    sin ruido previo.
+
+    Returns:
+        tuple:
+            ruido_reserva (np.ndarray): m - 1 extracciones de N(0, sigma_reserve).
+            ruido_incremento (np.ndarray): m - 1 extracciones de N(0, sigma_increment).
+    """
+    rng = obtener_generador(rng)
+    return rng.normal(0, sigma_reserve, m - 1), rng.normal(0, sigma_increment, m - 1)
+
+
+def generar_parametros(m: int,reserv_base: float,increment_base: float,sigma_reserve=0.05,sigma_increment=0.002,
+                       ruido=None, rng=None):
     """
     Genera los parámetros heterogéneos (precio de reserva e incremento mínimo)
     para cada uno de los m objetos en una subasta múltiple eBay Proxy Bidding.
@@ -24,6 +59,9 @@ def generar_parametros(m: int,reserv_base: float,increment_base: float,sigma_res
         increment_base (float): Incremento mínimo base común.
         sigma_reserve (float): Desviación típica del ruido en los precios de reserva.
         sigma_increment (float): Desviación típica del ruido en los incrementos mínimos.
+        ruido (tuple | None): Ruido ya extraído con ruido_parametros. Si es None, se extrae uno nuevo
+            alternando reserva e incremento para cada objeto.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         tuple:
@@ -31,14 +69,23 @@ def generar_parametros(m: int,reserv_base: float,increment_base: float,sigma_res
             min_increment (list[float]): Lista de incrementos mínimos generados.
 
     """
+    if ruido is None:
+        # Sin números aleatorios comunes se conserva el orden original de extracción por objeto
+        rng = obtener_generador(rng)
+        ruido_reserva, ruido_incremento = [], []
+        for j in range(m-1):
+            ruido_reserva.append(rng.normal(0, sigma_reserve))
+            ruido_incremento.append(rng.normal(0, sigma_increment))
+    else:
+        ruido_reserva, ruido_incremento = ruido
 
     reserv_price = [reserv_base]
     min_increment = [increment_base]
 
     for j in range(m-1):
-        s_j = reserv_base + np.random.normal(0, sigma_reserve)
+        s_j = reserv_base + ruido_reserva[j]
         s_j = max(0.0, s_j)  #no negatividad
-        d_j = increment_base + np.random.normal(0, sigma_increment)
+        d_j = increment_base + ruido_incremento[j]
         d_j = max(1e-4, d_j)  # no negatividad
 
         reserv_price.append(s_j)
@@ -46,8 +93,146 @@ def generar_parametros(m: int,reserv_base: float,increment_base: float,sigma_res
 
     return reserv_price, min_increment
 
+
+def generar_parametros_lote(sims: int, m: int, reserv_base: float, increment_base: float, sigma_reserve=0.05,
+                            sigma_increment=0.002, ruido=None, rng=None):
+    """
+    Versión matricial de generar_parametros para `sims` mercados independientes: el objeto 0 usa los
+    valores base y los m - 1 restantes añaden ruido gaussiano, truncado igual que en generar_parametros
+    (reserva >= 0, incremento >= 1e-4).
+
+    Args:
+        sims (int): Número de mercados.
+        m (int): Número de objetos por mercado.
+        reserv_base (float): Precio de reserva base común.
+        increment_base (float): Incremento mínimo base común.
+        sigma_reserve (float): Desviación típica del ruido en los precios de reserva.
+        sigma_increment (float): Desviación típica del ruido en los incrementos mínimos.
+        ruido (tuple | None): Ruido ya extraído, como par de matrices (sims, m - 1). Si es None, se extrae uno nuevo.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+
+    Returns:
+        tuple:
+            reserv_price (np.ndarray): Matriz (sims, m) de precios de reserva.
+            min_increment (np.ndarray): Matriz (sims, m) de incrementos mínimos.
+    """
+    if ruido is None:
+        rng = obtener_generador(rng)
+        ruido = rng.normal(0, sigma_reserve, (sims, m - 1)), rng.normal(0, sigma_increment, (sims, m - 1))
+    ruido_reserva, ruido_incremento = ruido
+    reserv_price = np.empty((sims, m))
+    min_increment = np.empty((sims, m))
+    reserv_price[:, 0] = reserv_base
+    min_increment[:, 0] = increment_base
+    reserv_price[:, 1:] = np.maximum(0.0, reserv_base + ruido_reserva)
+    min_increment[:, 1:] = np.maximum(1e-4, increment_base + ruido_incremento)
+    return reserv_price, min_increment
+
+
+def _acumular_barrido_multiple_lote(n: int, m: int, reserve_values, increment_values, simulations: int,
+                                    sigma_reserve: float, sigma_increment: float, crn: bool = False,
+                                    rng=None) -> dict:
+    """
+    Versión por lotes de _acumular_barrido_multiple: en cada punto de la malla resuelve bloques de hasta
+    TAM_LOTE mercados a la vez con ebay_proxy_bidding_multiple_batch y acumula los mismos estadísticos.
+
+    Con crn=True las valoraciones y el ruido de parámetros de cada bloque se reutilizan en todos los
+    puntos de la malla. Las extracciones se hacen por bloques, así que para una misma semilla los
+    resultados no coinciden subasta a subasta con los de _acumular_barrido_multiple (sí en distribución).
+
+    Returns:
+        dict: Acumuladores del barrido (ver acumuladores_barrido).
+    """
+    rng = obtener_generador(rng)
+    puntos = len(reserve_values)
+    acumuladores = acumuladores_barrido(puntos, crn, convergencia=True)
+    for sims in _lotes(simulations):
+        if crn:
+            valoraciones = multiple_arrival_order_batch(sims, n, rng)
+            ruido = rng.normal(0, sigma_reserve, (sims, m - 1)), rng.normal(0, sigma_increment, (sims, m - 1))
+        else:
+            valoraciones, ruido = None, None
+        # Precio medio por objeto vendido en cada mercado (NaN si no se vende ninguno)
+        precio_medio = np.full((puntos, sims), np.nan)
+        for g in range(puntos):
+            reserv, incr = generar_parametros_lote(sims, m, reserve_values[g], increment_values[g],
+                                                   sigma_reserve, sigma_increment, ruido=ruido, rng=rng)
+            vals = valoraciones if crn else multiple_arrival_order_batch(sims, n, rng)
+            winner, price, buyers_count, info = ebay_proxy_bidding_multiple_batch(vals, reserv, incr,
+                                                                                  diagnostico=True)
+            acumuladores['no_convergidas'][g].actualizar(~info['convergido'])
+            vendidos = winner >= 0
+            acumuladores['results'][g].actualizar(price[vendidos])
+            acumuladores['bids'][g].actualizar(buyers_count[vendidos])
+            con_ventas = vendidos.any(axis=1)
+            precio_medio[g, con_ventas] = (np.where(vendidos, price, 0.0).sum(axis=1)[con_ventas]
+                                           / vendidos.sum(axis=1)[con_ventas])
+        if crn:
+            delta = np.diff(precio_medio, axis=0)
+            for g in range(puntos - 1):
+                acumuladores['diferencias'][g].actualizar(delta[g][np.isfinite(delta[g])])
+    return acumuladores
+
+
+def _acumular_barrido_multiple(n: int, m: int, reserve_values, increment_values, simulations: int,
+                               sigma_reserve: float, sigma_increment: float, crn: bool = False,
+                               rng=None) -> dict:
+    """
+    Núcleo común de sim_reserv_multiple, sim_increment_multiple y sim_bids_fixed_d_multiple. Simula
+    `simulations` subastas en cada punto (reserve_values[g], increment_values[g]) de la malla y acumula
+    los precios y buyers_count de los objetos vendidos sin guardar los resultados individuales.
+
+    Con crn=True, en cada simulación se extraen una única población de compradores y un único ruido de
+    parámetros, que se reutilizan en todos los puntos de la malla, y se acumulan además las diferencias
+    pareadas del precio medio por objeto vendido entre puntos consecutivos (las subastas en las que no
+    se vende ningún objeto en alguno de los dos puntos se descartan).
+
+    Todas las extracciones (compradores, ruido de parámetros) proceden de `rng` (ver obtener_generador).
+
+    Returns:
+        dict: Acumuladores del barrido (ver acumuladores_barrido).
+    """
+    rng = obtener_generador(rng)
+    puntos = len(reserve_values)
+    acumuladores = acumuladores_barrido(puntos, crn, convergencia=True)
+    for sim in range(simulations):
+        if crn:
+            poblacion = multiple_arrival_population(n, rng)
+            ruido = ruido_parametros(m, sigma_reserve, sigma_increment, rng)
+        else:
+            poblacion, ruido = None, None
+        # Precio medio por objeto vendido en esta subasta (NaN si no se vende ninguno)
+        precio_medio = np.full(puntos, np.nan)
+        for g in range(puntos):
+            # Generamos parámetros heterogéneos para los m objetos
+            reserv_list, incr_list = generar_parametros(m, reserv_base=reserve_values[g],
+                                                        increment_base=increment_values[g],
+                                                        sigma_reserve=sigma_reserve,
+                                                        sigma_increment=sigma_increment, ruido=ruido, rng=rng)
+            # Ejecutamos la subasta múltiple sobre arrays (sin construir Objeto ni Buyer)
+            estado, info = ebay_proxy_bidding_multiple_estado(n, m, reserv_list, incr_list, biders=poblacion,
+                                                              rng=rng, diagnostico=True)
+            acumuladores['no_convergidas'][g].actualizar(0.0 if info['convergido'] else 1.0)
+            # Recogemos resultados por objeto vendido
+            vendidos = estado.vendidos()
+            if vendidos.any():
+                precios = estado.current_price[vendidos]
+                acumuladores['results'][g].actualizar(precios)
+                acumuladores['bids'][g].actualizar(estado.buyers_count[vendidos])
+                precio_medio[g] = np.mean(precios)
+        if crn:
+            delta = np.diff(precio_medio)
+            for g in np.flatnonzero(np.isfinite(delta)):
+                acumuladores['diferencias'][g].actualizar(delta[g])
+    return acumuladores
+
+def _nucleo_barrido(por_lotes: bool):
+    """Núcleo de barrido a utilizar: por lotes (lockstep) o subasta a subasta."""
+    return _acumular_barrido_multiple_lote if por_lotes else _acumular_barrido_multiple
+
 def sim_reserv_multiple(n: int,m: int,reserve_price_list: list,min_increment: float,
-    simulations: int,sigma_reserve: float = 0.05,sigma_increment: float = 0.002):
+    simulations: int,sigma_reserve: float = 0.05,sigma_increment: float = 0.002, crn: bool = False,
+    errores: bool = False, workers=None, rng=None, cache: bool = False, por_lotes: bool = False):
     """
     Simula el precio final medio POR OBJETO en una subasta eBay Proxy Bidding
     con m < n objetos idénticos para distintos precios de reserva.
@@ -58,7 +243,7 @@ def sim_reserv_multiple(n: int,m: int,reserve_price_list: list,min_increment: fl
               reserve_j = s + N(0, sigma_reserve)
               increment_j = min_increment + N(0, sigma_increment)
         - Se registran los precios finales de todos los objetos vendidos.
-        - Se promedia sobre objetos y simulaciones.
+        - Se promedia sobre objetos y simulaciones (en flujo, con memoria constante).
 
     Args:
         n (int): Número total de postores.
@@ -67,37 +252,34 @@ def sim_reserv_multiple(n: int,m: int,reserve_price_list: list,min_increment: fl
         increment_base (float): Incremento mínimo base común.
         sigma_reserve (float): Desviación típica del ruido en los precios de reserva.
         sigma_increment (float): Desviación típica del ruido en los incrementos mínimos.
+        crn (bool): Números aleatorios comunes. Si es True, cada simulación reutiliza los mismos
+            compradores y el mismo ruido de parámetros en todos los valores de s.
+        errores (bool): Si es True, se devuelven además los errores estándar de cada punto.
+        workers (int | Executor | None): Procesos entre los que repartir las simulaciones (ver
+            ejecutar_en_paralelo). None o 1 ejecuta en serie.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+        cache (bool): Si es True, los acumuladores se leen o completan desde la caché en disco
+            (ver acumular_con_cache). Requiere rng entero.
+        por_lotes (bool): Si es True, los mercados se resuelven por bloques con el motor lockstep
+            ebay_proxy_bidding_multiple_batch (mismo mecanismo, otra secuencia de extracciones).
 
     Returns:
         results (list): precio final medio por objeto para cada s.
         bids    (list): número medio de pujadores por objeto para cada s.
+        info (dict): solo si errores=True o crn=True. Errores estándar ('results_se', 'bids_se'),
+            acumuladores y, con crn=True, diferencias del precio medio por objeto entre valores
+            consecutivos de s y sus errores estándar ('diferencias', 'se').
 
     """
-
-    results = []
-    bids = []
-    for s in reserve_price_list:
-        all_prices = []
-        all_buyers_counts = []
-        for _ in range(simulations):
-            # Generamos parámetros heterogéneos para los m objetos
-            reserv_list, incr_list = generar_parametros(m,reserv_base=s,increment_base=min_increment,
-                sigma_reserve=sigma_reserve,sigma_increment=sigma_increment)
-            # Ejecutamos la subasta múltiple
-            objetos = ebay_proxy_bidding_multiple(n, m, reserv_list, incr_list)
-            # Recogemos resultados por objeto
-            for obj in objetos:
-                if obj.highest_bidder is not None:
-                    all_prices.append(obj.current_price)
-                    all_buyers_counts.append(obj.buyers_count)
-        avg_price = np.mean(all_prices) if all_prices else 0.0
-        avg_buyers = np.mean(all_buyers_counts) if all_buyers_counts else 0.0
-        results.append(avg_price)
-        bids.append(avg_buyers)
-    return results, bids
+    acumuladores = acumular(_nucleo_barrido(por_lotes), simulations, workers, n=n, m=m,
+                            reserve_values=list(reserve_price_list),
+                            increment_values=[min_increment] * len(reserve_price_list),
+                            sigma_reserve=sigma_reserve, sigma_increment=sigma_increment, crn=crn, rng=rng, cache=cache)
+    return resultados_barrido(acumuladores, errores)
 
 def sim_increment_multiple(n: int,m: int,reserve_price: float,min_increment_list: list,
-    simulations: int,sigma_reserve: float = 0.05,sigma_increment: float = 0.002):
+    simulations: int,sigma_reserve: float = 0.05,sigma_increment: float = 0.002, crn: bool = False,
+    errores: bool = False, workers=None, rng=None, cache: bool = False, por_lotes: bool = False):
     """
     Simula el precio final medio POR OBJETO en una subasta eBay Proxy Bidding
     con m < n objetos idénticos para distintos incrementos mínimos de puja.
@@ -108,7 +290,7 @@ def sim_increment_multiple(n: int,m: int,reserve_price: float,min_increment_list
               reserve_j = s + N(0, sigma_reserve)
               increment_j = min_increment + N(0, sigma_increment)
         - Se registran los precios finales de todos los objetos vendidos.
-        - Se promedia sobre objetos y simulaciones.
+        - Se promedia sobre objetos y simulaciones (en flujo, con memoria constante).
 
     Args:
         n (int): Número total de postores.
@@ -117,56 +299,59 @@ def sim_increment_multiple(n: int,m: int,reserve_price: float,min_increment_list
         increment_base (float): Incremento mínimo base común.
         sigma_reserve (float): Desviación típica del ruido en los precios de reserva.
         sigma_increment (float): Desviación típica del ruido en los incrementos mínimos.
+        crn (bool): Números aleatorios comunes. Si es True, cada simulación reutiliza los mismos
+            compradores y el mismo ruido de parámetros en todos los valores de d.
+        errores (bool): Si es True, se devuelven además los errores estándar de cada punto.
+        workers (int | Executor | None): Procesos entre los que repartir las simulaciones (ver
+            ejecutar_en_paralelo). None o 1 ejecuta en serie.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+        cache (bool): Si es True, los acumuladores se leen o completan desde la caché en disco
+            (ver acumular_con_cache). Requiere rng entero.
+        por_lotes (bool): Si es True, los mercados se resuelven por bloques con el motor lockstep
+            ebay_proxy_bidding_multiple_batch (mismo mecanismo, otra secuencia de extracciones).
 
     Returns:
         results (list): precio final medio por objeto para cada s.
         bids    (list): número medio de pujadores por objeto para cada s.
+        info (dict): solo si errores=True o crn=True. Errores estándar ('results_se', 'bids_se'),
+            acumuladores y, con crn=True, diferencias del precio medio por objeto entre valores
+            consecutivos de d y sus errores estándar ('diferencias', 'se').
     """
-
-    results = []
-    bids = []
-    for d in min_increment_list:
-        all_prices = []
-        all_buyers_counts = []
-        for _ in range(simulations):
-            # Generamos parámetros heterogéneos para los m objetos
-            reserv_list, incr_list = generar_parametros(m,reserv_base=reserve_price,increment_base=d,
-                sigma_reserve=sigma_reserve,sigma_increment=sigma_increment)
-            # Ejecutamos subasta múltiple
-            objetos = ebay_proxy_bidding_multiple(n, m, reserv_list, incr_list)
-            # Recogemos resultados por objeto
-            for obj in objetos:
-                if obj.highest_bidder is not None:
-                    all_prices.append(obj.current_price)
-                    all_buyers_counts.append(obj.buyers_count)
-        avg_price = np.mean(all_prices) if all_prices else 0.0
-        avg_buyers = np.mean(all_buyers_counts) if all_buyers_counts else 0.0
-        results.append(avg_price)
-        bids.append(avg_buyers)
-    return results, bids
-
-def comparacion_simulaciones_multiple(n: int, m:int , max_min_increment: int, sims: int):
+    acumuladores = acumular(_nucleo_barrido(por_lotes), simulations, workers, n=n, m=m,
+                            reserve_values=[reserve_price] * len(min_increment_list),
+                            increment_values=list(min_increment_list),
+                            sigma_reserve=sigma_reserve, sigma_increment=sigma_increment, crn=crn, rng=rng, cache=cache)
+    return resultados_barrido(acumuladores, errores)
+
+def comparacion_simulaciones_multiple(n: int, m:int , max_min_increment: int, sims: int, errores: bool = False,
+                                      workers=None, rng=None, cache: bool = False, por_lotes: bool = False):
     """
     Función análoga a comparacion_simulaciones del caso uniobjeto,
     pero para el caso de m objetos en subasta simultánea.
 
     - s = 0 fijo (igual que en el caso uniobjeto)
     - Se varía d en [0, max_min_increment]
-    - Para cada d se ejecutan 'sims' simulaciones multiobjeto
+    - Para cada d se ejecutan 'sims' simulaciones multiobjeto (repartidas entre `workers` procesos)
     Returns:
         Min_increment: lista de d
         results_increment: revenue medio POR OBJETO
         bids: número medio de pujadores POR OBJETO
+        info: solo si errores=True, errores estándar de sim_increment_multiple
+    Con cache=True los resultados se reutilizan desde disco (ver acumular_con_cache) y con por_lotes=True
+    los mercados se resuelven en bloque con ebay_proxy_bidding_multiple_batch.
 
     """
 
     Min_increment = np.linspace(0, max_min_increment, 20)
-    results_increment, bids = sim_increment_multiple(n=n,m=m,reserve_price=0,
-        min_increment_list=Min_increment,simulations=sims)
-    return Min_increment, results_increment, bids
+    salida = sim_increment_multiple(n=n,m=m,reserve_price=0,
+        min_increment_list=Min_increment,simulations=sims,errores=errores,workers=workers,rng=rng,cache=cache,
+        por_lotes=por_lotes)
+    return (Min_increment,) + tuple(salida)
 
 
-def sim_bids_fixed_d_multiple(n:int, m: int, reserve_price: float, d:float, simulations,sigma_reserve=0.05, sigma_increment=0.002):
+def sim_bids_fixed_d_multiple(n:int, m: int, reserve_price: float, d:float, simulations,sigma_reserve=0.05, sigma_increment=0.002,
+                              errores: bool = False, workers=None, rng=None, cache: bool = False,
+                              por_lotes: bool = False):
     """
     Estima el número medio de pujadores POR OBJETO en una subasta múltiple
     eBay Proxy Bidding, fijando:
@@ -190,26 +375,28 @@ def sim_bids_fixed_d_multiple(n:int, m: int, reserve_price: float, d:float, simu
         simulations (int): Número de simulaciones independientes.
         sigma_reserve (float): Desviación típica del ruido en los precios de reserva.
         sigma_increment (float): Desviación típica del ruido en los incrementos mínimos.
+        errores (bool): Si es True, se devuelve también el error estándar de la media.
+        workers (int | Executor | None): Procesos entre los que repartir las simulaciones.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+        cache (bool): Si es True, los acumuladores se leen o completan desde la caché en disco
+            (ver acumular_con_cache). Requiere rng entero.
+        por_lotes (bool): Si es True, los mercados se resuelven por bloques con el motor lockstep
+            ebay_proxy_bidding_multiple_batch (mismo mecanismo, otra secuencia de extracciones).
     Returns:
-        float: número medio de pujadores por objeto.
+        float: número medio de pujadores por objeto (o la tupla (media, error estándar) si errores=True).
 
     """
 
-    all_buyers_counts = []
-    for _ in range(simulations):
-        # Generar parámetros heterogéneos
-        reserv_list, incr_list = generar_parametros(m,reserv_base=reserve_price,increment_base=d,
-                                                    sigma_reserve=sigma_reserve,sigma_increment=sigma_increment)
-        # Ejecutar subasta múltiple
-        objetos = ebay_proxy_bidding_multiple(n, m, reserv_list, incr_list)
-        # Recoger número de pujadores por objeto
-        for obj in objetos:
-            if obj.highest_bidder is not None:  # solo objetos vendidos
-                all_buyers_counts.append(obj.buyers_count)
+    acumulador = acumular(_nucleo_barrido(por_lotes), simulations, workers, n=n, m=m,
+                          reserve_values=[reserve_price], increment_values=[d],
+                          sigma_reserve=sigma_reserve, sigma_increment=sigma_increment, rng=rng, cache=cache)['bids'][0]
     # Media sobre objetos y simulaciones
-    return np.mean(all_buyers_counts) if all_buyers_counts else 0.0
+    media = acumulador.media if acumulador.n else 0.0
+    if errores:
+        return media, acumulador.error_estandar
+    return media
 
-def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int):
+def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int, rng=None):
     """
     Estima la probabilidad de victoria (ganar >= 1 objeto) según la posición
     de llegada en una subasta eBay Proxy Bidding con m objetos.
@@ -224,6 +411,7 @@ def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int):
         m (int): Número de objetos en subasta.
         d_values (list): Lista de valores del incremento mínimo de puja a evaluar.
         sims (int): Número de simulaciones independientes por cada valor de `d`.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         dict:
@@ -233,6 +421,7 @@ def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int):
 
     """
 
+    rng = obtener_generador(rng)
     resultados = {d: np.zeros(n) for d in d_values}
     for d in d_values:
         print(f"\nSimulando d = {d}")
@@ -240,11 +429,11 @@ def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int):
         for k in range(n):
             wins = 0
             for sim in range(sims):
-                order = multiple_arrival_order(n)
+                order = multiple_arrival_population(n, rng)
                 # Generamos parámetrosheterogéneos para los m objetos (s=0)
-                reserve_prices, min_increments = generar_parametros(m,reserv_base = 0,increment_base = d,sigma_reserve=0.05,sigma_increment=0.002)
-                # Subasta múltiple
-                objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments)
+                reserve_prices, min_increments = generar_parametros(m,reserv_base = 0,increment_base = d,sigma_reserve=0.05,sigma_increment=0.002,rng=rng)
+                # Subasta múltiple sobre el orden de llegada generado
+                objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order)
                 # Lista de ganadores (IDs)
                 winners_ids = [obj.highest_bidder.ID for obj in objetos
                                if obj.highest_bidder is not None]
@@ -256,7 +445,15 @@ def prob_win_order_multiple(n: int, m: int, d_values: list, sims: int):
             resultados[d][k] = wins / sims
     return resultados
 
-def prob_kth_max_val_wins_by_position_multiple(n:int, m:int, d_values:list, sims:int, k:int):
+def _precios_ganados(estado: EstadoMercado, ID) -> np.ndarray:
+    """Precios finales de los objetos de `estado` que gana el comprador con identificador ID."""
+    vendidos = estado.vendidos()
+    ganados = np.zeros(estado.m, dtype=bool)
+    ganados[vendidos] = estado.ids[estado.highest_bidder[vendidos]] == ID
+    return estado.current_price[ganados]
+
+
+def prob_kth_max_val_wins_by_position_multiple(n:int, m:int, d_values:list, sims:int, k:int, rng=None):
     """
     Estima la probabilidad de que el licitador con la k‑ésima mayor valoración
     gane al menos un objeto en una subasta múltiple eBay Proxy Bidding,
@@ -277,12 +474,14 @@ def prob_kth_max_val_wins_by_position_multiple(n:int, m:int, d_values:list, sims
                 * last   — el comprador objetivo se coloca en la última posición.
 
             Para cada caso:
-                - Se reordena la lista de compradores según la regla.
-                - Se resetea el estado interno de cada comprador (active_object = None).
-                - Se generan parámetros heterogéneos para los m objetos:
+                - Se generan parámetros heterogéneos para los m objetos (comunes a los tres casos):
                         reserve_j   = 0 + N(0, sigma_reserve)
                         increment_j = d + N(0, sigma_increment)
-                - Se ejecuta la subasta múltiple mediante ebay_proxy_bidding_multiple().
+                - Se bifurca el mercado inicial (EstadoMercado.intercambiar) con el orden de llegada de
+                  la regla: cada caso parte del mismo estado copiando arrays, sin reconstruir objetos
+                  ni arrastrar estado de los otros casos.
+                - Se resuelve la subasta múltiple con resolver_mercado (misma dinámica que
+                  ebay_proxy_bidding_multiple()).
                 - Se comprueba si el comprador objetivo aparece como ganador en alguno de los objetos.
 
     Finalmente, para cada valor de `d`, la función devuelve la probabilidad
@@ -295,6 +494,7 @@ def prob_kth_max_val_wins_by_position_multiple(n:int, m:int, d_values:list, sims
         d_values (list[float]): Valores del incremento mínimo de puja a evaluar.
         sims (int): Número de simulaciones por cada valor de d.
         k (int): Orden estadístico de la valoración (1 = mayor valoración).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
         Returns:
             dict:
@@ -305,6 +505,7 @@ def prob_kth_max_val_wins_by_position_multiple(n:int, m:int, d_values:list, sims
 
     if k < 1 or k > n:
         raise ValueError("k debe estar entre 1 y n")
+    rng = obtener_generador(rng)
 
     # Auxiliar: índice del k-ésimo mayor
     def get_kth_index(vals, k):
@@ -316,45 +517,32 @@ def prob_kth_max_val_wins_by_position_multiple(n:int, m:int, d_values:list, sims
         wins = {"first": 0, "random": 0, "last": 0}
         for _ in range(sims):
             # Orden de llegada multiobjeto
-            order = multiple_arrival_order(n)
-            vals = np.array([buyer.valoracion for buyer in order])
+            order = multiple_arrival_population(n, rng)
+            vals = order.valoraciones_llegada
             # Identificar al licitador objetivo
             idx_target = get_kth_index(vals, k)
             bidder_target = order[idx_target]
+            reserve_prices, min_increments = generar_parametros(m, reserv_base = 0,increment_base = d,sigma_reserve=0.05,sigma_increment=0.002,rng=rng)
+            # Mercado inicial compartido por los tres casos
+            mercado = EstadoMercado.desde_poblacion(order, reserve_prices[:m], min_increments[:m])
 
             # CASO 1: Llega primero
-            order_first = np.array(order, dtype=object)
-            order_first[[0, idx_target]] = order_first[[idx_target, 0]]
-            for b in order_first:
-                b.active_object = None
-            reserve_prices, min_increments = generar_parametros(m, reserv_base = 0,increment_base = d,sigma_reserve=0.05,sigma_increment=0.002)
-            objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order_first)
-            winners_ids = [obj.highest_bidder.ID for obj in objetos
-                if obj.highest_bidder is not None]
-            if bidder_target.ID in winners_ids:
+            estado = mercado.intercambiar(0, idx_target)
+            resolver_mercado(estado)
+            if len(_precios_ganados(estado, bidder_target.ID)):
                 wins["first"] += 1
 
             # CASO 2: Llega aleatorio
-            order_random = np.array(order, dtype=object)
-            pos_random = np.random.randint(0, n)
-            order_random[[pos_random, idx_target]] = order_random[[idx_target, pos_random]]
-            for b in order_random:
-                b.active_object = None
-            objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order_random)
-            winners_ids = [obj.highest_bidder.ID for obj in objetos
-                if obj.highest_bidder is not None]
-            if bidder_target.ID in winners_ids:
+            pos_random = enteros(rng, n)
+            estado = mercado.intercambiar(pos_random, idx_target)
+            resolver_mercado(estado)
+            if len(_precios_ganados(estado, bidder_target.ID)):
                 wins["random"] += 1
 
             # CASO 3: Llega último
-            order_last = np.array(order, dtype=object)
-            order_last[[n-1, idx_target]] = order_last[[idx_target, n-1]]
-            for b in order_last:
-                b.active_object = None
-            objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order_last)
-            winners_ids = [obj.highest_bidder.ID for obj in objetos
-                if obj.highest_bidder is not None]
-            if bidder_target.ID in winners_ids:
+            estado = mercado.intercambiar(n-1, idx_target)
+            resolver_mercado(estado)
+            if len(_precios_ganados(estado, bidder_target.ID)):
                 wins["last"] += 1
         # Guardamos probabilidades
         for key in results:
@@ -396,7 +584,8 @@ def plot_probabilities_multiple(d_values, results, k, m):
     plt.show()
 
 
-def expected_profit_k_ght_max_valuation_by_position_multiple(n:int, m:int, d_values:list, sims:int, k:int):
+def expected_profit_k_ght_max_valuation_by_position_multiple(n:int, m:int, d_values:list, sims:int, k:int, rng=None,
+                                                             errores: bool = False):
     """
     Estima el beneficio esperado del licitador con la k‑ésima mayor valoración
     condicionado a su posición de llegada en una subasta múltiple eBay Proxy Bidding.
@@ -414,18 +603,19 @@ def expected_profit_k_ght_max_valuation_by_position_multiple(n:int, m:int, d_val
                 * last   — se coloca en la última posición.
 
             Para cada escenario:
-                - Se reordena la lista de compradores según la regla.
-                - Se resetea el estado interno de cada comprador (active_object = None).
-                - Se generan parámetros heterogéneos para los m objetos:
+                - Se generan parámetros heterogéneos para los m objetos (comunes a los tres escenarios):
                         reserve_j   = 0 + N(0, sigma_reserve)
                         increment_j = d + N(0, sigma_increment)
-                - Se ejecuta la subasta múltiple mediante ebay_proxy_bidding_multiple().
+                - Se bifurca el mercado inicial (EstadoMercado.intercambiar) con el orden de llegada de
+                  la regla y se resuelve con resolver_mercado (misma dinámica que
+                  ebay_proxy_bidding_multiple()), sin reconstruir objetos ni compradores.
                 - Se identifican los objetos ganados por el comprador objetivo.
                 - El beneficio se calcula como: beneficio = valoración − suma de precios pagados
                   siendo cero si no gana ningún objeto.
 
     Finalmente, para cada valor de `d`, la función devuelve el beneficio esperado
-    del comprador objetivo en cada uno de los tres escenarios de llegada.
+    del comprador objetivo en cada uno de los tres escenarios de llegada. Los beneficios se acumulan
+    en flujo (acumuladores_barrido, un Acumulador por regla y valor de d).
 
     Args:
         n (int): Número total de compradores.
@@ -433,77 +623,73 @@ def expected_profit_k_ght_max_valuation_by_position_multiple(n:int, m:int, d_val
         d_values (list[float]): Valores del incremento mínimo de puja a evaluar.
         sims (int): Número de simulaciones por cada valor de d.
         k (int): Orden estadístico de la valoración (1 = mayor valoración).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+        errores (bool): Si es True, se devuelven también los errores estándar de cada beneficio esperado.
 
         Returns:
             dict:
                 Diccionario con claves "first", "random" y "last".
                 Cada clave contiene una lista con el beneficio esperado para cada
                 valor de d en d_values.
+            dict (solo si errores=True): Errores estándar con la misma estructura.
         """
 
     if k < 1 or k > n:
         raise ValueError("k debe estar entre 1 y n")
+    rng = obtener_generador(rng)
     # Auxiliar: índice del k-ésimo mayor
     def get_kth_index(vals, k):
         idx_sorted = np.argsort(vals)
         return idx_sorted[-k]
-    results = {"first": [], "random": [], "last": []}
-    for d in d_values:
-        profits = {"first": [], "random": [], "last": []}
+    acumuladores = {regla: acumuladores_barrido(len(d_values)) for regla in ("first", "random", "last")}
+    for g, d in enumerate(d_values):
+        profits = {regla: acc['results'][g] for regla, acc in acumuladores.items()}
         for _ in range(sims):
             # Orden de llegada multiobjeto
-            order = multiple_arrival_order(n)
-            vals = np.array([buyer.valoracion for buyer in order])
+            order = multiple_arrival_population(n, rng)
+            vals = order.valoraciones_llegada
             # Identificar al licitador objetivo
             idx_target = get_kth_index(vals, k)
             bidder_target = order[idx_target]
             # Parámetros heterogéneos para los m objetos (s = 0)
             reserve_prices, min_increments = generar_parametros(m, reserv_base=0, increment_base=d,
-                                                                sigma_reserve=0.05, sigma_increment=0.002)
+                                                                sigma_reserve=0.05, sigma_increment=0.002, rng=rng)
+
+            # Mercado inicial compartido por los tres casos
+            mercado = EstadoMercado.desde_poblacion(order, reserve_prices[:m], min_increments[:m])
 
             # CASO 1: Llega primero
-            order_first = np.array(order, dtype=object)
-            order_first[[0, idx_target]] = order_first[[idx_target, 0]]
-            for b in order_first:
-                b.active_object = None
-            objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order_first)
+            estado = mercado.intercambiar(0, idx_target)
+            resolver_mercado(estado)
 
             # Objetos ganados por el target
-            precios_ganados = [obj.current_price for obj in objetos
-                if obj.highest_bidder is not None and obj.highest_bidder.ID == bidder_target.ID]
+            precios_ganados = _precios_ganados(estado, bidder_target.ID)
 
-            beneficio = bidder_target.valoracion - sum(precios_ganados) if precios_ganados else 0
-            profits["first"].append(beneficio)
+            beneficio = bidder_target.valoracion - precios_ganados.sum() if len(precios_ganados) else 0
+            profits["first"].actualizar(beneficio)
 
             # CASO 2: Llega aleatorio
-            order_random = np.array(order, dtype=object)
-            pos_random = np.random.randint(0, n)
-            for b in order_random:
-                b.active_object = None
-            order_random[[pos_random, idx_target]] = order_random[[idx_target, pos_random]]
-            objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order_random)
-            precios_ganados = [obj.current_price for obj in objetos
-                if obj.highest_bidder is not None and obj.highest_bidder.ID == bidder_target.ID]
-
-            beneficio = bidder_target.valoracion - sum(precios_ganados) if precios_ganados else 0
-            profits["random"].append(beneficio)
+            pos_random = enteros(rng, n)
+            estado = mercado.intercambiar(pos_random, idx_target)
+            resolver_mercado(estado)
+            precios_ganados = _precios_ganados(estado, bidder_target.ID)
 
-            # CASO 3: Llega último
-            order_last = np.array(order, dtype=object)
-            order_last[[n - 1, idx_target]] = order_last[[idx_target, n - 1]]
-            for b in order_last:
-                b.active_object = None
-            objetos = ebay_proxy_bidding_multiple(n, m, reserve_prices, min_increments, biders = order_last)
-            precios_ganados = [obj.current_price for obj in objetos
-                if obj.highest_bidder is not None and obj.highest_bidder.ID == bidder_target.ID]
-            beneficio = bidder_target.valoracion - sum(precios_ganados) if precios_ganados else 0
-            profits["last"].append(beneficio)
-
-        # Guardamos beneficios esperados
-        for key in results:
-            results[key].append(np.mean(profits[key]))
+            beneficio = bidder_target.valoracion - precios_ganados.sum() if len(precios_ganados) else 0
+            profits["random"].actualizar(beneficio)
 
-    return results
+            # CASO 3: Llega último
+            estado = mercado.intercambiar(n - 1, idx_target)
+            resolver_mercado(estado)
+            precios_ganados = _precios_ganados(estado, bidder_target.ID)
+            beneficio = bidder_target.valoracion - precios_ganados.sum() if len(precios_ganados) else 0
+            profits["last"].actualizar(beneficio)
+
+    # Guardamos beneficios esperados
+    results, se = {}, {}
+    for regla, acc in acumuladores.items():
+        results[regla], _, info = resultados_barrido(acc, errores=True)
+        se[regla] = info['results_se']
+    return (results, se) if errores else results
 
 
 
@@ -0,0 +1,99 @@
+from concurrent.futures import Executor, ProcessPoolExecutor
+import numpy as np
+from Class.Generador import semilla_derivada
+from Simulation.Estadisticos import fusionar_acumuladores
+from Simulation.Cache import acumular_con_cache
+
+# Fragmentos en los que se reparte un barrido cuando se pasa un Executor ya creado. Es fijo (no depende
+# del ejecutor ni del número de CPU) para que una misma semilla dé el mismo resultado en cualquier máquina.
+FRAGMENTOS_EJECUTOR = 16
+
+
+def repartir_simulaciones(simulations: int, fragmentos: int) -> list:
+    """
+    Reparte `simulations` en `fragmentos` partes lo más iguales posible (sin partes vacías).
+
+    Returns:
+        list[int]: Número de simulaciones de cada fragmento.
+    """
+    fragmentos = max(1, min(fragmentos, simulations))
+    base, resto = divmod(simulations, fragmentos)
+    return [base + (1 if i < resto else 0) for i in range(fragmentos)]
+
+
+def numero_fragmentos(workers) -> int:
+    """
+    Número de fragmentos (flujos aleatorios) en que se reparte un barrido: 1 en serie, `workers` si es
+    un entero y FRAGMENTOS_EJECUTOR si es un Executor.
+    """
+    if isinstance(workers, Executor):
+        return FRAGMENTOS_EJECUTOR
+    if workers is None or workers <= 1:
+        return 1
+    return workers
+
+
+def _ejecutar_fragmento(funcion_acumular, simulations: int, semilla, kwargs: dict) -> dict:
+    """
+    Ejecuta un fragmento del barrido en un proceso trabajador con su propio Generator, creado a
+    partir de la SeedSequence del fragmento.
+    """
+    return funcion_acumular(simulations=simulations, rng=np.random.default_rng(semilla), **kwargs)
+
+
+def ejecutar_en_paralelo(funcion_acumular, simulations: int, workers, rng=None, **kwargs) -> dict:
+    """
+    Reparte las simulaciones de un barrido entre varios procesos y fusiona sus acumuladores.
+
+    Cada fragmento recibe un flujo aleatorio independiente derivado con SeedSequence.spawn a partir
+    de `rng` (una semilla entera se usa directamente; un generador, o el global si rng es None,
+    aporta la semilla base), de modo que el resultado es reproducible para un mismo número de fragmentos.
+
+    Los procesos se crean con concurrent.futures; en plataformas que usan `spawn` (Windows, macOS) el
+    script que llama debe proteger su código con `if __name__ == "__main__":`.
+
+    Args:
+        funcion_acumular (callable): Núcleo del barrido (_acumular_*) definido a nivel de módulo.
+            Debe aceptar `simulations` y `rng` como argumentos con nombre y devolver un diccionario
+            de acumuladores.
+        simulations (int): Número total de simulaciones por punto de la malla.
+        workers (int | Executor): Número de procesos, o un ejecutor de concurrent.futures ya creado
+            (que no se cierra al terminar). Con un ejecutor, el barrido se reparte en
+            FRAGMENTOS_EJECUTOR fragmentos, sea cual sea el número de procesos o de CPU.
+        rng (np.random.Generator | int | None): Generador o semilla de la que derivar los flujos.
+        **kwargs: Resto de argumentos de funcion_acumular.
+
+    Returns:
+        dict: Acumuladores fusionados de todos los fragmentos.
+    """
+    if isinstance(workers, Executor):
+        ejecutor, propio = workers, False
+    else:
+        ejecutor, propio = None, True
+    partes = repartir_simulaciones(simulations, numero_fragmentos(workers))
+    semillas = semilla_derivada(rng).spawn(len(partes))
+    if propio:
+        ejecutor = ProcessPoolExecutor(max_workers=len(partes))
+    try:
+        futuros = [ejecutor.submit(_ejecutar_fragmento, funcion_acumular, sims, semilla, kwargs)
+                   for sims, semilla in zip(partes, semillas)]
+        parciales = [futuro.result() for futuro in futuros]
+    finally:
+        if propio:
+            ejecutor.shutdown()
+    return fusionar_acumuladores(parciales)
+
+
+def acumular(funcion_acumular, simulations: int, workers=None, rng=None, cache: bool = False, **kwargs) -> dict:
+    """
+    Ejecuta un núcleo de barrido en serie (workers None o 1) o en paralelo con ejecutar_en_paralelo.
+    Con cache=True los acumuladores se leen o completan desde la caché en disco (ver acumular_con_cache),
+    lo que exige que rng sea una semilla entera; las entradas se separan por número de fragmentos.
+    """
+    if cache:
+        return acumular_con_cache(funcion_acumular, simulations, rng,
+                                  lambda sims, semilla: acumular(funcion_acumular, sims, workers, semilla, **kwargs),
+                                  kwargs, numero_fragmentos(workers))
+    if workers is None or (not isinstance(workers, Executor) and workers <= 1):
+        return funcion_acumular(simulations=simulations, rng=rng, **kwargs)
+    return ejecutar_en_paralelo(funcion_acumular, simulations, workers, rng=rng, **kwargs)
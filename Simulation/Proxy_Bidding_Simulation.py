@@ -1,22 +1,135 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from eBay.Proxy_Bidding import ebay_proxy_bidding, arrival_order
+from eBay.Proxy_Bidding import (ebay_proxy_bidding_batch, arrival_order_batch, ebay_proxy_bidding_curva,
+                               evaluar_curva)
+from Simulation.Estadisticos import acumuladores_barrido, resultados_barrido, intervalo_binomial
+from Simulation.Paralelo import acumular
+from Class.Generador import obtener_generador, enteros
 
 
 
-def sim_reserv(n: int, reserve_price: list, min_increment: float, simulations: int):
+# Número máximo de subastas que se simulan a la vez: acota la memoria de los barridos con independencia
+# del número total de simulaciones (los estadísticos se acumulan bloque a bloque).
+TAM_LOTE = 100_000
+
+
+def _lotes(simulations: int):
+    """Divide `simulations` en bloques de como mucho TAM_LOTE subastas."""
+    for inicio in range(0, simulations, TAM_LOTE):
+        yield min(TAM_LOTE, simulations - inicio)
+
+
+def _acumular_barrido(n: int, reserve_values, increment_values, simulations: int, exacto: bool = False,
+                      crn: bool = False, rng=None) -> dict:
+    """
+    Núcleo común de sim_reserv, sim_increment y sim_bids_fixed_d. Simula `simulations` subastas en cada
+    punto (reserve_values[g], increment_values[g]) de la malla y acumula precios y número de pujadores
+    sin guardar los resultados individuales.
+
+    Args:
+        n (int): Número total de licitadores potenciales.
+        reserve_values (list): Precio de reserva de cada punto de la malla.
+        increment_values (list): Incremento mínimo de cada punto de la malla.
+        simulations (int): Número de subastas por punto.
+        exacto (bool): Resolver cada subasta con ebay_proxy_bidding_curva y evaluarla en todos los
+            incrementos (requiere un precio de reserva común a toda la malla).
+        crn (bool): Reutilizar las mismas valoraciones en todos los puntos y acumular además las
+            diferencias pareadas entre puntos consecutivos.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador). Las
+            valoraciones de cada bloque se extraen de una vez como una matriz (subastas, n).
+
+    Returns:
+        dict: Acumuladores del barrido (ver acumuladores_barrido).
+    """
+    rng = obtener_generador(rng)
+    puntos = len(increment_values)
+    acumuladores = acumuladores_barrido(puntos, crn)
+    for tam in _lotes(simulations):
+        precios = np.zeros((puntos, tam))
+        pujas = np.zeros((puntos, tam))
+        if exacto:
+            # Una única pasada por subasta: la curva exacta se evalúa en toda la malla de incrementos
+            d_max = np.max(increment_values)
+            for sim, valoraciones in enumerate(arrival_order_batch(tam, n, rng)):
+                curva = ebay_proxy_bidding_curva(valoraciones, reserve_values[0], d_max=d_max)
+                winner, precios[:, sim], pujas[:, sim] = evaluar_curva(curva, increment_values)
+        else:
+            valoraciones_comunes = arrival_order_batch(tam, n, rng) if crn else None
+            for g in range(puntos):
+                # Todas las subastas del bloque en una única llamada al motor por lotes
+                valoraciones = valoraciones_comunes if crn else arrival_order_batch(tam, n, rng)
+                winner, precios[g], pujas[g] = ebay_proxy_bidding_batch(valoraciones, reserve_values[g],
+                                                                        increment_values[g])
+        for g in range(puntos):
+            acumuladores['results'][g].actualizar(precios[g])
+            acumuladores['bids'][g].actualizar(pujas[g])
+        if crn:
+            for g in range(puntos - 1):
+                acumuladores['diferencias'][g].actualizar(precios[g + 1] - precios[g])
+    return acumuladores
+
+
+def contraste_curva(n: int, reserve_price: float, d_values, sims: int, decimales=2, rng=None) -> dict:
+    """
+    Contraste de igualdad entre la curva exacta (ebay_proxy_bidding_curva + evaluar_curva) y el motor
+    por lotes ebay_proxy_bidding_batch en cada incremento de la malla.
+
+    Con valoraciones redondeadas (p. ej. a dos decimales) y una malla de d con los mismos decimales, las
+    diferencias entre valoraciones coinciden a menudo con d, que es donde un umbral mal cerrado haría
+    que los dos motores discreparan. El resultado correcto es 0 discrepancias.
+
+    Args:
+        n (int): Número de licitadores.
+        reserve_price (float): Precio de reserva.
+        d_values (array-like): Incrementos mínimos en los que comparar.
+        sims (int): Número de subastas.
+        decimales (int | None): Decimales a los que se redondean las valoraciones (None: sin redondeo).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+
+    Returns:
+        dict:
+            - 'pares': número de pares (subasta, d) comparados.
+            - 'discrepancias': pares en los que difieren el ganador, el precio o el número de pujas.
+    """
+    d_values = np.asarray(d_values, dtype=float)
+    valoraciones = arrival_order_batch(sims, n, rng)
+    if decimales is not None:
+        valoraciones = np.round(valoraciones, decimales)
+    discrepancias = 0
+    for fila in valoraciones:
+        curva = ebay_proxy_bidding_curva(fila, reserve_price, d_max=np.max(d_values))
+        winner, price, buyers_count = evaluar_curva(curva, d_values)
+        winner_b, price_b, buyers_count_b = ebay_proxy_bidding_batch(np.tile(fila, (len(d_values), 1)),
+                                                                     reserve_price, d_values)
+        discrepancias += int(np.sum((winner != winner_b) | (price != price_b) | (buyers_count != buyers_count_b)))
+    return {'pares': sims * len(d_values), 'discrepancias': discrepancias}
+
+
+def sim_reserv(n: int, reserve_price: list, min_increment: float, simulations: int, crn: bool = False,
+               errores: bool = False, workers=None, rng=None, cache: bool = False):
     """
     Simula el precio final esperado en una subasta eBay Proxy Bidding para distintos precios de reserva.
     Para cada valor en reserve_price, ejecuta múltiples simulaciones independientes del mecanismo
-    ebay_proxy_bidding y calcula el precio final promedio observado (solo se consideran las subastas
+    ebay_proxy_bidding (por bloques con ebay_proxy_bidding_batch) y calcula el precio final promedio observado (solo se consideran las subastas
     que llegan a iniciarse, es decir, aquellas cuyo precio final no es None). Posible implementación en otro trabajos para el caso en que  d = 0 y variabilidad
-    en precio de reserva (no lo analizamos, en eBay es obligatorio d > 0).
+    en precio de reserva (no lo analizamos, en eBay es obligatorio d > 0). Los estadísticos se acumulan en
+    flujo, por lo que la memoria no depende del número de simulaciones.
 
     Args:
         n (int): Número total de licitadores potenciales.
         reserve_price (list): Lista de precios de reserva a evaluar.
         min_increment (float): Incremento mínimo de puja exigido por el mecanismo.
         simulations (int): Número de simulaciones independientes por cada precio de reserva.Calibrar según potencia del terminal.
+        crn (bool): Números aleatorios comunes. Si es True, se reutilizan las mismas valoraciones y
+            órdenes de llegada en todos los precios de reserva y se devuelven además las diferencias
+            pareadas entre puntos consecutivos de la malla.
+        errores (bool): Si es True, se devuelven además los errores estándar de cada punto.
+        workers (int | Executor | None): Procesos entre los que repartir las simulaciones (ver
+            ejecutar_en_paralelo). None o 1 ejecuta en serie.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador). En
+            paralelo, cada proceso recibe un flujo independiente derivado de él.
+        cache (bool): Si es True, los acumuladores se guardan en disco y se reutilizan en llamadas
+            posteriores con los mismos parámetros (ver acumular_con_cache). Requiere rng entero.
 
     Returns:
         tuple:
@@ -24,59 +137,61 @@ def sim_reserv(n: int, reserve_price: list, min_increment: float, simulations: i
               incremento mínimo.
             - bids (list): Número medio de licitadores que participan efectivamente en la puja para
               cada incremento mínimo.
+            - info (dict): Solo si errores=True o crn=True. Errores estándar ('results_se', 'bids_se'),
+              acumuladores y, con crn=True, diferencias de ingreso entre precios de reserva consecutivos
+              y sus errores estándar ('diferencias', 'se'). Ver resultados_barrido.
     """
-    results = []
-    bids = []
-    for r in reserve_price:
-        prices = []
-        bids_placed = []
-        for sim in range(simulations):
-            winner, price, buyers_count = ebay_proxy_bidding(n, r, min_increment)
-            if price is not None:
-                prices.append(price)
-                bids_placed.append(buyers_count)
-        results.append(np.mean(prices) if prices else 0)
-        bids.append(np.mean(bids_placed) if bids_placed else 0)
-    return results, bids
-
-
-def sim_increment(n: int, reserve_price: float, min_increment: list, simulations: int):
+    acumuladores = acumular(_acumular_barrido, simulations, workers, n=n, reserve_values=list(reserve_price),
+                            increment_values=[min_increment] * len(reserve_price), crn=crn, rng=rng, cache=cache)
+    return resultados_barrido(acumuladores, errores)
+
+
+def sim_increment(n: int, reserve_price: float, min_increment: list, simulations: int, exacto: bool = False,
+                  crn: bool = False, errores: bool = False, workers=None, rng=None, cache: bool = False):
     """
     Evalúa cómo varía el precio final y el número de pujas observadas en una subasta eBay Proxy Bidding
     al modificar el incremento mínimo de puja. Manteniendo fijo el precio de reserva y el orden
     de llegada de los licitadores, la función ejecuta múltiples simulaciones para cada valor de
     min_increment, calculando el precio final promedio y el número medio de licitadores que
-    efectivamente participan en la puja.
+    efectivamente participan en la puja. Las simulaciones de cada incremento se resuelven por bloques
+    con ebay_proxy_bidding_batch y sus estadísticos se acumulan en flujo.
 
     Args:
         n (int): Número total de licitadores potenciales.
         reserve_price (float): Precio de reserva de la subasta.
         min_increment (list): Lista de incrementos mínimos de puja a evaluar.
         simulations (int): Número de simulaciones independientes por cada incremento mínimo.Calibrar según potencia del terminal.
+        exacto (bool): Si es True, cada subasta simulada se resuelve una única vez con
+            ebay_proxy_bidding_curva y se evalúa en todos los incrementos de la malla, de modo que el
+            coste no crece con el número de puntos (las mismas subastas se comparten entre todos los d).
+        crn (bool): Números aleatorios comunes. Si es True, se reutilizan las mismas valoraciones y
+            órdenes de llegada en todos los incrementos (el modo exacto ya lo hace) y se devuelven
+            además las diferencias pareadas entre puntos consecutivos de la malla.
+        errores (bool): Si es True, se devuelven además los errores estándar de cada punto.
+        workers (int | Executor | None): Procesos entre los que repartir las simulaciones (ver
+            ejecutar_en_paralelo). None o 1 ejecuta en serie.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador). En
+            paralelo, cada proceso recibe un flujo independiente derivado de él.
+        cache (bool): Si es True, los acumuladores se guardan en disco y se reutilizan en llamadas
+            posteriores con los mismos parámetros (ver acumular_con_cache). Requiere rng entero.
         Returns:
             tuple:
                 - results (list): Precio final promedio de la subasta para cada
                   incremento mínimo.
                 - bids (list): Número medio de licitadores que participan
                   efectivamente en la puja para cada incremento mínimo.
+                - info (dict): Solo si errores=True o crn=True. Errores estándar, acumuladores y, con
+                  crn=True, diferencias de ingreso entre incrementos consecutivos y sus errores
+                  estándar. Ver resultados_barrido.
 
     """
-    results = []
-    bids = []
-    for inc in min_increment:
-        prices = []
-        bids_placed = []
-        for sim in range(simulations):
-            winner, price, buyers_count = ebay_proxy_bidding(n, reserve_price, inc)
-            if price is not None:
-                prices.append(price)
-                bids_placed.append(buyers_count)
-        results.append(np.mean(prices) if prices else 0)
-        bids.append(np.mean(bids_placed) if bids_placed else 0)
-    return results, bids
-
-
-def ejecutar_simulaciones_d(n: int, max_min_increment: float):
+    acumuladores = acumular(_acumular_barrido, simulations, workers, n=n,
+                            reserve_values=[reserve_price] * len(min_increment),
+                            increment_values=list(min_increment), exacto=exacto, crn=crn, rng=rng, cache=cache)
+    return resultados_barrido(acumuladores, errores)
+
+
+def ejecutar_simulaciones_d(n: int, max_min_increment: float, num: int = 20, exacto: bool = False):
     """
     Ejecuta simulaciones del mecanismo eBay Proxy Bidding y genera gráficos
     que muestran cómo varía el precio medio de venta según el incremento
@@ -90,6 +205,9 @@ def ejecutar_simulaciones_d(n: int, max_min_increment: float):
         n (int): Número total de licitadores potenciales.
         max_min_increment (float): Valor máximo del rango de incrementos
             mínimos de puja a simular.
+        num (int): Número de puntos de la malla de incrementos (20 en las figuras originales).
+        exacto (bool): Si es True, se usa el evaluador exacto de sim_increment, cuyo coste no depende
+            de num; permite dibujar curvas suaves con mallas densas.
 
     Returns:
         None: La función no retorna valores; muestra en pantalla un gráfico
@@ -97,17 +215,20 @@ def ejecutar_simulaciones_d(n: int, max_min_increment: float):
             mínimo.
     """
     # Rango equiespaciado de incrementos mínimos. num = 20 según las figuras del trabajo de Roges et al.
-    Min_increment = np.linspace(0, max_min_increment, 20)
+    Min_increment = np.linspace(0, max_min_increment, num)
+    # Con mallas densas se dibuja la curva sin marcadores
+    marker = 'o' if num <= 20 else None
     # Los autores consideran la condición s +2d < 1. Para s = 0:
     if np.any(Min_increment > 0.5):
         print("Violación de la condición s + 2d < 1")
     if n == 2:
-        results_increment = sim_increment(n, min_increment = Min_increment, reserve_price= 0, simulations = 10000)
+        results_increment = sim_increment(n, min_increment = Min_increment, reserve_price= 0, simulations = 10000,
+                                          exacto=exacto)
         # Gráficos. Evolución del precio medio de venta dependiente del incremento mínimo de puja.
         plt.rcParams['font.family'] = 'Times New Roman'
         plt.rcParams['font.size'] = 14
         fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot( Min_increment,results_increment[0],marker='o',color='darkorange',linewidth=2,markersize=6)
+        ax.plot( Min_increment,results_increment[0],marker=marker,color='darkorange',linewidth=2,markersize=6)
         # Título y ejes
         #ax.set_title("Ingreso Esperado de la Subasta vs Incremento Mínimo", fontsize=18)
         ax.set_xlabel("Incremento Mínimo de Puja d", fontsize=16)
@@ -126,12 +247,13 @@ def ejecutar_simulaciones_d(n: int, max_min_increment: float):
         plt.tight_layout()
         plt.show()
     else:
-        results_increment = sim_increment(n, min_increment=Min_increment, reserve_price=0, simulations = 1000)
+        results_increment = sim_increment(n, min_increment=Min_increment, reserve_price=0, simulations = 1000,
+                                          exacto=exacto)
         # Gráficos. Evolución del precio medio de venta dependiente del incremento mínimo de puja.
         plt.rcParams['font.family'] = 'Times New Roman'
         plt.rcParams['font.size'] = 14
         fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(Min_increment,results_increment[0],marker='o',color='darkorange',linewidth=2,markersize=6)
+        ax.plot(Min_increment,results_increment[0],marker=marker,color='darkorange',linewidth=2,markersize=6)
         # Títulos y ejes
         #ax.set_title("Ingreso Esperado de la Subasta vs Incremento Mínimo", fontsize=18)
         ax.set_xlabel("Incremento Mínimo de Puja d", fontsize=16)
@@ -225,24 +347,30 @@ def ejecutar_simulaciones_s(n: int, max_reserv_price: float):
         plt.tight_layout()
         plt.show()
 
-def comparacion_simulaciones(n, max_min_increment, sims):
+def comparacion_simulaciones(n, max_min_increment, sims, num: int = 20, exacto: bool = False,
+                             errores: bool = False, workers=None, rng=None, cache: bool = False):
     """
     Función idéntica a ejecutar simulaciones_d pero sin plotear los gráficos directamente.
-    Lo usaremos para el caso N > 2.
+    Lo usaremos para el caso N > 2. Con exacto=True el coste no depende del número de puntos `num`.
+    Con errores=True se devuelve como cuarto elemento el diccionario de errores estándar de sim_increment;
+    workers reparte las simulaciones entre procesos, rng fija el generador o la semilla y cache=True
+    reutiliza los resultados guardados en disco (requiere rng entero).
 
     """
-    Min_increment = np.linspace(0, max_min_increment, 20)
-    results_increment, bids = sim_increment(n, min_increment=Min_increment, reserve_price=0, simulations  = sims)
-    return Min_increment, results_increment, bids
+    Min_increment = np.linspace(0, max_min_increment, num)
+    salida = sim_increment(n, min_increment=Min_increment, reserve_price=0, simulations=sims, exacto=exacto,
+                           errores=errores, workers=workers, rng=rng, cache=cache)
+    return (Min_increment,) + tuple(salida)
 
 
-def sim_bids_fixed_d(n, reserve_price, d, simulations):
+def sim_bids_fixed_d(n, reserve_price, d, simulations, errores: bool = False, workers=None, rng=None,
+                     cache: bool = False):
     """
     Estima el número medio de pujadores efectivos en una subasta eBay Proxy Bidding
     con un único objeto, manteniendo fijo el incremento mínimo de puja `d`.
 
-    Para cada simulación:
-     - Se genera un orden de llegada explícito mediante arrival_order(n).
+    Para cada simulación (todas resueltas a la vez con ebay_proxy_bidding_batch):
+     - Se genera un orden de llegada explícito mediante arrival_order_batch.
      - Se ejecuta la subasta proxy con:
                   * precio de reserva = reserve_price
                   * incremento mínimo = d
@@ -259,65 +387,167 @@ def sim_bids_fixed_d(n, reserve_price, d, simulations):
         reserve_price (float): Precio de reserva del objeto.
         d (float): Incremento mínimo de puja.
         simulations (int): Número de simulaciones independientes.
+        errores (bool): Si es True, se devuelve también el error estándar de la media.
+        workers (int | Executor | None): Procesos entre los que repartir las simulaciones (ver
+            ejecutar_en_paralelo). None o 1 ejecuta en serie.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador). En
+            paralelo, cada proceso recibe un flujo independiente derivado de él.
+        cache (bool): Si es True, los acumuladores se guardan en disco y se reutilizan en llamadas
+            posteriores con los mismos parámetros (ver acumular_con_cache). Requiere rng entero.
 
     Returns:
-        float: Número medio de pujadores efectivos.
+        float: Número medio de pujadores efectivos (o la tupla (media, error estándar) si errores=True).
+    """
+
+    # Órdenes de llegada explícitos generados por bloques; solo se conserva el acumulador
+    acumulador = acumular(_acumular_barrido, simulations, workers, n=n, reserve_values=[reserve_price],
+                          increment_values=[d], rng=rng, cache=cache)['bids'][0]
+    media = acumulador.media if acumulador.n else 0.0
+    if errores:
+        return media, acumulador.error_estandar
+    return media
+
+
+def histograma_victorias_por_posicion(n: int, d: float, sims: int, reserve_price: float = 0, alpha: float = 0.05,
+                                      rng=None):
     """
+    Construye el histograma completo de victorias por posición de llegada a partir de un único
+    conjunto de `sims` subastas resueltas con ebay_proxy_bidding_batch.
+
+    Cada subasta indica directamente en qué posición llegó su ganador, de modo que no es necesario
+    repetir las simulaciones para cada posición k: la frecuencia de victorias de todas las
+    posiciones se obtiene con un único recuento. Las probabilidades llevan intervalos de confianza
+    binomiales de Wilson.
+
+    Args:
+        n (int): Número total de licitadores potenciales.
+        d (float): Incremento mínimo de puja.
+        sims (int): Número de subastas simuladas.
+        reserve_price (float): Precio de reserva (0 en las figuras del trabajo de referencia).
+        alpha (float): Nivel de significancia de los intervalos.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
-    buyers_counts = []
-    for _ in range(simulations):
-        biders = arrival_order(n)  # orden de llegada explícito
-        winner, price, buyers_count = ebay_proxy_bidding(n=n, reserve_price=reserve_price,min_increment=d,biders=biders)
-        buyers_counts.append(buyers_count)
-    return np.mean(buyers_counts)
+    Returns:
+        dict:
+            - 'victorias': array (n,) con el número de victorias por posición de llegada.
+            - 'prob': array (n,) con la probabilidad estimada de victoria por posición.
+            - 'ic_inf', 'ic_sup': extremos de los intervalos de confianza al 1 - alpha.
+    """
+    valoraciones = arrival_order_batch(sims, n, rng)
+    winner, price, buyers_count = ebay_proxy_bidding_batch(valoraciones, reserve_price, d)
+    victorias = np.bincount(winner[winner >= 0], minlength=n)
+    ic_inf, ic_sup = intervalo_binomial(victorias, sims, alpha)
+    return {'victorias': victorias, 'prob': victorias / sims if sims else np.zeros(n),
+            'ic_inf': ic_inf, 'ic_sup': ic_sup}
 
 
-def prob_win_order(n: int, d_values: list, sims: int):
+def prob_win_order(n: int, d_values: list, sims: int, intervalos: bool = False, alpha: float = 0.05, rng=None):
     """
     Estima la probabilidad de victoria de un licitador según su posición de llegada
     en el orden aleatorio de la subasta eBay Proxy Bidding.
 
-    Para cada valor de incremento mínimo `d` en `d_values y s = 0, la función ejecuta
-    múltiples simulaciones independientes. En cada simulación se genera un orden
-    aleatorio de llegada, se ejecuta la subasta y se registra si el licitador que
-    ocupa la posición k en dicho orden resulta ganador. El resultado final es un
-    diccionario que asigna a cada `d` un vector de probabilidades de victoria por
-    posición de llegada.
+    Para cada valor de incremento mínimo `d` en `d_values y s = 0, la función simula `sims`
+    subastas con el motor por lotes y, mediante histograma_victorias_por_posicion, registra la
+    posición de llegada del ganador de cada una. Un único conjunto de subastas proporciona así la
+    probabilidad de victoria de todas las posiciones (antes se repetían `sims` subastas por posición).
 
     Args:
         n (int): Número total de licitadores potenciales.
         d_values (list): Lista de valores del incremento mínimo de puja a evaluar.
         sims (int): Número de simulaciones independientes por cada valor de `d`.
+        intervalos (bool): Si es True, devuelve también los intervalos de confianza binomiales.
+        alpha (float): Nivel de significancia de los intervalos.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         dict:
             Diccionario donde cada clave es un valor de `d` y cada valor asociado
             es un array de longitud `n` que contiene la probabilidad estimada de
             victoria para cada posición de llegada (0 = primer licitador en llegar).
+        dict (solo si intervalos=True):
+            Diccionario con la misma clave `d` y la tupla (ic_inf, ic_sup) de cada posición.
     """
 
-    resultados = {d: np.zeros(n) for d in d_values}
-
+    rng = obtener_generador(rng)
+    resultados = {}
+    ic = {}
     for d in d_values:
-        #print(f"\nSimulando d = {d}")
-        for k in range(n):
-            wins = 0
-            for sim in range(sims):
-                #  Orden de llegada
-                order = arrival_order(n)
-                # Ejecutamos la subasta
-                winner, price, buyers_count = ebay_proxy_bidding(n, 0, d, biders=order)
-                # Postor que llegó en posición k
-                postor_k = order[k]
-                # ¿Ganó?
-                if winner is not None and winner.ID == postor_k.ID:
-                    wins += 1
-            resultados[d][k] = wins / sims
+        histograma = histograma_victorias_por_posicion(n, d, sims, alpha=alpha, rng=rng)
+        resultados[d] = histograma['prob']
+        ic[d] = (histograma['ic_inf'], histograma['ic_sup'])
+    if intervalos:
+        return resultados, ic
     return resultados
 
 
 
-def prob_kth_max_val_wins_by_position(n, d_values, sims, k):
+# Reglas de posición de llegada del licitador objetivo: (sims, n, rng) -> posición destino en cada subasta
+REGLAS_POSICION = {
+    "first": lambda sims, n, rng: np.zeros(sims, dtype=int),
+    "random": lambda sims, n, rng: enteros(rng, n, sims),
+    "last": lambda sims, n, rng: np.full(sims, n - 1),
+}
+
+
+def escenarios_kth_max_val_by_position(n: int, d_values: list, sims: int, ks=(1,), reglas=None, rng=None):
+    """
+    Evalúa a la vez, para varios k, la probabilidad de victoria y el beneficio esperado del licitador
+    con la k-ésima mayor valoración según la regla que fija su posición de llegada.
+
+    Para cada `d` se extrae una única matriz de valoraciones (sims, n) con arrival_order_batch. Cada
+    regla de posición se aplica como un array de índices de permutación que intercambia al licitador
+    objetivo con la posición indicada, y las subastas de cada escenario se resuelven juntas con
+    ebay_proxy_bidding_batch. Así los distintos k y reglas comparten las mismas valoraciones y la
+    misma posición aleatoria, en lugar de copiar arrays de objetos y ejecutar el motor tres veces
+    por simulación.
+
+    Args:
+        n (int): Número total de licitadores potenciales.
+        d_values (list): Lista de valores del incremento mínimo de puja a evaluar.
+        sims (int): Número de simulaciones independientes por cada valor de `d`.
+        ks (iterable[int]): Índices de valoración objetivo (1 = mayor valoración, 2 = segunda mayor, etc.).
+        reglas (dict | None): Reglas de posición {nombre: función (sims, n, rng) -> posiciones}. Si es None,
+            se usan las de REGLAS_POSICION ("first", "random" y "last").
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+
+    Returns:
+        dict:
+            Diccionario indexado por k. Cada valor es un diccionario con las claves "prob" y "profit",
+            que contienen a su vez, para cada regla, una lista con la probabilidad de victoria o el
+            beneficio esperado para cada valor de d_values.
+    """
+    for k in ks:
+        if k < 1 or k > n:
+            raise ValueError("k debe estar entre 1 y n")
+    if reglas is None:
+        reglas = REGLAS_POSICION
+    rng = obtener_generador(rng)
+
+    results = {k: {"prob": {regla: [] for regla in reglas}, "profit": {regla: [] for regla in reglas}}
+               for k in ks}
+    filas = np.arange(sims)
+    for d in d_values:
+        valoraciones = arrival_order_batch(sims, n, rng)
+        idx_sorted = np.argsort(valoraciones, axis=1)
+        # Una única posición destino por regla y simulación, compartida por todos los k
+        posiciones = {regla: regla_posicion(sims, n, rng) for regla, regla_posicion in reglas.items()}
+        for k in ks:
+            # Licitador objetivo: k-ésima mayor valoración de cada subasta
+            idx_target = idx_sorted[:, -k]
+            v_target = valoraciones[filas, idx_target]
+            for regla, pos in posiciones.items():
+                # Permutación que intercambia al objetivo con la posición de la regla
+                perm = np.tile(np.arange(n), (sims, 1))
+                perm[filas, pos] = idx_target
+                perm[filas, idx_target] = pos
+                winner, price, _ = ebay_proxy_bidding_batch(np.take_along_axis(valoraciones, perm, axis=1), 0, d)
+                gana = winner == pos
+                results[k]["prob"][regla].append(np.mean(gana) if sims else 0)
+                results[k]["profit"][regla].append(np.mean(np.where(gana, v_target - price, 0)) if sims else 0)
+    return results
+
+
+def prob_kth_max_val_wins_by_position(n, d_values, sims, k, rng=None):
     """
     Estima la probabilidad de victoria del licitador con la k-ésima mayor valoración
     condicionada a su posición de llegada en la subasta. Para cada valor de incremento mínimo `d` en `d_values`, la función ejecuta
@@ -330,11 +560,15 @@ def prob_kth_max_val_wins_by_position(n, d_values, sims, k):
             * random: llega en una posición aleatoria.
             * last: llega en última posición.
 
+    Los escenarios se resuelven en bloque con escenarios_kth_max_val_by_position; para obtener
+    varios k sobre las mismas subastas conviene llamar directamente a esa función.
+
     Args:
         n (int): Número total de licitadores potenciales.
         d_values (list): Lista de valores del incremento mínimo de puja a evaluar.
         sims (int): Número de simulaciones independientes por cada valor de `d`.
         k (int): Índice de la valoración objetivo (1 = mayor valoración, 2 = segunda mayor, etc.).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         dict:
@@ -345,54 +579,7 @@ def prob_kth_max_val_wins_by_position(n, d_values, sims, k):
 
     """
 
-    if k < 1 or k > n:
-        raise ValueError("k debe estar entre 1 y n")
-
-    #Función auxiliar para obtener el índice k-esimo mayor
-    def get_kth_index(vals, k):
-        idx_sorted = np.argsort(vals)
-        return idx_sorted[-k]   # k-ésimo mayor
-
-    results = { "first": [], "random": [], "last": [] }
-
-    for d in d_values:
-        #print(f"\nSimulando d = {d}")
-        wins = { "first": 0, "random": 0, "last": 0 }
-        for _ in range(sims):
-            # Generamos orden de llegada
-            order = arrival_order(n)
-            vals = np.array([buyer.valoracion for buyer in order])
-            # Identificamos al licitador objetivo
-            idx_target = get_kth_index(vals, k)
-            bidder_target = order[idx_target]
-
-            # CASO 1: Llega primero
-            order_first = np.array(order, dtype=object)
-            order_first[[0, idx_target]] = order_first[[idx_target, 0]]
-            winner, price, _ = ebay_proxy_bidding(n, 0, d, biders=order_first)
-            if winner and winner.ID == bidder_target.ID:
-                wins["first"] += 1
-
-            # CASO 2: Llega aleatorio
-            order_random = np.array(order, dtype=object)
-            pos_random = np.random.randint(0, n)
-            order_random[[pos_random, idx_target]] = order_random[[idx_target, pos_random]]
-            winner, price, _ = ebay_proxy_bidding(n, 0, d, biders=order_random)
-            if winner and winner.ID == bidder_target.ID:
-                wins["random"] += 1
-
-            # CASO 3: Llega último
-            order_last = np.array(order, dtype=object)
-            order_last[[n-1, idx_target]] = order_last[[idx_target, n-1]]
-            winner, price, _ = ebay_proxy_bidding(n, 0, d, biders=order_last)
-            if winner and winner.ID == bidder_target.ID:
-                wins["last"] += 1
-
-        # Guardamos probabilities
-        for key in results:
-            results[key].append(wins[key] / sims)
-
-    return results
+    return escenarios_kth_max_val_by_position(n, d_values, sims, ks=(k,), rng=rng)[k]["prob"]
 
 
 
@@ -426,7 +613,7 @@ def plot_probabilities(d_values, results, k):
 
 
 
-def expected_profit_k_ght_max_valuation_by_position(n, d_values, sims, k):
+def expected_profit_k_ght_max_valuation_by_position(n, d_values, sims, k, rng=None):
     """
     Estima el beneficio esperado del licitador con la k-ésima mayor valoración
     condicionado a su posición de llegada en la subasta.
@@ -441,13 +628,15 @@ def expected_profit_k_ght_max_valuation_by_position(n, d_values, sims, k):
         * random: llega en una posición aleatoria.
         * last: llega en última posición.
 
-     El beneficio es cero cuando el licitador no gana la subasta.
+     El beneficio es cero cuando el licitador no gana la subasta. Los escenarios se resuelven en
+     bloque con escenarios_kth_max_val_by_position.
 
     Args:
         n (int): Número total de licitadores potenciales.
         d_values (list): Lista de valores del incremento mínimo de puja a evaluar.
         sims (int): Número de simulaciones independientes por cada valor de `d`.
         k (int): Índice de la valoración objetivo (1 = mayor valoración, 2 = segunda mayor, etc.).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         dict:
@@ -456,51 +645,7 @@ def expected_profit_k_ght_max_valuation_by_position(n, d_values, sims, k):
             del licitador k-ésimo más valorado para el valor d_values[i].
     """
 
-    if k < 1 or k > n:
-        raise ValueError("k debe estar entre 1 y n")
-
-    # Función auxiliar para obtener el índice k-esimo mayor
-    def get_kth_index(vals, k):
-        idx_sorted = np.argsort(vals)
-        return idx_sorted[-k]  # k-ésimo mayor
-
-    results = {"first": [], "random": [], "last": []}
-
-    for d in d_values:
-        #print(f"\nSimulando beneficios para d = {d}")
-        profits = {"first": [], "random": [], "last": []}
-        for _ in range(sims):
-            # Generamos orden de llegada
-            order = arrival_order(n)
-            vals = np.array([buyer.valoracion for buyer in order])
-            # Identificamos al licitador objetivo (k-ésimo mayor)
-            idx_target = get_kth_index(vals, k)
-            bidder_target = order[idx_target]
-
-            # CASO 1: Llega primero
-            order_first = np.array(order, dtype=object)
-            order_first[[0, idx_target]] = order_first[[idx_target, 0]]
-            winner, price, _ = ebay_proxy_bidding(n, 0, d, biders=order_first)
-            profits["first"].append(bidder_target.valoracion - price if winner and winner.ID == bidder_target.ID else 0)
-
-            # CASO 2: Llega aleatorio
-            order_random = np.array(order, dtype=object)
-            pos_random = np.random.randint(0, n)
-            order_random[[pos_random, idx_target]] = order_random[[idx_target, pos_random]]
-            winner, price, _ = ebay_proxy_bidding(n, 0, d, biders=order_random)
-            profits["random"].append(bidder_target.valoracion - price if winner and winner.ID == bidder_target.ID else 0)
-
-            #CASO 3: Llega último
-            order_last = np.array(order, dtype=object)
-            order_last[[n - 1, idx_target]] = order_last[[idx_target, n - 1]]
-            winner, price, _ = ebay_proxy_bidding(n, 0, d, biders=order_last)
-            profits["last"].append(bidder_target.valoracion - price if winner and winner.ID == bidder_target.ID else 0)
-
-        # Guardamos probabilities
-        for key in results:
-            results[key].append(np.mean(profits[key]))
-
-    return results
+    return escenarios_kth_max_val_by_position(n, d_values, sims, ks=(k,), rng=rng)[k]["profit"]
 
 
 def plot_expected_profits(d_values, results, k):
@@ -5,12 +5,13 @@ import matplotlib.pyplot as plt
 m = 5
 max_min_increment = 0.2
 sims = 100
+semilla = 2024  # Semilla fija: los resultados se guardan en la caché en disco y se reutilizan entre ejecuciones
 Valuation_method = ["common_value", "correlated_private", "independent"]
 
 # Gráfico para Common Value (Figura 5)
-x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, valuation_method="common_value")
-x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, valuation_method="common_value")
-x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, valuation_method="common_value")
+x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, valuation_method="common_value", rng=semilla, cache=True)
+x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, valuation_method="common_value", rng=semilla, cache=True)
+x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, valuation_method="common_value", rng=semilla, cache=True)
 
 plt.rcParams['font.family'] = 'Times New Roman'
 plt.rcParams['font.size'] = 14
@@ -32,9 +33,9 @@ plt.tight_layout()
 plt.show()
 
 # Gráfico para Correlated Private (Figura 5)
-x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, valuation_method="correlated_private")
-x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, valuation_method="correlated_private")
-x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, valuation_method="correlated_private")
+x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, valuation_method="correlated_private", rng=semilla, cache=True)
+x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, valuation_method="correlated_private", rng=semilla, cache=True)
+x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, valuation_method="correlated_private", rng=semilla, cache=True)
 
 plt.rcParams['font.family'] = 'Times New Roman'
 plt.rcParams['font.size'] = 14
@@ -56,9 +57,9 @@ plt.tight_layout()
 plt.show()
 
 # Gráfico para Independent (Figura 5)
-x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, valuation_method="independent")
-x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, valuation_method="independent")
-x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, valuation_method="independent")
+x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, valuation_method="independent", rng=semilla, cache=True)
+x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, valuation_method="independent", rng=semilla, cache=True)
+x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, valuation_method="independent", rng=semilla, cache=True)
 
 plt.rcParams['font.family'] = 'Times New Roman'
 plt.rcParams['font.size'] = 14
@@ -14,6 +14,7 @@ d_values = [0.01, 0.025, 0.05, 0.075, 0.1]
 m = 5
 reserve_price = 0
 sims = 1000
+semilla = 2024  # Semilla fija: los resultados se guardan en la caché en disco y se reutilizan entre ejecuciones
 Valuation_method = ["common_value", "correlated_private", "independent"]
 
 # Gráfico para Common Value (Figura 7)
@@ -21,7 +22,7 @@ pujas_d_values = {d: [] for d in d_values}
 for d in d_values:
     print(f"Simulando para d = {d}")
     for n in N_values:
-        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, valuation_method="common_value", sigma_reserve=0.05, sigma_increment=0.002)
+        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, valuation_method="common_value", sigma_reserve=0.05, sigma_increment=0.002, rng=semilla, cache=True)
         pujas_d_values[d].append(pujas_mean)
 
 plt.rcParams['font.family'] = 'Times New Roman'
@@ -51,7 +52,7 @@ pujas_d_values = {d: [] for d in d_values}
 for d in d_values:
     print(f"Simulando para d = {d}")
     for n in N_values:
-        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, valuation_method="correlated_private", sigma_reserve=0.05, sigma_increment=0.002)
+        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, valuation_method="correlated_private", sigma_reserve=0.05, sigma_increment=0.002, rng=semilla, cache=True)
         pujas_d_values[d].append(pujas_mean)
 
 plt.rcParams['font.family'] = 'Times New Roman'
@@ -81,7 +82,7 @@ pujas_d_values = {d: [] for d in d_values}
 for d in d_values:
     print(f"Simulando para d = {d}")
     for n in N_values:
-        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, valuation_method="independent", sigma_reserve=0.05, sigma_increment=0.002)
+        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, valuation_method="independent", sigma_reserve=0.05, sigma_increment=0.002, rng=semilla, cache=True)
         pujas_d_values[d].append(pujas_mean)
 
 plt.rcParams['font.family'] = 'Times New Roman'
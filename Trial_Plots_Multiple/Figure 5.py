@@ -14,11 +14,12 @@ Reserve price s = 0. Results averaged over many simulations.
 m = 5  # número de objetos en subasta
 max_min_increment = 0.2
 sims = 100
+semilla = 2024  # Semilla fija: los resultados se guardan en la caché en disco y se reutilizan entre ejecuciones
 
 # Ejecutamos simulaciones para distintos N
-x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims)
-x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims)
-x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims)
+x10, y10, z10 = comparacion_simulaciones_multiple(10, m, max_min_increment, sims, rng=semilla, cache=True, por_lotes=True)
+x20, y20, z20 = comparacion_simulaciones_multiple(20, m, max_min_increment, sims, rng=semilla, cache=True, por_lotes=True)
+x40, y40, z40 = comparacion_simulaciones_multiple(40, m, max_min_increment, sims, rng=semilla, cache=True, por_lotes=True)
 
 # Gráfico comparativo
 plt.rcParams['font.family'] = 'Times New Roman'
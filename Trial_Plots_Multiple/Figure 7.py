@@ -14,12 +14,13 @@ d_values = [0.01, 0.025, 0.05, 0.075, 0.1]  # Incrementos mínimos. Figura 7 ens
 m = 5
 reserve_price = 0
 sims = 1000
+semilla = 2024  # Semilla fija: los resultados se guardan en la caché en disco y se reutilizan entre ejecuciones
 
 pujas_d_values = {d: [] for d in d_values}
 for d in d_values:
     print(f"Simulando para d = {d}")
     for n in N_values:
-        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims)
+        pujas_mean = sim_bids_fixed_d_multiple(n,m, reserve_price, d, sims, rng=semilla, cache=True, por_lotes=True)
         pujas_d_values[d].append(pujas_mean)
 
 plt.rcParams['font.family'] = 'Times New Roman'
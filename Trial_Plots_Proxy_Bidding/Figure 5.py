@@ -6,10 +6,11 @@ of bidders using proxy bidding. Results are shown for 10, 20, and 40 bidders wit
 from auniformdistribution on [0,1]. The starting price s = 0 and results are averaged over 500,000
 auctions.
 """
+semilla = 2024  # Semilla fija: los resultados se guardan en la caché en disco y se reutilizan entre ejecuciones
 # Ejecutamos las simulaciones para distintos n
-x10, y10, z10 = comparacion_simulaciones(10, 0.2, 5000)
-x20, y20, z20 = comparacion_simulaciones(20, 0.2, 5000)
-x40, y40, z40 = comparacion_simulaciones(40, 0.2,  5000)
+x10, y10, z10 = comparacion_simulaciones(10, 0.2, 5000, rng=semilla, cache=True)
+x20, y20, z20 = comparacion_simulaciones(20, 0.2, 5000, rng=semilla, cache=True)
+x40, y40, z40 = comparacion_simulaciones(40, 0.2,  5000, rng=semilla, cache=True)
 
 # Gráfico comparativo
 plt.rcParams['font.family'] = 'Times New Roman'
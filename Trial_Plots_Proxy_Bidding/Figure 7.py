@@ -12,12 +12,13 @@ N_values = list(range(1, 41))  # De 1 a 40
 d_values = [0.01, 0.025, 0.05, 0.075, 0.1]  # Incrementos mínimos
 reserve_price = 0
 sims = 1000
+semilla = 2024  # Semilla fija: los resultados se guardan en la caché en disco y se reutilizan entre ejecuciones
 
 pujas_d_values = {d: [] for d in d_values}
 for d in d_values:
     print(f"Simulando para d = {d}")
     for n in N_values:
-        pujas_mean = sim_bids_fixed_d(n, reserve_price, d, sims)
+        pujas_mean = sim_bids_fixed_d(n, reserve_price, d, sims, rng=semilla, cache=True)
         pujas_d_values[d].append(pujas_mean)
 
 plt.rcParams['font.family'] = 'Times New Roman'
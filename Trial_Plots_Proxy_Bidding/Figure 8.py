@@ -8,7 +8,8 @@ on the order in which they bid. There are 20 bidders with valuations drawn unifo
 s =0. Results are averaged over 10^7 auctions
 """
 
-res = prob_win_order(n=20, d_values=[0,0.025,0.05,0.075,0.1], sims=10000)
+# Un único conjunto de subastas por d proporciona las probabilidades de todas las posiciones
+res, ic = prob_win_order(n=20, d_values=[0,0.025,0.05,0.075,0.1], sims=10000, intervalos=True)
 # Gráfico comparativo
 plt.rcParams['font.family'] = 'Times New Roman'
 plt.rcParams['font.size'] = 14
@@ -17,6 +18,8 @@ pos = np.arange(1, 21)
 # Curvas para cada d
 for d in res:
     ax.plot(pos,res[d],marker='o',linewidth=2,label=f"d = {d}")
+    # Banda de confianza binomial (Wilson) al 95%
+    ax.fill_between(pos,ic[d][0],ic[d][1],alpha=0.2)
     # Etiqueta identificativa al final de cada curva
     ax.text(pos[-1],res[d][-1],f"d = {d}",fontsize=14,ha='left',va='bottom')
 # Títulos y etiquetas
@@ -1,4 +1,4 @@
-from Simulation.Proxy_Bidding_Simulation import prob_kth_max_val_wins_by_position, expected_profit_k_ght_max_valuation_by_position, plot_expected_profits, plot_probabilities
+from Simulation.Proxy_Bidding_Simulation import escenarios_kth_max_val_by_position, plot_expected_profits, plot_probabilities
 """
 Fig. 9. Simulation results showing (a) the probability of winning, and (b) the expected profit,when
 the bidders with the highest and second highest valuations bid first, at a random time, and last.
@@ -9,15 +9,13 @@ over 107 auctions.
 #Replicación Figuras 9
 n = 20
 d_values = [0,0.02, 0.04, 0.06, 0.08, 0.1]
+# Una única ejecución por lotes proporciona probabilidades y beneficios para k = 1 y k = 2
+results = escenarios_kth_max_val_by_position(n, d_values, sims=1000, ks=(1, 2))
 #Figura 9(a)
-results_9a = prob_kth_max_val_wins_by_position(n, d_values, sims=1000, k=1)
-plot_probabilities(d_values, results_9a, 1)
+plot_probabilities(d_values, results[1]["prob"], 1)
 #Figura 9(c)
-results_9c = prob_kth_max_val_wins_by_position(n, d_values, sims=1000, k=2)
-plot_probabilities(d_values, results_9c, 2)
+plot_probabilities(d_values, results[2]["prob"], 2)
 #Figura 9(b)
-results_9b = expected_profit_k_ght_max_valuation_by_position(n, d_values, sims=1000, k=1)
-plot_expected_profits(d_values, results_9b, 1)
+plot_expected_profits(d_values, results[1]["profit"], 1)
 #Figura 9(d)
-results_9d = expected_profit_k_ght_max_valuation_by_position(n, d_values, sims=1000, k=2)
-plot_expected_profits(d_values, results_9d, 2)
+plot_expected_profits(d_values, results[2]["profit"], 2)
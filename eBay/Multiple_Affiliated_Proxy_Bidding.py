@@ -1,8 +1,90 @@
+from functools import lru_cache
 import numpy as np
-from Class.Class_Multiple_Affiliated import AffiliatedObject, AffiliatedBuyer
-from scipy.stats import multivariate_normal
+from scipy.linalg import cholesky_banded
+from Class.Class_Multiple_Affiliated import (AffiliatedObject, AffiliatedBuyer, IndiceGrupos,
+                                             generar_valoraciones_afiliadas)
+from Class.Generador import obtener_generador
 
-def generate_correlated_features(m: int, correlation=0.85):
+
+def bandas_covarianza_caracteristicas(m: int, correlation=0.85) -> np.ndarray:
+    """
+    Matriz de covarianzas de generate_correlated_features en formato de bandas inferior (el de
+    scipy.linalg.cholesky_banded): como solo hay covarianza dentro de cada grupo de 3 objetos y entre
+    objetos adyacentes, basta con la diagonal y dos subdiagonales.
+
+    Returns:
+        np.ndarray: Array (3, m) con bandas[k, i] = cov[i + k, i] (ceros de relleno al final).
+    """
+    bandas = np.zeros((3, m))
+    bandas[0] = 0.08
+    i = np.arange(m)
+    # Subdiagonal 1: mismo grupo (alta correlación) o adyacentes de grupos distintos (correlación media)
+    bandas[1, :-1] = np.where(i[:-1] // 3 == (i[:-1] + 1) // 3, 0.08 * correlation, 0.08 * correlation * 0.8)
+    # Subdiagonal 2: solo dentro del mismo grupo
+    bandas[2, :-2] = np.where(i[:-2] // 3 == (i[:-2] + 2) // 3, 0.08 * correlation, 0.0)
+    return bandas
+
+
+def _menor_autovalor_bandas(bandas: np.ndarray) -> float:
+    """
+    Menor autovalor de una matriz simétrica dada en bandas inferiores, por bisección sobre σ: la
+    matriz - σ I es definida positiva si y solo si σ queda por debajo del menor autovalor, y se
+    comprueba intentando su factorización de Cholesky en bandas (coste lineal en m por paso). El
+    intervalo inicial va de la cota de Gershgorin a la menor entrada diagonal y se divide hasta la
+    precisión de la máquina.
+    """
+    diagonal = bandas[0]
+    # Suma por fila de los valores absolutos fuera de la diagonal (cada subdiagonal aporta a dos filas)
+    fuera = np.zeros_like(diagonal)
+    for k in range(1, bandas.shape[0]):
+        fuera[:-k] += np.abs(bandas[k, :-k])
+        fuera[k:] += np.abs(bandas[k, :-k])
+    # Con σ por debajo de la cota de Gershgorin la matriz es diagonalmente dominante (definida positiva)
+    bajo = float(np.min(diagonal - fuera)) - 1.0
+    alto = float(np.min(diagonal))
+    desplazada = bandas.copy()
+    while True:
+        medio = 0.5 * (bajo + alto)
+        if medio <= bajo or medio >= alto:
+            return bajo
+        desplazada[0] = diagonal - medio
+        try:
+            cholesky_banded(desplazada, lower=True, check_finite=False)
+            bajo = medio
+        except np.linalg.LinAlgError:
+            alto = medio
+
+
+@lru_cache(maxsize=16)
+def factor_caracteristicas(m: int, correlation=0.85):
+    """
+    Factor de Cholesky en bandas de la covarianza de generate_correlated_features, calculado una vez
+    por (m, correlation) y guardado en una caché LRU para reutilizarlo en todas las subastas.
+
+    Si la matriz no es semidefinida positiva se suma a la diagonal -min_eig + 1e-8, como en la
+    construcción densa original; el menor autovalor se obtiene por bisección con factorizaciones en
+    bandas (ver _menor_autovalor_bandas), sin formar la matriz m × m. El coste es lineal en m por cada
+    uno de los pasos de la bisección (unos 60).
+
+    Returns:
+        tuple:
+            factor (np.ndarray | None): Bandas (3, m) del factor L (cov = L L^T), de solo lectura, o None
+                si la factorización falla.
+            min_eig (float): Menor autovalor de la matriz original.
+    """
+    bandas = bandas_covarianza_caracteristicas(m, correlation)
+    min_eig = _menor_autovalor_bandas(bandas) if m else 0.0
+    if min_eig < 0:
+        bandas[0] += -min_eig + 1e-8
+    try:
+        factor = cholesky_banded(bandas, lower=True)
+    except np.linalg.LinAlgError:
+        return None, min_eig
+    factor.setflags(write=False)
+    return factor, min_eig
+
+
+def generate_correlated_features(m: int, correlation=0.85, rng=None):
     """
     Genera vectores de características correlacionadas para los m objetos de una subasta con afiliación,
     destinados a capturar similitudes estructurales entre ellos.
@@ -22,10 +104,15 @@ def generate_correlated_features(m: int, correlation=0.85):
     mediante una distribución normal multivariante, que posteriormente se normalizan individualmente
     al intervalo [0,1].
 
+    La matriz es de bandas (anchura 2), así que no se construye en forma densa: su factor de Cholesky
+    en bandas se calcula una vez por (m, correlation) con factor_caracteristicas y cada muestra es
+    media + L Z, con coste lineal en m.
+
     Args:
         m (int): Número total de objetos.
         correlation (float): Nivel de correlación base entre objetos
                 pertenecientes al mismo grupo.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         np.ndarray:
@@ -33,52 +120,30 @@ def generate_correlated_features(m: int, correlation=0.85):
             vector de características normalizado de un objeto.
 
     """
-    # Crear matriz base diagonal. LA MATRIZ HA DE SER SIMÉTRICA DEFINIDA POSITIVA (scipy.stats.multivariate_normal.rvs())
-    cov_matrix = np.eye(m) * 0.08
-    # Primero construir una matriz simétrica
-    for i in range(m):
-        for j in range(i + 1, m):  # Solo la mitad superior
-            # Objetos en el mismo grupo tienen alta correlación
-            if i // 3 == j // 3:
-                cov_value = 0.08 * correlation
-            # Objetos adyacentes tienen correlación media
-            elif abs(i - j) == 1:
-                cov_value = 0.08 * correlation * 0.8
-            else:
-                cov_value = 0  # Sin correlación directa
-
-            # Asignar a ambas posiciones para mantener simetría
-            cov_matrix[i, j] = cov_value
-            cov_matrix[j, i] = cov_value
-
-    # Asegurar que la matriz sea semidefinida positiva
-    # Mét0do: añadir una pequeña constante a la diagonal
-    min_eig = np.min(np.real(np.linalg.eigvals(cov_matrix)))
-    if min_eig < 0:
-        cov_matrix += np.eye(m) * (-min_eig + 1e-8)
-
-    mean = np.full(m, 0.5)
-
-    # Generar características
-    try:
-        features = multivariate_normal.rvs(mean=mean, cov=cov_matrix, size=3).T
-    except ValueError as e:
-        print(f"Error con matriz de covarianza: {e}")
+    rng = obtener_generador(rng)
+    # Factor en bandas de la covarianza (semidefinida positiva tras el ajuste de la diagonal)
+    factor, min_eig = factor_caracteristicas(m, correlation)
+
+    # Generar características: 0.5 + L Z, con el producto L Z calculado banda a banda
+    if factor is not None:
+        z = rng.standard_normal((3, m)).T
+        features = 0.5 + factor[0][:, None] * z
+        features[1:] += factor[1][:-1, None] * z[:-1]
+        features[2:] += factor[2][:-2, None] * z[:-2]
+    else:
+        print("Error con matriz de covarianza: no es definida positiva")
         print(f"m={m}, correlation={correlation}")
         print(f"min_eig={min_eig}")
         # Fallback: usar características independientes
-        features = np.random.rand(m, 3)
+        features = rng.uniform(0, 1, (m, 3))
 
     # Normalizar cada vector de características
-    for i in range(m):
-        min_val = features[i].min()
-        max_val = features[i].max()
-        features[i] = (features[i] - min_val) / (max_val - min_val + 1e-8)
-
-    return features
+    min_val = features.min(axis=1, keepdims=True)
+    max_val = features.max(axis=1, keepdims=True)
+    return (features - min_val) / (max_val - min_val + 1e-8)
 
 
-def multiple_affiliated_arrival_order(n: int, m: int,valuation_method,affiliation_params=None):
+def multiple_affiliated_arrival_order(n: int, m: int,valuation_method,affiliation_params=None, rng=None):
     """
     Genera un conjunto de compradores afiliados y devuelve un orden de llegada
     aleatorio para ser utilizado en el mecanismo de subasta múltiple con afiliación.
@@ -92,8 +157,10 @@ def multiple_affiliated_arrival_order(n: int, m: int,valuation_method,affiliatio
         - Se inicializa un objeto `AffiliatedBuyer` con los parámetros adicionales
              proporcionados en `affiliation_params`.
 
-    Los compradores se almacenan en un array de objetos y posteriormente se devuelve una
-    permutación aleatoria del mismo, representando el orden de llegada efectivo en la subasta.
+    Las valoraciones de los n compradores se extraen en bloque (una matriz (n, m) con
+    generar_valoraciones_afiliadas) y cada comprador recibe su fila. Los compradores se almacenan en
+    un array de objetos y posteriormente se devuelve una permutación aleatoria del mismo,
+    representando el orden de llegada efectivo en la subasta.
 
     Args:
         n (int): Número total de compradores a generar.
@@ -101,6 +168,7 @@ def multiple_affiliated_arrival_order(n: int, m: int,valuation_method,affiliatio
         valuation_method (str): Mét0do de generación de valoraciones.
         affiliation_params (dict | None): Parámetros adicionales para configurar el comportamiento
              afiliado del comprador (p. ej., affiliation_strength, learning_rate).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         np.ndarray:
@@ -110,15 +178,18 @@ def multiple_affiliated_arrival_order(n: int, m: int,valuation_method,affiliatio
     if affiliation_params is None:
         affiliation_params = {}
 
-    buyers_array = np.empty((0,), dtype=object)
+    rng = obtener_generador(rng)
+    valuations, common_values = generar_valoraciones_afiliadas(n, m, valuation_method, rng)
 
+    buyers_array = np.empty(n, dtype=object)
     for i in range(n):
-        buyer = AffiliatedBuyer(ID=f"ID{i + 1}",n_objects=m,valuation_method=valuation_method,**affiliation_params)
-        buyers_array = np.append(buyers_array, buyer)
-    return np.random.permutation(buyers_array)
+        common_value = None if common_values is None else common_values[i]
+        buyers_array[i] = AffiliatedBuyer(ID=f"ID{i + 1}",n_objects=m,valuation_method=valuation_method,
+                                          valuations=valuations[i],common_value=common_value,**affiliation_params)
+    return rng.permutation(buyers_array)
 
 
-def create_affiliated_objects(m, reserve_prices, min_increments,feature_correlation=0.85):
+def create_affiliated_objects(m, reserve_prices, min_increments,feature_correlation=0.85, rng=None):
     """
     Crea una colección de objetos con características correlacionadas para ser utilizados
     en un mecanismo de subasta múltiple con afiliación.
@@ -147,26 +218,120 @@ def create_affiliated_objects(m, reserve_prices, min_increments,feature_correlat
                 para cada objeto.
         feature_correlation (float): Nivel de correlación base entre
                 características de objetos pertenecientes al mismo grupo.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         list[AffiliatedObject]: Lista de objetos con características correlacionadas y estado
             inicial listo para ser utilizado en el mecanismo de subasta múltiple con afiliación.
     """
-    features = generate_correlated_features(m, feature_correlation)
+    rng = obtener_generador(rng)
+    features = generate_correlated_features(m, feature_correlation, rng)
 
     objetos = []
     for i in range(m):
         # Asignar grupo de correlación (cada 3 objetos en mismo grupo)
         correlation_group = i // 3
         obj = AffiliatedObject(ID=i + 1,reserve_price=reserve_prices[i],min_increment=min_increments[i],
-            feature_vector=features[i],correlation_group=correlation_group)
+            feature_vector=features[i],correlation_group=correlation_group,rng=rng)
         objetos.append(obj)
     return objetos
 
 
+def aprendizaje_matricial(biders) -> dict:
+    """
+    Prepara la Fase 1 matricial de ebay_affiliated_bidding_multiple: reúne las valoraciones de los n
+    compradores en una matriz (n, m) y sustituye el vector valuations de cada comprador por una vista
+    de su fila, de modo que get_valuation_for_object y puede_pujar leen siempre la matriz actualizada.
+
+    Args:
+        biders (list[AffiliatedBuyer]): Compradores de la subasta.
+
+    Returns:
+        dict: 'valoraciones' (matriz (n, m)), 'learning_rate' y 'affiliation_strength' (columnas (n, 1))
+            y máscaras por modelo 'common_value' y 'correlated_private' (los compradores "independent"
+            no aprenden).
+    """
+    valoraciones = np.array([buyer.valuations for buyer in biders], dtype=float)
+    for i, buyer in enumerate(biders):
+        buyer.valuations = valoraciones[i]
+    metodos = np.array([buyer.valuation_method for buyer in biders])
+    return {'valoraciones': valoraciones,
+            'learning_rate': np.array([[buyer.learning_rate] for buyer in biders], dtype=float),
+            'affiliation_strength': np.array([[buyer.affiliation_strength] for buyer in biders], dtype=float),
+            'common_value': metodos == "common_value", 'correlated_private': metodos == "correlated_private"}
+
+
+def objetos_sucios(objetos: list, versiones_vistas: np.ndarray) -> dict:
+    """
+    Objetos cuyo estado público ha cambiado desde el último aprendizaje, según su contador version
+    (ver AffiliatedObject.version), separados por modelo de afiliación:
+        - common_value: el ajuste de un objeto solo depende de su propia intensidad de puja, así que
+          basta con que el objeto haya cambiado.
+        - correlated_private: el ajuste depende del precio medio del grupo, así que se revisan todos
+          los objetos de un correlation_group en el que haya cambiado alguno.
+
+    Args:
+        objetos (list[AffiliatedObject]): Objetos de la subasta.
+        versiones_vistas (np.ndarray): Versión de cada objeto en el último aprendizaje (-1 si ninguno).
+
+    Returns:
+        dict: Máscaras booleanas de longitud m por valuation_method ("independent" no aprende).
+    """
+    versiones = np.array([obj.version for obj in objetos])
+    cambiados = versiones != versiones_vistas
+    grupos = {objetos[j].correlation_group for j in np.flatnonzero(cambiados)}
+    return {'common_value': cambiados,
+            'correlated_private': np.array([obj.correlation_group in grupos for obj in objetos], dtype=bool),
+            'independent': np.zeros(len(objetos), dtype=bool)}
+
+
+def actualizar_valoraciones_matricial(aprendizaje: dict, biders, objetos: list, indice_grupos: IndiceGrupos,
+                                      sucios: dict = None):
+    """
+    Fase 1 de una iteración para todos los compradores a la vez: equivale a llamar a
+    update_valuations en cada comprador, pero las señales públicas se leen una sola vez como
+    vectores de longitud m (intensidad de puja, precio actual y precio medio del grupo) y el ajuste
+    de todas las valoraciones es una única operación vectorial seguida de un recorte a [0, 1].
+
+    Con los mismos parámetros el resultado coincide exactamente con el de update_valuations (las
+    operaciones se asocian en el mismo orden).
+
+    Args:
+        aprendizaje (dict): Estructura creada con aprendizaje_matricial; su matriz se actualiza en el sitio.
+        biders (list[AffiliatedBuyer]): Mismos compradores, en el mismo orden, que en aprendizaje_matricial.
+        objetos (list[AffiliatedObject]): Objetos de la subasta.
+        indice_grupos (IndiceGrupos): Índice de grupos del mercado.
+        sucios (dict | None): Máscaras de objetos_sucios; si se indican, solo se ajustan esos objetos.
+    """
+    valoraciones = aprendizaje['valoraciones']
+    con_pujas = np.array([obj.highest_bidder is not None for obj in objetos])
+    cambia_comun = con_pujas if sucios is None else con_pujas & sucios['common_value']
+    cambia_privado = con_pujas if sucios is None else con_pujas & sucios['correlated_private']
+    ajuste = np.zeros_like(valoraciones)
+    comun, privado = aprendizaje['common_value'], aprendizaje['correlated_private']
+    if comun.any():
+        # common_value: learning_rate * bidding_intensity * affiliation_strength en objetos con pujas
+        intensidad = np.array([obj.bidding_intensity for obj in objetos], dtype=float)
+        senal = np.where(cambia_comun, intensidad, 0.0)
+        ajuste[comun] = aprendizaje['learning_rate'][comun] * senal * aprendizaje['affiliation_strength'][comun]
+    if privado.any():
+        # correlated_private: hacia el precio medio de los objetos similares con pujas
+        medio = [indice_grupos.precio_medio_similares(obj) if tiene else None
+                 for obj, tiene in zip(objetos, cambia_privado)]
+        senal = np.array([0.0 if media is None else media - obj.current_price for obj, media in zip(objetos, medio)])
+        ajuste[privado] = aprendizaje['learning_rate'][privado] * senal * aprendizaje['affiliation_strength'][privado] * 1.2
+    aprenden = comun | privado
+    nuevas = valoraciones[aprenden] + ajuste[aprenden]
+    diferencias = nuevas - valoraciones[aprenden]
+    for buyer, diferencia in zip((buyer for buyer, a in zip(biders, aprenden) if a), diferencias):
+        buyer.adjustment_history.append(diferencia)
+    valoraciones[aprenden] = np.clip(nuevas, 0, 1)
+
+
 def ebay_affiliated_bidding_multiple(n: int, m: int,reserve_prices: list,min_increments: list,biders=None,
                                      valuation_method = "common_value",learning_rate=0.15,affiliation_strength=0.3,
-                                     max_iter: int = 10000):
+                                     max_iter: int = 10000, rng=None, diagnostico: bool = False, objetos=None,
+                                     matricial: bool = False, incremental: bool = False):
     """
     Implementa un mecanismo de Proxy Bidding para múltiples objetos en un
     entorno con valoraciones afiliadas, extendiendo la lógica del mecanismo
@@ -195,6 +360,9 @@ def ebay_affiliated_bidding_multiple(n: int, m: int,reserve_prices: list,min_inc
                   seleccionan aquel con mayor beneficio esperado (valoración − enter_price).
 
         - El proceso continúa hasta alcanzar un punto fijo (ningún comprador cambia de objeto) o hasta alcanzar `max_iter`.
+          Como las valoraciones se actualizan en cada iteración, la dinámica puede oscilar: al final de cada
+          iteración con cambios se guarda una huella exacta del estado (ver _huella_afiliada) y, si se
+          repite, se detiene de inmediato en lugar de agotar max_iter.
 
     Args:
         n (int)
@@ -207,30 +375,76 @@ def ebay_affiliated_bidding_multiple(n: int, m: int,reserve_prices: list,min_inc
         learning_rate (float): Tasa de aprendizaje en la actualización de valoraciones.
         affiliation_strength (float): Intensidad del efecto de afiliación.
         max_iter (int): Máximo número de iteraciones permitidas.
+        rng (np.random.Generator | int | None): Generador o semilla para los compradores (si biders es
+          None) y las características de los objetos (ver obtener_generador).
+        diagnostico (bool): Si es True, se devuelve también el registro de convergencia.
+        objetos (list[AffiliatedObject] | None): Objetos ya creados en su estado inicial (p. ej. una
+          bifurcación de los de create_affiliated_objects, ver AffiliatedObject.bifurcar); se modifican
+          en el sitio. Si es None, se crean con create_affiliated_objects a partir de `rng`.
+        matricial (bool): Si es True, la Fase 1 se calcula para todos los compradores a la vez sobre una
+          matriz (n, m) de valoraciones (ver actualizar_valoraciones_matricial), con el mismo resultado.
+          Las valoraciones de cada comprador pasan a ser vistas de esa matriz.
+        incremental (bool): Si es True, en la Fase 1 solo se aprende de los objetos cuyo estado público
+          ha cambiado (nuevas pujas) desde el aprendizaje anterior (ver objetos_sucios), en lugar de volver
+          a aplicar en cada iteración el ajuste de todos los objetos con pujas. Así un mismo estado público
+          no acumula ajustes sucesivos y el coste del aprendizaje depende de la actividad del mercado; el
+          resultado difiere del modo por defecto.
 
     Returns:
         list[AffiliatedObject]: Lista de objetos con su estado final tras la subasta, incluyendo
                 ganador, precio final, historial de pujas e intensidad de puja.
+        dict (solo si diagnostico=True):
+            - 'iteraciones': iteraciones realizadas.
+            - 'convergido': True si se alcanzó un punto fijo; False si se agotó max_iter o hubo un ciclo.
+            - 'longitud_ciclo': iteraciones entre dos visitas al mismo estado (0 si no hay ciclo).
+            - 'rotacion': número de compradores que cambian de objeto en cada iteración.
+            - 'ajustes_omitidos': solo si incremental=True, número de ajustes (comprador, objeto con
+              pujas) que no se recalculan por no haber cambiado el objeto.
     """
+    rng = obtener_generador(rng)
     # 1. Generar compradores afiliados
     if biders is None:
         biders = multiple_affiliated_arrival_order(n, m,valuation_method=valuation_method,affiliation_params={
-                'learning_rate': learning_rate,'affiliation_strength': affiliation_strength})
+                'learning_rate': learning_rate,'affiliation_strength': affiliation_strength}, rng=rng)
 
     # 2. Crear objetos con características correlacionadas
-    objetos = create_affiliated_objects(m, reserve_prices, min_increments)
+    if objetos is None:
+        objetos = create_affiliated_objects(m, reserve_prices, min_increments, rng=rng)
     objetos_by_id = {obj.ID: obj for obj in objetos}
+    # Índice de grupos compartido por todos los compradores (lo mantienen los objetos al registrar pujas)
+    market_info = {'indice_grupos': IndiceGrupos(objetos)}
+    aprendizaje = aprendizaje_matricial(biders) if matricial else None
+    versiones_vistas = np.full(len(objetos), -1)
+    aprenden = {metodo: sum(buyer.valuation_method == metodo for buyer in biders)
+                for metodo in ("common_value", "correlated_private")} if incremental else {}
+    ajustes_omitidos = 0
 
     # 3. Dinámica iterativa (similar a eBay Proxy Bidding Multiple)
     changed = True
     it = 0
+    rotacion = []
+    vistos = {}
+    longitud_ciclo = 0
+    asignacion = tuple(buyer.active_object for buyer in biders)
     while changed and it < max_iter:
         changed = False
         it += 1
 
         # Fase 1: Actualizar valoraciones basadas en información pública
-        for buyer in biders:
-            buyer.update_valuations(objetos)
+        if incremental:
+            # Solo los objetos que han cambiado desde el aprendizaje anterior
+            sucios = objetos_sucios(objetos, versiones_vistas)
+            con_pujas = np.array([obj.highest_bidder is not None for obj in objetos])
+            for metodo, cuantos in aprenden.items():
+                ajustes_omitidos += cuantos * int((con_pujas & ~sucios[metodo]).sum())
+            market_info['sucios'] = {metodo: np.flatnonzero(mascara) for metodo, mascara in sucios.items()}
+            versiones_vistas = np.array([obj.version for obj in objetos])
+        if aprendizaje is not None:
+            actualizar_valoraciones_matricial(aprendizaje, biders, objetos, market_info['indice_grupos'],
+                                              sucios if incremental else None)
+        else:
+            for buyer in biders:
+                buyer.update_valuations(objetos, market_info)
 
         # Fase 2: Tomar decisiones de puja
         for buyer in biders:
@@ -267,10 +481,41 @@ def ebay_affiliated_bidding_multiple(n: int, m: int,reserve_prices: list,min_inc
                     if success:
                         buyer.active_object = best_obj.ID
                         changed = True
+
+        # Rotación y detección de ciclos
+        anterior, asignacion = asignacion, tuple(buyer.active_object for buyer in biders)
+        rotacion.append(sum(a != b for a, b in zip(anterior, asignacion)))
+        if changed:
+            huella = _huella_afiliada(asignacion, biders, objetos)
+            if incremental:
+                # El siguiente aprendizaje depende también de qué objetos han cambiado en esta iteración
+                huella = (huella, objetos_sucios(objetos, versiones_vistas)['common_value'].tobytes())
+            if huella in vistos:
+                longitud_ciclo = it - vistos[huella]
+                break
+            vistos[huella] = it
+    if diagnostico:
+        info = {'iteraciones': it, 'convergido': not changed, 'longitud_ciclo': longitud_ciclo, 'rotacion': rotacion}
+        if incremental:
+            info['ajustes_omitidos'] = ajustes_omitidos
+        return objetos, info
     return objetos
 
 
+def _huella_afiliada(asignacion: tuple, biders, objetos: list) -> tuple:
+    """
+    Huella exacta del estado que determina la siguiente iteración de ebay_affiliated_bidding_multiple:
+    asignación y valoraciones de los compradores y, por objeto, precio, pujas máximas, líder,
+    intensidad de puja y última puja observada (de la que depende la próxima intensidad).
 
+    Se devuelve el estado completo y no su hash(), de modo que dos estados distintos con el mismo
+    hash no se confunden al buscarlos en el diccionario de estados vistos.
+    """
+    valoraciones = b"".join(np.asarray(buyer.valuations, dtype=float).tobytes() for buyer in biders)
+    estado_objetos = tuple((o.current_price, o.highest_bid, o.second_highest_bid,
+                            None if o.highest_bidder is None else o.highest_bidder.ID, o.bidding_intensity,
+                            o.observed_bids[-1]['amount'] if o.observed_bids else None) for o in objetos)
+    return asignacion, valoraciones, estado_objetos
 
 
 # Función de conveniencia para mantener compatibilidad
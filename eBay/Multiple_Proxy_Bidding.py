@@ -1,37 +1,52 @@
+import heapq
 import numpy as np
-from Class.Class_Multiple_Proxy_Bidding import Objeto, Buyer
+from Class.Class_Multiple_Proxy_Bidding import Objeto, PoblacionBuyers, MonticuloEntrada, EstadoMercado
+from Class.Generador import obtener_generador
 
-def multiple_arrival_order(n: int):
+def multiple_arrival_order(n: int, rng=None):
     """
     Genera un conjunto de n compradores independientes con valoraciones
     distribuidas uniformemente en el intervalo [0, 1], y devuelve un
     orden de llegada aleatorio para ser utilizado en una subasta.
 
     Para cada comprador i:
-        - Se asigna un identificador único "ID{i}".
+        - Se asigna un identificador entero único i.
         - Se genera una valoración privada v_i ~ U(0,1).
         - Se crea una instancia de Buyer con dicha valoración.
 
-    Los compradores se almacenan en un array de objetos y posteriormente
-    se devuelve una permutación aleatoria del mismo, que representa el
-    orden de llegada efectivo en la subasta (mecanismo secuencial).
+    Las valoraciones y la permutación se generan en bloque mediante multiple_arrival_population
+    y los Buyer se construyen como vistas de la población, ya en el orden de llegada
+    efectivo en la subasta (mecanismo secuencial).
 
     Args:
         n (int): Número total de compradores a generar.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
 
     Returns:
         np.ndarray: Array de objetos Buyer permutado aleatoriamente,
                         representando el orden de llegada.
     """
-    buyers_array = np.empty((0,), dtype=object)
-    for i in range(n):
-        valoracion = np.random.uniform(0, 1)
-        buyer = Buyer(ID=f"ID{i+1}", valoracion=valoracion)
-        buyers_array = np.append(buyers_array, buyer)
-    return np.random.permutation(buyers_array)
+    return multiple_arrival_population(n, rng).vistas()
+
+
+def multiple_arrival_population(n: int, rng=None) -> PoblacionBuyers:
+    """
+    Equivalente a multiple_arrival_order pero sin materializar objetos: devuelve una PoblacionBuyers
+    con IDs, valoraciones U(0,1) y orden de llegada aleatorio almacenados en arrays contiguos.
+    Puede pasarse directamente como `biders` a ebay_proxy_bidding_multiple.
+
+    Args:
+        n (int): Número total de compradores a generar.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+
+    Returns:
+        PoblacionBuyers: Población con orden de llegada aleatorio.
+    """
+    return PoblacionBuyers.generar(n, rng)
 
 def ebay_proxy_bidding_multiple(n: int, m: int, reserve_prices: list, min_increments: list,
-                               biders = None, max_iter: int = 10000):
+                               biders = None, max_iter: int = 10000, rng=None,
+                               metodo: str = "pendientes", diagnostico: bool = False):
     """
     Implementa un mecanismo de Proxy Bidding para m objetos simultáneos,
     replicando exactamente la lógica del proxy bidding individual en cada objeto.
@@ -52,9 +67,16 @@ def ebay_proxy_bidding_multiple(n: int, m: int, reserve_prices: list, min_increm
     - Si no está en ningún objeto, el buyer entra en el objeto viable cuyo
       enter_price sea menor (regla greedy):
             enter_price = reserva si no ha empezado, current_price + d si ya ha empezado.
+      Los objetos se mantienen en un MonticuloEntrada, de modo que la entrada de un comprador
+      cuesta O(log m) en lugar de recorrer los m objetos.
 
     - El proceso continúa iterativamente hasta alcanzar un punto fijo
       (ningún buyer cambia de objeto) o hasta max_iter iteraciones.
+      Con metodo="pendientes" (por defecto) los compradores se pasan a un EstadoMercado y cada pasada
+      solo examina a los que pueden cambiar de estado (ver resolver_mercado); el resultado es idéntico
+      al de las pasadas completas de metodo="iterativo" y se devuelve como objetos Objeto. Con
+      metodo="estado" la misma resolución se hace sin materializar compradores (ver
+      ebay_proxy_bidding_multiple_estado) y se devuelven vistas ObjetoVista.
 
     Args:
 
@@ -62,25 +84,103 @@ def ebay_proxy_bidding_multiple(n: int, m: int, reserve_prices: list, min_increm
         m (int): Número total de objetos en subasta.
         reserve_prices (list): Lista con los valoraciones del objeto.
         min_increments (list): Lista de incrementos mínimos de puja para cada objeto.
+        biders (np.ndarray | PoblacionBuyers | None): Orden de llegada opcional. Una población se
+            convierte en compradores Buyer nuevos (sin estado previo) antes de empezar.
         max_iter (int): Máximo número de iteraciones para evitar bucles infinitos.
+        rng (np.random.Generator | int | None): Generador o semilla con el que se genera el orden
+            de llegada cuando biders es None (ver obtener_generador).
+        metodo (str): "pendientes" (lista de trabajo), "iterativo" (pasadas completas) o "estado"
+            (lista de trabajo sobre arrays).
+        diagnostico (bool): Si es True, se devuelve también el registro de convergencia y coste.
 
     Returns:
 
     objetos : list[Objeto]
         Lista de objetos con su estado final (ganador, current_price, etc.).
+    info : dict (solo si diagnostico=True)
+        - 'iteraciones': pasadas completas que haría la dinámica iterativa (incluida la pasada final sin cambios).
+        - 'convergido': True si se alcanzó un punto fijo; False si se agotó max_iter o se detectó un ciclo.
+        - 'longitud_ciclo': pasadas entre dos visitas a la misma configuración (0 si no hay ciclo).
+        - 'rotacion': número de compradores que cambian de objeto en cada pasada.
+        - 'examenes': compradores examinados realmente.
+        - 'pasadas_equivalentes': examenes / n.
+        - 'pasadas_ahorradas': iteraciones - pasadas_equivalentes.
     """
 
+    if metodo == "estado":
+        estado, info = _mercado_resuelto(n, m, reserve_prices, min_increments, biders, max_iter, rng)
+        objetos = estado.objetos()
+        return (objetos, info) if diagnostico else objetos
+
     # Generamos orden de llegada y objetos
     if biders is None:
-        biders = multiple_arrival_order(n)
-    objetos = [Objeto(i+1, reserve_prices[i], min_increments[i]) for i in range(m)]
-    objetos_by_id = {obj.ID: obj for obj in objetos}
+        biders = multiple_arrival_order(n, rng)
+    elif isinstance(biders, PoblacionBuyers):
+        biders = biders.vistas()
 
     #print(INICIO DE LA SUBASTA MÚLTIPLE)
     #print(f"Total buyers: {n}, Total objetos: {m}\n")
 
+    if metodo == "pendientes":
+        estado = EstadoMercado.desde_compradores(biders, reserve_prices[:m], min_increments[:m])
+        info = resolver_mercado(estado, max_iter)
+        estado.sincronizar_compradores()
+        objetos = _objetos_desde_estado(estado)
+    elif metodo == "iterativo":
+        objetos = [Objeto(i+1, reserve_prices[i], min_increments[i]) for i in range(m)]
+        objetos_by_id = {obj.ID: obj for obj in objetos}
+        info = _resolver_iterativo(biders, objetos, objetos_by_id, MonticuloEntrada(objetos), max_iter)
+    else:
+        raise ValueError(f"Método de resolución desconocido: {metodo}")
+
+    #print(RESULTADOS FINALES)
+    #for obj in objetos:
+    #    if obj.highest_bidder:
+    #       print(f"Objeto {obj.ID}: ganador {obj.highest_bidder.ID}, highest_bid={obj.highest_bid:.3f}, precio_final={obj.current_price:.3f}, bids_aceptadas={obj.buyers_count}")
+    #    else:
+    #       print(f"Objeto {obj.ID}: sin ganador (no alcanzó reserva {obj.reserve_price:.3f})")
+
+    if diagnostico:
+        return objetos, info
+    return objetos
+
+
+def _diagnostico(iteraciones: int, convergido: bool, rotacion: list, examenes: int, n: int,
+                 longitud_ciclo: int = 0) -> dict:
+    """Registro de convergencia y coste de una resolución (ver ebay_proxy_bidding_multiple)."""
+    equivalentes = examenes / n if n else 0.0
+    return {'iteraciones': iteraciones, 'convergido': convergido, 'longitud_ciclo': longitud_ciclo,
+            'rotacion': rotacion, 'examenes': examenes, 'pasadas_equivalentes': equivalentes,
+            'pasadas_ahorradas': iteraciones - equivalentes}
+
+
+def _huella(asignacion: tuple, objetos: list) -> tuple:
+    """
+    Huella de la configuración del mercado al final de una pasada: asignación de compradores y
+    estado de cada objeto (precio, pujas máximas y líder). La dinámica es determinista dada esta
+    configuración, así que volver a una ya vista implica un ciclo. Se devuelve la configuración
+    completa (no su hash) para que una colisión de hash no se tome por un ciclo.
+    """
+    return (asignacion, tuple((o.current_price, o.highest_bid, o.second_highest_bid,
+                                    None if o.highest_bidder is None else o.highest_bidder.ID) for o in objetos))
+
+
+def _resolver_iterativo(biders, objetos: list, objetos_by_id: dict, monticulo: MonticuloEntrada, max_iter: int):
+    """
+    Dinámica original: en cada pasada se recorren todos los compradores en orden de llegada hasta
+    que ninguno cambia de objeto o se alcanza max_iter. Al final de cada pasada con cambios se guarda
+    la huella de la configuración; si se repite, la dinámica ha entrado en un ciclo y se detiene sin
+    agotar max_iter.
+
+    Returns:
+        dict: Registro de convergencia y coste (ver _diagnostico).
+    """
     changed = True
     it = 0
+    rotacion = []
+    vistas = {}
+    longitud_ciclo = 0
+    asignacion = tuple(buyer.active_object for buyer in biders)
     while changed and it < max_iter:
         changed = False
         it += 1
@@ -97,13 +197,13 @@ def ebay_proxy_bidding_multiple(n: int, m: int, reserve_prices: list, min_increm
                     changed = True
             # 2) Si no está en ningún objeto, intentar entrar en uno nuevo
             if buyer.active_object is None:
-                candidatos = [o for o in objetos if buyer.puede_pujar(o)]
-                if not candidatos:
+                # Regla de entrada a nueva puja: objeto con menor enter_price (el único candidato posible)
+                minimo = monticulo.minimo()
+                if minimo is None or buyer.valoracion < minimo[0]:
                     #print(f"Buyer {buyer.ID} (v={buyer.valoracion:.3f}) no puede pujar en ningún objeto.")
                     continue
-                # Regla de entrada a nueva puja: objeto con menor enter_price
-                objeto = min(candidatos, key=lambda o: o.enter_price())
-                ep = objeto.enter_price()
+                ep, idx = minimo
+                objeto = objetos[idx]
                 #print(f"Buyer {buyer.ID} (v={buyer.valoracion:.3f}) evalúa Objeto {objeto.ID} "
                       #f"(enter_price={ep:.3f}, current_price={objeto.current_price:.3f})")
 
@@ -111,17 +211,290 @@ def ebay_proxy_bidding_multiple(n: int, m: int, reserve_prices: list, min_increm
 
                 if exito:
                     buyer.active_object = objeto.ID
+                    monticulo.actualizar(idx)
                     #print(f"Buyer {buyer.ID} entra en Objeto {objeto.ID}, highest_bid={objeto.highest_bid:.3f}, current_price={objeto.current_price:.3f}")
                     changed = True
                 else:
                     pass
                     #print(f"Buyer {buyer.ID} no puede entrar en Objeto {objeto.ID}, puja insuficiente.")
 
-    #print(RESULTADOS FINALES)
-    #for obj in objetos:
-    #    if obj.highest_bidder:
-    #       print(f"Objeto {obj.ID}: ganador {obj.highest_bidder.ID}, highest_bid={obj.highest_bid:.3f}, precio_final={obj.current_price:.3f}, bids_aceptadas={obj.buyers_count}")
-    #    else:
-    #       print(f"Objeto {obj.ID}: sin ganador (no alcanzó reserva {obj.reserve_price:.3f})")
+        anterior, asignacion = asignacion, tuple(buyer.active_object for buyer in biders)
+        rotacion.append(sum(a != b for a, b in zip(anterior, asignacion)))
+        if changed:
+            huella = _huella(asignacion, objetos)
+            if huella in vistas:
+                longitud_ciclo = it - vistas[huella]
+                break
+            vistas[huella] = it
+    return _diagnostico(it, not changed, rotacion, it * len(biders), len(biders), longitud_ciclo)
+
 
+def _objetos_desde_estado(estado: EstadoMercado) -> list:
+    """
+    Objetos Objeto con el estado final de cada subasta de `estado`; highest_bidder es el comprador
+    Buyer original (estado construido con desde_compradores).
+    """
+    objetos = []
+    for j in range(estado.m):
+        obj = Objeto(j + 1, float(estado.reserve_price[j]), float(estado.min_increment[j]))
+        obj.current_price = float(estado.current_price[j])
+        obj.highest_bid = float(estado.highest_bid[j])
+        obj.second_highest_bid = float(estado.second_highest_bid[j])
+        obj.buyers_count = int(estado.buyers_count[j])
+        if estado.highest_bidder[j] >= 0:
+            obj.highest_bidder = estado.comprador(int(estado.highest_bidder[j]))
+        objetos.append(obj)
     return objetos
+
+
+def _mercado_inicial(n: int, m: int, reserve_prices: list, min_increments: list, biders, rng) -> EstadoMercado:
+    """EstadoMercado inicial de una subasta a partir de biders (o de una población nueva si es None)."""
+    if biders is None:
+        biders = multiple_arrival_population(n, rng)
+    if isinstance(biders, PoblacionBuyers):
+        return EstadoMercado.desde_poblacion(biders, reserve_prices[:m], min_increments[:m])
+    return EstadoMercado.desde_compradores(biders, reserve_prices[:m], min_increments[:m])
+
+
+def _mercado_resuelto(n: int, m: int, reserve_prices: list, min_increments: list, biders, max_iter: int, rng):
+    """Construye el EstadoMercado de una subasta, lo resuelve y devuelve (estado, diagnóstico)."""
+    estado = _mercado_inicial(n, m, reserve_prices, min_increments, biders, rng)
+    info = resolver_mercado(estado, max_iter)
+    estado.sincronizar_compradores()
+    return estado, info
+
+
+def ebay_proxy_bidding_multiple_estado(n: int, m: int, reserve_prices: list, min_increments: list,
+                                       biders=None, max_iter: int = 10000, rng=None, diagnostico: bool = False):
+    """
+    Versión de ebay_proxy_bidding_multiple que trabaja sobre un EstadoMercado (estructura de arrays)
+    y lo devuelve directamente, sin construir objetos Objeto ni, si biders es una población, Buyer.
+
+    El resultado es el mismo que el del motor con objetos: estado.current_price, estado.buyers_count
+    y estado.highest_bidder (índice de llegada, -1 si el objeto no se vende) describen cada objeto, y
+    estado.objetos() ofrece las vistas con la API de Objeto.
+
+    Args:
+        n (int): Número total de postores.
+        m (int): Número total de objetos en subasta.
+        reserve_prices (list): Precios de reserva de cada objeto.
+        min_increments (list): Incrementos mínimos de puja de cada objeto.
+        biders (np.ndarray | PoblacionBuyers | None): Orden de llegada opcional (ver ebay_proxy_bidding_multiple).
+        max_iter (int): Máximo número de pasadas.
+        rng (np.random.Generator | int | None): Generador o semilla para el orden de llegada si biders es None.
+        diagnostico (bool): Si es True, se devuelve también el registro de convergencia (ver _diagnostico).
+
+    Returns:
+        EstadoMercado: Estado final de la subasta (y el registro de convergencia si diagnostico=True).
+    """
+    estado, info = _mercado_resuelto(n, m, reserve_prices, min_increments, biders, max_iter, rng)
+    return (estado, info) if diagnostico else estado
+
+
+def resolver_mercado(estado: EstadoMercado, max_iter: int = 10000):
+    """
+    Resuelve la dinámica multiobjeto sobre un EstadoMercado examinando solo a los compradores que
+    pueden cambiar de estado, con el mismo orden de llegada dentro de cada pasada y, por tanto, el
+    mismo resultado final que las pasadas completas de _resolver_iterativo.
+
+    Un examen que no cambia nada puede omitirse sin alterar la trayectoria, y tras la primera pasada
+    casi todos lo son:
+        - Los precios de entrada nunca bajan, así que un comprador sin objeto que no puede entrar en
+          el más barato ya no podrá entrar en ninguno: se descarta para siempre.
+        - Un comprador activo solo abandona cuando sube el precio de su objeto, es decir, cuando otro
+          comprador (o él mismo, si no pasa a liderar) registra una puja en ese objeto.
+
+    Por ello cada objeto guarda a sus compradores activos en un montículo por valoración. Tras cada
+    puja aceptada se extraen los que quedan por debajo del nuevo precio y se programan para esta
+    pasada (si llegan después del que ha pujado) o para la siguiente (si llegan antes).
+
+    No se calculan huellas de la configuración: en este modelo la dinámica no puede ciclar, porque
+    los precios nunca bajan y un comprador que abandona un objeto ya no puede volver a él, de modo
+    que cada comprador entra como mucho una vez en cada objeto.
+
+    Args:
+        estado (EstadoMercado): Estado inicial; se modifica en el sitio.
+        max_iter (int): Máximo número de pasadas.
+
+    Returns:
+        dict: Registro de convergencia y coste (ver _diagnostico).
+    """
+    n, m = estado.n, estado.m
+    valoracion = estado.valoracion.tolist()
+    activo = estado.active_object
+    precio = estado.current_price
+    monticulo = MonticuloEntrada(range(m), estado.precio_entrada)
+    # Compradores activos de cada objeto como montículos de (valoración, posición)
+    titulares = [[] for _ in range(m)]
+    for pos in np.flatnonzero(activo >= 0):
+        heapq.heappush(titulares[activo[pos]], (valoracion[pos], int(pos)))
+
+    actual = list(range(n))  # La primera pasada examina a todos
+    programados = set(actual)
+    siguiente = set()
+    it = 0
+    examenes = 0
+    rotacion = []
+    changed = False
+    # La primera pasada se hace siempre (aunque no haya compradores), como en la dinámica iterativa
+    while (actual or it == 0) and it < max_iter:
+        it += 1
+        changed = False
+        rotacion.append(0)
+        while actual:
+            pos = heapq.heappop(actual)
+            programados.discard(pos)
+            examenes += 1
+            v = valoracion[pos]
+            antes = j = int(activo[pos])
+            # 1) Si está en un objeto, comprobar si sigue siendo viable
+            if j >= 0 and precio[j] > v:
+                activo[pos] = j = -1
+                changed = True
+            # 2) Si no está en ningún objeto, intentar entrar en el de menor precio de entrada
+            minimo = monticulo.minimo() if j < 0 else None
+            if minimo is not None and v >= minimo[0]:
+                _, idx = minimo
+                if estado.registrar_puja(idx, pos, v):
+                    activo[pos] = idx
+                    monticulo.actualizar(idx)
+                    changed = True
+                    heap = titulares[idx]
+                    heapq.heappush(heap, (v, pos))
+                    nuevo_precio = precio[idx]
+                    while heap and heap[0][0] < nuevo_precio:
+                        _, q = heapq.heappop(heap)
+                        if q > pos:
+                            if q not in programados:
+                                heapq.heappush(actual, q)
+                                programados.add(q)
+                        else:
+                            siguiente.add(q)
+            if activo[pos] != antes:
+                rotacion[-1] += 1
+        actual = sorted(siguiente)
+        programados = set(actual)
+        siguiente = set()
+    # La dinámica iterativa necesita una pasada final sin cambios para detectar el punto fijo
+    convergido = it > 0 and (not changed or it < max_iter)
+    if changed and it < max_iter:
+        it += 1
+        rotacion.append(0)
+    return _diagnostico(it, convergido, rotacion, examenes, n)
+
+
+def multiple_arrival_order_batch(sims: int, n: int, rng=None) -> np.ndarray:
+    """
+    Versión matricial de multiple_arrival_order para el motor por lotes: valoraciones U(0,1) de `sims`
+    mercados independientes con n compradores, ya en orden de llegada (al ser i.i.d., la permutación
+    aleatoria no altera su distribución).
+
+    Args:
+        sims (int): Número de mercados independientes.
+        n (int): Número de compradores por mercado.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+
+    Returns:
+        np.ndarray: Matriz (sims, n) de valoraciones en orden de llegada.
+    """
+    return obtener_generador(rng).uniform(0, 1, (sims, n))
+
+
+def ebay_proxy_bidding_multiple_batch(valoraciones, reserve_prices, min_increments, max_iter: int = 10000,
+                                      diagnostico: bool = False):
+    """
+    Versión por lotes de ebay_proxy_bidding_multiple: resuelve S mercados multiobjeto independientes
+    avanzándolos a la vez (lockstep) sobre arrays (S, n) de compradores y (S, m) de objetos.
+
+    En cada pasada se recorre el eje de llegada posición a posición y, para todos los mercados que aún
+    no han convergido, se aplica con operaciones de NumPy la misma regla que el motor individual:
+        - El comprador activo cuyo objeto supera su valoración lo abandona.
+        - El comprador sin objeto entra en el de menor precio de entrada (desempate por menor índice)
+          si su valoración lo alcanza, y su puja se registra como en Objeto.registrar_puja.
+    Un mercado en el que una pasada completa no cambia nada se marca como convergido y deja de
+    procesarse, de modo que cada mercado sigue exactamente la trayectoria del motor individual
+    (incluido el límite max_iter).
+
+    Args:
+        valoraciones (np.ndarray): Matriz (S, n) de valoraciones en orden de llegada. Un vector de
+            longitud n se interpreta como un único mercado.
+        reserve_prices (np.ndarray): Precios de reserva (S, m), o (m,) comunes a todos los mercados.
+        min_increments (np.ndarray): Incrementos mínimos (S, m), o (m,) comunes a todos los mercados.
+        max_iter (int): Máximo número de pasadas por mercado.
+        diagnostico (bool): Si es True, se devuelve además un diccionario con 'iteraciones' (S,) y
+            'convergido' (S,) de cada mercado (ver ebay_proxy_bidding_multiple).
+
+    Returns:
+        tuple:
+            - winner (np.ndarray): Matriz (S, m) con la posición de llegada del ganador de cada objeto
+              (-1 si no se vende).
+            - price (np.ndarray): Matriz (S, m) con el precio final de cada objeto.
+            - buyers_count (np.ndarray): Matriz (S, m) con el número de pujas aceptadas en cada objeto.
+            - info (dict): Solo si diagnostico=True.
+    """
+    valoraciones = np.asarray(valoraciones, dtype=float)
+    if valoraciones.ndim == 1:
+        valoraciones = valoraciones[np.newaxis, :]
+    sims, n = valoraciones.shape
+    reserve = np.array(np.broadcast_to(reserve_prices, (sims, np.shape(reserve_prices)[-1])), dtype=float)
+    incremento = np.array(np.broadcast_to(min_increments, reserve.shape), dtype=float)
+    m = reserve.shape[1]
+
+    price = np.zeros((sims, m))
+    highest_bid = np.zeros((sims, m))
+    second_highest_bid = np.zeros((sims, m))
+    winner = np.full((sims, m), -1)
+    buyers_count = np.zeros((sims, m), dtype=int)
+    activo = np.full((sims, n), -1)
+    pendiente = np.ones(sims, dtype=bool)
+    iteraciones = np.zeros(sims, dtype=int)
+    if m == 0 or n == 0:
+        # Una única pasada sin cambios en cada mercado
+        pendiente[:] = max_iter < 1
+        iteraciones[:] = min(1, max_iter)
+
+    it = 0
+    while pendiente.any() and it < max_iter:
+        it += 1
+        filas = np.flatnonzero(pendiente)
+        iteraciones[filas] += 1
+        cambio = np.zeros(len(filas), dtype=bool)
+        for pos in range(n):
+            v = valoraciones[filas, pos]
+            a = activo[filas, pos]
+            # 1) Abandono de los compradores cuyo objeto supera su valoración
+            en_objeto = np.flatnonzero(a >= 0)
+            abandona = en_objeto[price[filas[en_objeto], a[en_objeto]] > v[en_objeto]]
+            a[abandona] = -1
+            cambio[abandona] = True
+            # 2) Entrada en el objeto con menor precio de entrada
+            libres = np.flatnonzero(a < 0)
+            if len(libres):
+                fl = filas[libres]
+                entrada = np.where(winner[fl] < 0, reserve[fl], price[fl] + incremento[fl])
+                j = np.argmin(entrada, axis=1)
+                entra = v[libres] >= entrada[np.arange(len(fl)), j]
+                r, c, b = fl[entra], j[entra], v[libres][entra]
+                # Registro de la puja (misma regla que Objeto.registrar_puja)
+                primera = winner[r, c] < 0
+                nuevo_lider = ~primera & (b > highest_bid[r, c])
+                segunda = ~primera & ~nuevo_lider
+                rp, cp = r[primera], c[primera]
+                highest_bid[rp, cp] = b[primera]
+                price[rp, cp] = reserve[rp, cp]
+                rn, cn = r[nuevo_lider], c[nuevo_lider]
+                second_highest_bid[rn, cn] = highest_bid[rn, cn]
+                highest_bid[rn, cn] = b[nuevo_lider]
+                rs, cs = r[segunda], c[segunda]
+                second_highest_bid[rs, cs] = np.maximum(second_highest_bid[rs, cs], b[segunda])
+                winner[r[primera | nuevo_lider], c[primera | nuevo_lider]] = pos
+                ro, co = r[~primera], c[~primera]
+                price[ro, co] = np.minimum(highest_bid[ro, co], second_highest_bid[ro, co] + incremento[ro, co])
+                buyers_count[r, c] += 1
+                a[libres[entra]] = c
+                cambio[libres[entra]] = True
+            activo[filas, pos] = a
+        pendiente[filas] = cambio
+    if diagnostico:
+        return winner, price, buyers_count, {'iteraciones': iteraciones, 'convergido': ~pendiente}
+    return winner, price, buyers_count
@@ -1,8 +1,11 @@
+import math
+import struct
 import numpy as np
-from Class.Class_Proxy_Bidding import Licitadores
+from Class.Class_Proxy_Bidding import PoblacionLicitadores
+from Class.Generador import obtener_generador
 
 
-def arrival_order(n: int) -> np.ndarray:
+def arrival_order(n: int, rng=None) -> np.ndarray:
     """
     Genera un orden de llegada aleatorio para los licitadores de la subasta.
     Crea n instancias de Licitadores, las almacena en un array de NumPy y
@@ -11,22 +14,37 @@ def arrival_order(n: int) -> np.ndarray:
     A. Rogers, E. David, N. R. Jennings, and J. Schiff (2007). “The Effects of Proxy Bidding
     and Minimum Bid Increments within eBay Auctions.”
 
+    Las valoraciones y la permutación se generan en bloque con arrival_population y los objetos
+    `Licitadores` (con ID entero) se construyen como vistas de esa población.
+
     Args:
         n (int): Número total de licitadores potenciales.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
     Returns:
         np.ndarray: Array unidimensional de objetos `Licitadores` permutado
         aleatoriamente.
 
     """
 
-    buyers_array = np.empty((0,), dtype=object)
-    for i in range(n):
-        buyer = Licitadores(ID=f"ID{i+1}")
-        buyers_array = np.append(buyers_array, buyer)
-    return np.random.permutation(buyers_array)
+    return arrival_population(n, rng).vistas()
+
+
+def arrival_population(n: int, rng=None) -> PoblacionLicitadores:
+    """
+    Equivalente a arrival_order pero sin materializar objetos: devuelve una PoblacionLicitadores
+    con IDs, valoraciones U(0,1) y orden de llegada aleatorio almacenados en arrays contiguos.
+    Puede pasarse directamente como `biders` a ebay_proxy_bidding.
+
+    Args:
+        n (int): Número total de licitadores potenciales.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+    Returns:
+        PoblacionLicitadores: Población con orden de llegada aleatorio.
+    """
+    return PoblacionLicitadores.generar(n, rng)
 
 
-def ebay_proxy_bidding(n, reserve_price: float, min_increment: float, biders = None):
+def ebay_proxy_bidding(n, reserve_price: float, min_increment: float, biders = None, rng=None):
     """
     Implementa el mecanismo de Proxy Bidding utilizado en subastas tipo eBay.
     El algoritmo simula la dinámica de pujas automáticas: cada licitador entra
@@ -43,8 +61,12 @@ def ebay_proxy_bidding(n, reserve_price: float, min_increment: float, biders = N
                 la subasta comience.
             min_increment (float): Incremento mínimo requerido para superar la puja
                 visible actual.
-            biders (np.ndarray | None): Array opcional con objetos `Licitadores`
-                que define el orden de llegada. Si es `None`, se genera uno nuevo.
+            biders (np.ndarray | PoblacionLicitadores | None): Array opcional con objetos `Licitadores`
+                que define el orden de llegada, o una población respaldada por arrays (en cuyo caso
+                la subasta se resuelve con ebay_proxy_bidding_batch y el ganador se devuelve como
+                vista `Licitadores`). Si es `None`, se genera uno nuevo.
+            rng (np.random.Generator | int | None): Generador o semilla con el que se genera el orden
+                de llegada cuando biders es None (ver obtener_generador).
 
         Returns:
             tuple:
@@ -57,7 +79,12 @@ def ebay_proxy_bidding(n, reserve_price: float, min_increment: float, biders = N
     """
 
     if biders is None:
-        biders = arrival_order(n)
+        biders = arrival_order(n, rng)
+    if isinstance(biders, PoblacionLicitadores):
+        winner, price, buyers_count = ebay_proxy_bidding_batch(biders.valoraciones_llegada, reserve_price,
+                                                               min_increment)
+        highest_bidder = biders[winner[0]] if winner[0] >= 0 else None
+        return highest_bidder, float(price[0]), int(buyers_count[0])
     current_price = 0
     highest_bid = 0
     second_highest_bid = 0
@@ -120,4 +147,241 @@ def ebay_proxy_bidding(n, reserve_price: float, min_increment: float, biders = N
     return highest_bidder, current_price, Buyers
 
 
+def arrival_order_batch(sims: int, n: int, rng=None) -> np.ndarray:
+    """
+    Versión matricial de arrival_order para el motor por lotes. Genera de una sola vez las valoraciones
+    de `sims` subastas independientes con n licitadores cada una, ya dispuestas en orden de llegada.
+    Al ser las valoraciones i.i.d. U(0,1), la permutación aleatoria de arrival_order no altera su
+    distribución, por lo que basta con una matriz de uniformes.
+
+    Args:
+        sims (int): Número de subastas independientes.
+        n (int): Número total de licitadores potenciales por subasta.
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+    Returns:
+        np.ndarray: Matriz (sims, n) donde la fila s contiene las valoraciones de la subasta s
+        en orden de llegada.
+    """
+    return obtener_generador(rng).uniform(0, 1, (sims, n))
+
+
+def ebay_proxy_bidding_batch(valoraciones, reserve_price, min_increment):
+    """
+    Versión vectorizada de ebay_proxy_bidding que resuelve muchas subastas independientes en una
+    única llamada. Las reglas son exactamente las del motor individual (precio de reserva, incremento
+    mínimo, sustitución del líder solo con puja estrictamente mayor y cierre inmediato si el primer
+    licitador no alcanza la reserva), pero el recorrido se hace columna a columna sobre el eje de
+    llegada, actualizando a la vez el estado de todas las subastas con operaciones de NumPy.
 
+        Args:
+            valoraciones (np.ndarray): Matriz (sims, n) con las valoraciones en orden de llegada.
+                Un vector de longitud n se interpreta como una única subasta.
+            reserve_price (float | np.ndarray): Precio de reserva, común o uno por subasta (sims,).
+            min_increment (float | np.ndarray): Incremento mínimo, común o uno por subasta (sims,).
+
+        Returns:
+            tuple:
+                - winner (np.ndarray): Posición de llegada del ganador en cada subasta (-1 si nadie
+                  alcanza el precio de reserva).
+                - price (np.ndarray): Precio final visible de cada subasta.
+                - buyers_count (np.ndarray): Número de pujas aceptadas en cada subasta.
+    """
+    valoraciones = np.asarray(valoraciones, dtype=float)
+    if valoraciones.ndim == 1:
+        valoraciones = valoraciones[np.newaxis, :]
+    sims, n = valoraciones.shape
+    # Precio de reserva e incremento como vectores (sims,) para admitir parámetros por subasta
+    reserve_price = np.zeros(sims) + reserve_price
+    min_increment = np.zeros(sims) + min_increment
+
+    if n == 0:
+        return np.full(sims, -1), np.zeros(sims), np.zeros(sims, dtype=int)
+
+    # Primer pujador: si no alcanza la reserva la subasta no comienza
+    iniciada = valoraciones[:, 0] >= reserve_price
+    current_price = reserve_price.copy()
+    highest_bid = np.where(iniciada, valoraciones[:, 0], 0.0)
+    second_highest_bid = np.zeros(sims)
+    winner = np.where(iniciada, 0, -1)
+    buyers_count = iniciada.astype(int)
+
+    # Siguientes licitadores: una columna del eje de llegada por paso para todas las subastas
+    for i in range(1, n):
+        bid = valoraciones[:, i]
+        aceptada = iniciada & (bid >= reserve_price) & (bid >= current_price + min_increment)
+        nuevo_lider = aceptada & (bid > highest_bid)
+        segunda = aceptada & ~nuevo_lider
+        second_highest_bid = np.where(nuevo_lider, highest_bid, second_highest_bid)
+        second_highest_bid = np.where(segunda, np.maximum(second_highest_bid, bid), second_highest_bid)
+        highest_bid = np.where(nuevo_lider, bid, highest_bid)
+        winner = np.where(nuevo_lider, i, winner)
+        buyers_count += aceptada
+        # Ajuste del precio visible solo en las subastas con puja aceptada
+        current_price = np.where(aceptada, np.minimum(highest_bid, second_highest_bid + min_increment),
+                                 current_price)
+
+    return winner, current_price, buyers_count
+
+
+def _umbral_aceptacion(bid: float, highest_bid: float, second_highest_bid: float, reserve_price: float,
+                       precio_fijo: bool) -> float:
+    """
+    Mayor incremento d (en coma flotante) para el que la puja `bid` se acepta con la regla del motor
+    individual, bid >= current_price + d con current_price = reserve_price (precio_fijo) o
+    min(highest_bid, second_highest_bid + d); -inf si no se acepta ni con d = 0.
+
+    La aceptación es monótona en d también en coma flotante, así que se parte del umbral teórico y se
+    busca el flotante en el que la regla, evaluada con las mismas operaciones que el motor, se cumple y
+    deja de cumplirse en el siguiente: primero unos pocos pasos de una unidad (ulp), que bastan casi
+    siempre, y si no, bisección sobre la representación entera de los flotantes. Así, cuando una diferencia de valoraciones
+    coincide con d (p. ej. valoraciones con dos decimales), el tramo queda del mismo lado que en
+    ebay_proxy_bidding y ebay_proxy_bidding_batch.
+    """
+    def acepta(d):
+        precio = reserve_price if precio_fijo else min(highest_bid, second_highest_bid + d)
+        return bid >= precio + d
+
+    if not acepta(0.0):
+        return -np.inf
+    umbral = bid - reserve_price if precio_fijo else max(bid - highest_bid, (bid - second_highest_bid) / 2)
+    umbral = max(umbral, 0.0)
+    # Caso habitual: el umbral teórico está a pocas ulp del umbral en coma flotante
+    for _ in range(4):
+        siguiente = math.nextafter(umbral, math.inf)
+        if acepta(umbral) and not acepta(siguiente):
+            return umbral
+        umbral = siguiente if acepta(umbral) else max(math.nextafter(umbral, -math.inf), 0.0)
+    # Bisección entre un d aceptado (inf) y uno rechazado (sup), ordenados como enteros
+    inf, sup = 0.0, max(umbral, 1e-12)
+    while acepta(sup):
+        inf, sup = sup, 2 * sup
+    k_inf, k_sup = _ordinal(inf), _ordinal(sup)
+    while k_sup - k_inf > 1:
+        k = (k_inf + k_sup) // 2
+        if acepta(_flotante(k)):
+            k_inf = k
+        else:
+            k_sup = k
+    return _flotante(k_inf)
+
+
+def _ordinal(x: float) -> int:
+    """Entero con el mismo orden que los flotantes no negativos (su representación IEEE 754)."""
+    return struct.unpack('<q', struct.pack('<d', x))[0]
+
+
+def _flotante(k: int) -> float:
+    """Inversa de _ordinal."""
+    return struct.unpack('<d', struct.pack('<q', k))[0]
+
+
+def ebay_proxy_bidding_curva(valoraciones, reserve_price: float, d_max: float = np.inf) -> dict:
+    """
+    Calcula, en una sola pasada sobre el orden de llegada, el resultado exacto de ebay_proxy_bidding
+    para TODOS los incrementos mínimos d >= 0 a la vez.
+
+    Con valoraciones y orden de llegada fijos, cada decisión del mecanismo es un umbral en d: la puja
+    b se acepta si b >= current_price + d, y como current_price = min(highest_bid, second_highest_bid + d)
+    (o el precio de reserva antes de la segunda puja aceptada), esto equivale a
+
+            d <= b - reserve_price                                  (antes de la segunda puja)
+            d <= max(b - highest_bid, (b - second_highest_bid) / 2)  (después)
+
+    Recorriendo los licitadores se mantiene una partición de la recta de d en tramos (lo, hi] con
+    estado constante (líder, highest_bid, second_highest_bid, pujas aceptadas); cada licitador parte
+    como mucho cada tramo en dos. Dentro de un tramo el precio final es reserve_price o
+    min(highest_bid, second_highest_bid + d), de modo que la curva completa es lineal a trozos.
+
+    Los umbrales se calculan con la misma aritmética en coma flotante que el motor (ver
+    _umbral_aceptacion): cada tramo es cerrado por la derecha y el resultado coincide exactamente con el
+    de ebay_proxy_bidding_batch en cualquier d, incluidos los puntos en los que una diferencia de
+    valoraciones es igual a d.
+
+    Args:
+        valoraciones (np.ndarray): Valoraciones de una subasta en orden de llegada.
+        reserve_price (float): Precio de reserva de la subasta.
+        d_max (float): Mayor incremento que se va a consultar. Los tramos situados por completo por
+            encima de d_max no se siguen, lo que reduce el trabajo cuando la malla es acotada.
+
+    Returns:
+        dict: Curva a trozos sobre [0, d_max] con las claves:
+            - 'limites': extremo derecho (incluido) de cada tramo; el último es >= d_max.
+            - 'winner': posición de llegada del ganador en cada tramo (-1 si no hay ganador).
+            - 'highest_bid', 'second_highest_bid': pujas máximas en cada tramo.
+            - 'buyers_count': pujas aceptadas en cada tramo.
+            - 'precio_fijo': True si en el tramo el precio final es el precio de reserva.
+            - 'reserve_price': precio de reserva utilizado.
+    """
+    valoraciones = [float(v) for v in np.asarray(valoraciones, dtype=float).ravel()]
+    s = float(reserve_price)
+
+    if not valoraciones or valoraciones[0] < s:
+        # Subasta que no comienza: mismo resultado para cualquier d
+        precio = s if valoraciones else 0.0
+        return {'limites': np.array([np.inf]), 'winner': np.array([-1]), 'highest_bid': np.array([0.0]),
+                'second_highest_bid': np.array([0.0]), 'buyers_count': np.array([0]),
+                'precio_fijo': np.array([True]), 'reserve_price': precio}
+
+    # Cada tramo: [hi, highest_bid, second_highest_bid, winner, buyers_count, precio_fijo]
+    tramos = [[np.inf, valoraciones[0], 0.0, 0, 1, True]]
+    for i in range(1, len(valoraciones)):
+        bid = valoraciones[i]
+        if bid < s:
+            continue
+        nuevos = []
+        lo = None
+        for tramo in tramos:
+            hi, highest_bid, second_highest_bid, winner, buyers_count, precio_fijo = tramo
+            umbral = _umbral_aceptacion(bid, highest_bid, second_highest_bid, s, precio_fijo)
+            # El primer tramo empieza en d = 0 (incluido); el resto en su extremo izquierdo (excluido)
+            if (umbral < 0) if lo is None else (umbral <= lo):
+                # Puja rechazada en todo el tramo
+                nuevos.append(tramo)
+            else:
+                if bid > highest_bid:
+                    aceptado = [hi, bid, highest_bid, i, buyers_count + 1, False]
+                else:
+                    aceptado = [hi, highest_bid, max(second_highest_bid, bid), winner, buyers_count + 1, False]
+                if umbral >= hi or umbral >= d_max:
+                    nuevos.append(aceptado)
+                else:
+                    # Se acepta para d <= umbral y se rechaza para d > umbral
+                    aceptado[0] = umbral
+                    nuevos.append(aceptado)
+                    nuevos.append(tramo)
+            lo = hi
+        # Fusionar tramos contiguos con el mismo estado
+        tramos = [nuevos[0]]
+        for tramo in nuevos[1:]:
+            if tramo[1:] == tramos[-1][1:]:
+                tramos[-1][0] = tramo[0]
+            else:
+                tramos.append(tramo)
+
+    columnas = list(zip(*tramos))
+    return {'limites': np.array(columnas[0]), 'winner': np.array(columnas[3]),
+            'highest_bid': np.array(columnas[1]), 'second_highest_bid': np.array(columnas[2]),
+            'buyers_count': np.array(columnas[4]), 'precio_fijo': np.array(columnas[5]),
+            'reserve_price': s}
+
+
+def evaluar_curva(curva: dict, d_values):
+    """
+    Evalúa una curva de ebay_proxy_bidding_curva en un conjunto arbitrario de incrementos mínimos.
+
+    Args:
+        curva (dict): Curva a trozos devuelta por ebay_proxy_bidding_curva.
+        d_values (array-like): Incrementos mínimos (d >= 0) en los que evaluar.
+
+    Returns:
+        tuple:
+            - winner (np.ndarray): Posición de llegada del ganador para cada d (-1 si no hay ganador).
+            - price (np.ndarray): Precio final para cada d.
+            - buyers_count (np.ndarray): Pujas aceptadas para cada d.
+    """
+    d_values = np.asarray(d_values, dtype=float)
+    # Los tramos son (lo, hi]: el tramo de d es el primero cuyo extremo derecho es >= d
+    tramo = np.searchsorted(curva['limites'], d_values, side='left')
+    precio_variable = np.minimum(curva['highest_bid'][tramo], curva['second_highest_bid'][tramo] + d_values)
+    price = np.where(curva['precio_fijo'][tramo], curva['reserve_price'], precio_variable)
+    return curva['winner'][tramo], price, curva['buyers_count'][tramo]
@@ -0,0 +1,249 @@
+import heapq
+import numpy as np
+from Class.Class_Multiple_Proxy_Bidding import Objeto, Buyer, MonticuloEntrada
+from Class.Generador import obtener_generador
+
+# Tipos de evento. A igualdad de instante se procesan en este orden: un anuncio abre antes de recibir
+# pujas y cierra antes de que se procesen las pujas de ese mismo instante (el cierre es exclusivo).
+APERTURA = 0
+CIERRE = 1
+PUJA = 2
+
+
+def _valoracion(buyer, j: int) -> float:
+    """Valoración del comprador para el anuncio j: la j-ésima si es afiliado, única si es un Buyer."""
+    if hasattr(buyer, 'get_valuation_for_object'):
+        return float(buyer.get_valuation_for_object(j + 1))
+    return float(buyer.valoracion)
+
+
+def _valoraciones(buyer, posiciones: np.ndarray) -> np.ndarray:
+    """
+    Valoraciones de un comprador afiliado para los anuncios de índice `posiciones`, con la misma regla
+    que get_valuation_for_object: 0 fuera de rango.
+    """
+    valuations = np.asarray(buyer.valuations, dtype=float)
+    if not len(valuations):
+        return np.zeros(len(posiciones))
+    dentro = posiciones < len(valuations)
+    return np.where(dentro, valuations[np.where(dentro, posiciones, 0)], 0.0)
+
+
+def generar_mercado_temporal(n: int, m: int, horizonte: float = 1.0, duracion: float = 0.2,
+                             reserve_price: float = 0.0, min_increment: float = 0.05,
+                             prop_snipers: float = 0.0, rng=None):
+    """
+    Genera un mercado con tiempos para ebay_timed_proxy_bidding: m anuncios que abren en instantes
+    uniformes de [0, horizonte - duracion] y duran `duracion`, y n compradores Buyer con valoración
+    U(0,1) que llegan en instantes uniformes de [0, horizonte].
+
+    Args:
+        n (int): Número de compradores.
+        m (int): Número de anuncios (objetos Objeto).
+        horizonte (float): Duración total del periodo simulado.
+        duracion (float): Duración de cada anuncio.
+        reserve_price (float): Precio de reserva de todos los anuncios.
+        min_increment (float): Incremento mínimo de todos los anuncios.
+        prop_snipers (float): Probabilidad de que cada comprador puje al final del anuncio (sniping).
+        rng (np.random.Generator | int | None): Generador o semilla (ver obtener_generador).
+
+    Returns:
+        dict: Argumentos de ebay_timed_proxy_bidding ('objetos', 'compradores', 'inicios', 'finales',
+            'llegadas' y 'snipers').
+    """
+    rng = obtener_generador(rng)
+    inicios = rng.uniform(0, max(horizonte - duracion, 0.0), m)
+    llegadas = rng.uniform(0, horizonte, n)
+    valoraciones = rng.uniform(0, 1, n)
+    snipers = rng.uniform(0, 1, n) < prop_snipers
+    objetos = [Objeto(j + 1, reserve_price, min_increment) for j in range(m)]
+    compradores = [Buyer(ID=i + 1, valoracion=float(valoraciones[i])) for i in range(n)]
+    return {'objetos': objetos, 'compradores': compradores, 'inicios': inicios, 'finales': inicios + duracion,
+            'llegadas': llegadas, 'snipers': snipers}
+
+
+def ebay_timed_proxy_bidding(objetos: list, compradores, inicios, finales, llegadas, snipers=None,
+                             margen_sniping: float = 0.001, reaccion: float = 0.0, diagnostico: bool = False):
+    """
+    Motor de eventos discretos para subastas eBay con tiempos: cada anuncio tiene un instante de apertura
+    y un cierre fijo, y cada comprador llega en su propio instante. En lugar de recorrer el tiempo paso a
+    paso, las aperturas, cierres y pujas se guardan como eventos con marca temporal en un montículo y se
+    procesan en orden cronológico. Con compradores Buyer el coste es O(E log E) para E eventos.
+
+    Cada anuncio es una subasta proxy independiente: las pujas se registran con el registrar_puja del
+    propio objeto (Objeto o AffiliatedObject), de modo que el precio sigue la regla
+    current_price = min(highest_bid, second_highest_bid + min_increment).
+
+    Dinámica de los compradores (demanda unitaria, como en la subasta múltiple):
+        - Al llegar, o al ser superado, el comprador elige entre los anuncios abiertos aquel en el que
+          puede pujar: el de menor precio de entrada si tiene una única valoración (Buyer, con un
+          MonticuloEntrada de los anuncios abiertos) o el de mayor beneficio valoración − enter_price > 0
+          si sus valoraciones dependen del objeto (AffiliatedBuyer). Si no hay ninguno, abandona el mercado.
+        - Un comprador normal puja su valoración en ese instante. Un sniper programa su puja para
+          `margen_sniping` antes del cierre del anuncio elegido; si llegado ese momento ya no alcanza el
+          precio de entrada, vuelve a elegir anuncio.
+        - Un comprador superado (por una puja mayor o porque su puja no supera al líder) vuelve a elegir
+          anuncio `reaccion` unidades de tiempo después.
+        - Al cerrar un anuncio, su líder lo gana y sale del mercado con active_object igual al ID del anuncio.
+
+    Las valoraciones afiliadas no se actualizan durante la subasta (no hay Fase 1 como en
+    ebay_affiliated_bidding_multiple): solo se usan las valoraciones actuales de cada comprador. La
+    valoración de un AffiliatedBuyer para objetos[j] es la j-ésima de sus valuations, como en
+    ebay_affiliated_bidding_multiple, donde objetos[j].ID = j + 1.
+
+    Como las valoraciones son fijas y los precios solo suben, el beneficio de un anuncio nunca crece.
+    Cada AffiliatedBuyer guarda un montículo de (−beneficio, anuncio, versión) con los anuncios que ha
+    visto abiertos con beneficio positivo: el beneficio guardado es una cota superior y solo se
+    recalcula cuando el anuncio llega a la cima con pujas posteriores a su versión. Los anuncios que
+    abren después de su primera elección se añaden desde el registro de aperturas. El coste es
+    O((E + Σ_i a_i + r) log E), donde a_i es el número de anuncios abiertos mientras el comprador i
+    sigue en el mercado y r el de recálculos; el término Σ_i a_i es inevitable porque cada valoración
+    depende del anuncio, pero cada par comprador-anuncio se evalúa una vez y no en cada evento.
+
+    Args:
+        objetos (list[Objeto | AffiliatedObject]): Anuncios sin pujas; se modifican en el sitio.
+        compradores (list[Buyer | AffiliatedBuyer]): Compradores sin objeto activo.
+        inicios (array-like): Instante de apertura de cada anuncio.
+        finales (array-like): Instante de cierre de cada anuncio (las pujas en ese instante ya no cuentan).
+        llegadas (array-like): Instante de llegada de cada comprador.
+        snipers (array-like | None): Máscara de los compradores que pujan al final (ninguno por defecto).
+        margen_sniping (float): Antelación con la que puja un sniper respecto al cierre.
+        reaccion (float): Tiempo que tarda un comprador superado en volver a pujar.
+        diagnostico (bool): Si es True, se devuelve también el recuento de eventos.
+
+    Returns:
+        tuple:
+            - ganador (np.ndarray): Índice en `compradores` del ganador de cada anuncio (-1 si no se vende).
+            - precio (np.ndarray): Precio final de cada anuncio.
+            - cierre (np.ndarray): Instante de cierre de cada anuncio.
+            - info (dict, solo si diagnostico=True): 'eventos', 'pujas' (aceptadas), 'reentradas' y
+              'abandonos' (compradores que salen sin encontrar anuncio).
+    """
+    m, n = len(objetos), len(compradores)
+    inicios = np.asarray(inicios, dtype=float)
+    finales = np.asarray(finales, dtype=float)
+    llegadas = np.asarray(llegadas, dtype=float)
+    snipers = np.zeros(n, dtype=bool) if snipers is None else np.asarray(snipers, dtype=bool)
+    indice = {id(buyer): i for i, buyer in enumerate(compradores)}
+    afiliados = n > 0 and hasattr(compradores[0], 'get_valuation_for_object')
+
+    abierto = [False] * m
+    abiertos = set()
+    # Pujas aceptadas por anuncio y registro de aperturas, para los montículos de los compradores afiliados
+    cambios = [0] * m
+    aperturas = []
+    candidatos = {}
+    if afiliados:
+        entrada = np.array([obj.enter_price() for obj in objetos], dtype=float)
+    monticulo = MonticuloEntrada(objetos)
+    for j in range(m):
+        monticulo.retirar(j)
+
+    eventos = []
+    secuencia = 0
+
+    def programar(t, tipo, a, b=-1):
+        nonlocal secuencia
+        heapq.heappush(eventos, (t, tipo, secuencia, a, b))
+        secuencia += 1
+
+    for j in range(m):
+        programar(inicios[j], APERTURA, j)
+        programar(finales[j], CIERRE, j)
+    for i in range(n):
+        programar(llegadas[i], PUJA, i)
+
+    def anotar(heap, buyer, nuevos):
+        """Añade al montículo del comprador los anuncios de `nuevos` con beneficio positivo."""
+        if not nuevos:
+            return
+        nuevos = np.fromiter(nuevos, dtype=np.intp, count=len(nuevos))
+        margen = _valoraciones(buyer, nuevos) - entrada[nuevos]
+        positivos = margen > 0
+        for mg, j in zip((-margen[positivos]).tolist(), nuevos[positivos].tolist()):
+            heapq.heappush(heap, (mg, j, cambios[j]))
+
+    def elegir(i, buyer):
+        """Anuncio abierto en el que puja el comprador (índice) o -1 si no puede pujar en ninguno."""
+        if afiliados:
+            if i not in candidatos:
+                heap = []
+                anotar(heap, buyer, abiertos)
+            else:
+                heap, visto = candidatos[i]
+                anotar(heap, buyer, aperturas[visto:])
+            candidatos[i] = (heap, len(aperturas))
+            # A igual beneficio gana el anuncio de menor índice
+            while heap:
+                _, j, version = heap[0]
+                if not abierto[j]:
+                    heapq.heappop(heap)
+                elif version != cambios[j]:
+                    # Ha recibido pujas desde que se evaluó: su beneficio actual es menor o igual
+                    heapq.heappop(heap)
+                    margen = _valoracion(buyer, j) - entrada[j]
+                    if margen > 0:
+                        heapq.heappush(heap, (-margen, j, cambios[j]))
+                else:
+                    return j
+            return -1
+        minimo = monticulo.minimo()
+        if minimo is None or buyer.valoracion < minimo[0]:
+            return -1
+        return minimo[1]
+
+    procesados = pujas = reentradas = abandonos = 0
+    while eventos:
+        t, tipo, _, a, b = heapq.heappop(eventos)
+        procesados += 1
+        if tipo == APERTURA:
+            abierto[a] = True
+            abiertos.add(a)
+            aperturas.append(a)
+            monticulo.actualizar(a)
+        elif tipo == CIERRE:
+            abierto[a] = False
+            abiertos.discard(a)
+            monticulo.retirar(a)
+            if objetos[a].highest_bidder is not None:
+                candidatos.pop(indice[id(objetos[a].highest_bidder)], None)
+        else:
+            i, j = a, b
+            buyer = compradores[i]
+            if j < 0 or not abierto[j] or _valoracion(buyer, j) < objetos[j].enter_price():
+                # Llegada, reentrada o snipe que ya no es viable: elegir anuncio
+                j = elegir(i, buyer)
+                if j < 0:
+                    buyer.active_object = None
+                    candidatos.pop(i, None)
+                    abandonos += 1
+                    continue
+                if snipers[i] and finales[j] - margen_sniping > t:
+                    programar(finales[j] - margen_sniping, PUJA, i, j)
+                    continue
+            objeto = objetos[j]
+            lider = objeto.highest_bidder
+            # elegir y la comprobación anterior garantizan que la valoración alcanza el precio de entrada
+            if not objeto.registrar_puja(buyer, _valoracion(buyer, j)):
+                raise RuntimeError(f"Puja rechazada del comprador {i} en el anuncio {j}: la valoración no "
+                                   f"alcanza el precio de entrada {objeto.enter_price()}")
+            pujas += 1
+            cambios[j] += 1
+            if afiliados:
+                entrada[j] = objeto.enter_price()
+            monticulo.actualizar(j)
+            buyer.active_object = objeto.ID
+            # El antiguo líder superado, o el propio comprador si no supera al líder, vuelve a elegir
+            superado = lider if objeto.highest_bidder is buyer else buyer
+            if superado is not None:
+                superado.active_object = None
+                reentradas += 1
+                programar(t + reaccion, PUJA, indice[id(superado)])
+
+    ganador = np.array([-1 if obj.highest_bidder is None else indice[id(obj.highest_bidder)] for obj in objetos],
+                       dtype=np.intp)
+    precio = np.array([obj.current_price for obj in objetos], dtype=float)
+    if diagnostico:
+        return ganador, precio, finales, {'eventos': procesados, 'pujas': pujas, 'reentradas': reentradas,
+                                          'abandonos': abandonos}
+    return ganador, precio, finales